@@ -1,26 +1,84 @@
-import os
-from dotenv import load_dotenv  # type: ignore
-
-# ✅ Load environment variables from .env
-load_dotenv()
-
-
-class Config:
-    # ✅ Database config
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-
-    # ✅ Flask app settings
-    FLASK_ENV = os.getenv("FLASK_ENV", "development")
-    SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
-
-    # ✅ JWT config
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_jwt_secret_key")
-    JWT_ACCESS_TOKEN_EXPIRES = False
-    JWT_TOKEN_LOCATION = ["headers", "cookies"]  # ✅ Accept both
-    JWT_ACCESS_COOKIE_PATH = "/"
-    JWT_COOKIE_SECURE = False  # True if using HTTPS
-    JWT_COOKIE_SAMESITE = "Lax"
-    JWT_COOKIE_CSRF_PROTECT = False  #  Temporarily set to False for testing
-    JWT_CSRF_IN_COOKIES = True
-    JWT_ACCESS_CSRF_HEADER_NAME = "X-CSRF-TOKEN"
+import os
+from dotenv import load_dotenv  # type: ignore
+
+# ✅ Load environment variables from .env
+load_dotenv()
+
+
+class Config:
+    # ✅ Database config
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # ✅ Flask app settings
+    FLASK_ENV = os.getenv("FLASK_ENV", "development")
+    SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
+
+    # ✅ JWT config
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_jwt_secret_key")
+    JWT_ACCESS_TOKEN_EXPIRES = False
+    JWT_TOKEN_LOCATION = ["headers", "cookies"]  # ✅ Accept both
+    JWT_ACCESS_COOKIE_PATH = "/"
+    JWT_COOKIE_SECURE = False  # True if using HTTPS
+    JWT_COOKIE_SAMESITE = "Lax"
+    JWT_COOKIE_CSRF_PROTECT = False  #  Temporarily set to False for testing
+    JWT_CSRF_IN_COOKIES = True
+    JWT_ACCESS_CSRF_HEADER_NAME = "X-CSRF-TOKEN"
+
+    # ✅ Default scale (legacy single-scale endpoints)
+    SCALE_HOST = os.getenv("SCALE_HOST", "192.168.10.21")
+    SCALE_PORT = int(os.getenv("SCALE_PORT", "502"))
+    SCALE_UNIT_ID = int(os.getenv("SCALE_UNIT_ID", "1"))
+
+    # ✅ Default scale poll interval (s) for live weight and stability detection
+    SCALE_POLL_INTERVAL = float(os.getenv("SCALE_POLL_INTERVAL", "1.0"))
+
+    # ✅ Scale reading cache: readings younger than this (seconds) are reused
+    SCALE_READING_TTL = float(os.getenv("SCALE_READING_TTL", "0.5"))
+
+    # ✅ Poll the scales configured in the `scale` table from a background loop
+    # and dose from them (opt-in; the default scale is always dosed from).
+    # Polling and dosing state live in the process: run one worker.
+    SCALE_POLLING_ENABLED = os.getenv("SCALE_POLLING_ENABLED", "false").lower() == "true"
+
+    # ✅ scale_data capture: sample interval and bulk-writer tuning
+    SCALE_CAPTURE_INTERVAL = float(os.getenv("SCALE_CAPTURE_INTERVAL", "1.0"))
+    SCALE_WRITER_FLUSH_INTERVAL = float(os.getenv("SCALE_WRITER_FLUSH_INTERVAL", "1.0"))
+    SCALE_WRITER_BATCH_SIZE = int(os.getenv("SCALE_WRITER_BATCH_SIZE", "500"))
+    SCALE_WRITER_MAX_BUFFER = int(os.getenv("SCALE_WRITER_MAX_BUFFER", "20000"))
+
+    # ✅ Circuit breaker for unreachable scales: open after N consecutive
+    # failures, probe again after a backoff that doubles up to the max (s)
+    SCALE_BREAKER_THRESHOLD = int(os.getenv("SCALE_BREAKER_THRESHOLD", "3"))
+    SCALE_BREAKER_BACKOFF = float(os.getenv("SCALE_BREAKER_BACKOFF", "1.0"))
+    SCALE_BREAKER_MAX_BACKOFF = float(os.getenv("SCALE_BREAKER_MAX_BACKOFF", "60.0"))
+
+    # ✅ Weight stability: moving median over N samples, stable when the
+    # window spread stays within the band (kg) and the motion bit is clear
+    SCALE_STABLE_SAMPLES = int(os.getenv("SCALE_STABLE_SAMPLES", "3"))
+    SCALE_STABLE_BAND_KG = float(os.getenv("SCALE_STABLE_BAND_KG", "0.05"))
+
+    # ✅ In-flight compensation: EWMA weight of each new observation and the
+    # largest share of a set point the feeder may be cut off early by
+    DOSING_INFLIGHT_ALPHA = float(os.getenv("DOSING_INFLIGHT_ALPHA", "0.3"))
+    DOSING_INFLIGHT_MAX_FRACTION = float(os.getenv("DOSING_INFLIGHT_MAX_FRACTION", "0.2"))
+
+    # ✅ SPC: doses per X-bar/R subgroup (2-10) and EWMA weight of deviation
+    SPC_SUBGROUP_SIZE = int(os.getenv("SPC_SUBGROUP_SIZE", "5"))
+    SPC_EWMA_ALPHA = float(os.getenv("SPC_EWMA_ALPHA", "0.2"))
+
+    # ✅ Dose curve capture: poll a station's scale at this rate (Hz) while a
+    # material is active and keep the curve with the dose (at most N samples)
+    DOSE_CURVE_CAPTURE = os.getenv("DOSE_CURVE_CAPTURE", "false").lower() == "true"
+    DOSE_CURVE_RATE_HZ = float(os.getenv("DOSE_CURVE_RATE_HZ", "50"))
+    DOSE_CURVE_MAX_SAMPLES = int(os.getenv("DOSE_CURVE_MAX_SAMPLES", "60000"))
+    DOSE_CURVE_ZSTD_LEVEL = int(os.getenv("DOSE_CURVE_ZSTD_LEVEL", "3"))
+
+    # ✅ Scheduler: dose history window (days) for run-time estimates, the
+    # per-material time (s) used without history, gaps longer than this (s)
+    # are breaks rather than dosing, and the daily shift window
+    SCHEDULER_HISTORY_DAYS = int(os.getenv("SCHEDULER_HISTORY_DAYS", "90"))
+    SCHEDULER_DEFAULT_MATERIAL_S = float(os.getenv("SCHEDULER_DEFAULT_MATERIAL_S", "120"))
+    SCHEDULER_MAX_INTERVAL_S = float(os.getenv("SCHEDULER_MAX_INTERVAL_S", "1800"))
+    SCHEDULER_SHIFT_START = os.getenv("SCHEDULER_SHIFT_START", "06:00")
+    SCHEDULER_SHIFT_END = os.getenv("SCHEDULER_SHIFT_END", "22:00")
@@ -0,0 +1,140 @@
+import numpy as np
+from sqlalchemy import select
+from config import Config
+from extensions import db
+from helpers.dose_curve import unpack_curve
+from models.dose_curve import DoseCurve
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial
+
+METRICS = ("feed_rate_kg_s", "t90_s", "settle_s", "overshoot_g", "noise_g")
+
+# Scale id used for the default (unconfigured) station when grouping
+DEFAULT_STATION = -1
+
+
+def curve_metrics(curves, set_points, band_kg):
+    """
+    Per-dose metrics for a batch of curves (CURVE_DTYPE arrays), computed
+    on one concatenated array with segment reductions (ufunc.reduceat),
+    not dose by dose:
+
+    - feed_rate_kg_s: mean rate between 10% and 90% of the set point
+    - t90_s: time to 90% of the set point, from the material becoming active
+    - settle_s: from 90% until the weight stays within `band_kg` of the
+      final (dosed) weight
+    - overshoot_g: peak weight above the set point
+    - noise_g: standard deviation of the settled tail
+
+    Returns {metric: float array}, NaN where a dose has no value.
+    """
+    count = len(curves)
+    result = {name: np.full(count, np.nan) for name in METRICS}
+    lengths = np.fromiter((len(c) for c in curves), dtype=np.int64, count=count)
+    rows = np.flatnonzero(lengths)
+    if not len(rows):
+        return result
+
+    data = np.concatenate([curves[i] for i in rows])
+    lengths = lengths[rows]
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    segment = np.repeat(np.arange(len(rows)), lengths)
+    index = np.arange(len(data))
+    t = data["t"].astype(np.float64)
+    w = data["weight_kg"].astype(np.float64)
+    target = np.asarray(set_points, dtype=np.float64)[rows]
+
+    def first_reached(level):
+        first = np.minimum.reduceat(np.where(w >= level[segment], index, len(w)), starts)
+        return np.where(first < ends, t[np.minimum(first, len(w) - 1)], np.nan)
+
+    t10 = first_reached(0.1 * target)
+    t90 = first_reached(0.9 * target)
+    span = t90 - t10
+    feed_rate = np.divide(
+        0.8 * target, span, out=np.full(len(rows), np.nan), where=span > 0
+    )
+
+    final = w[ends - 1]
+    overshoot = (np.maximum.reduceat(w, starts) - target) * 1000
+
+    # Settled from the sample after the last one outside the band
+    outside = np.abs(w - final[segment]) > band_kg
+    last_outside = np.maximum.reduceat(np.where(outside, index, -1), starts)
+    settled_from = np.maximum(last_outside + 1, starts)
+    settle = t[settled_from] - t90
+
+    tail = index >= settled_from[segment]
+    deviation = np.where(tail, w - final[segment], 0.0)
+    tail_count = np.add.reduceat(tail.astype(np.int64), starts)
+    mean = np.add.reduceat(deviation, starts) / tail_count
+    variance = np.add.reduceat(deviation * deviation, starts) / tail_count - mean**2
+    noise = np.where(tail_count > 2, np.sqrt(np.clip(variance, 0, None)) * 1000, np.nan)
+
+    for name, values in (
+        ("feed_rate_kg_s", feed_rate),
+        ("t90_s", t90),
+        ("settle_s", settle),
+        ("overshoot_g", overshoot),
+        ("noise_g", noise),
+    ):
+        result[name][rows] = values
+    return result
+
+
+def group_means(keys, metrics):
+    """(keys, dose counts, {metric: mean per key}), NaNs left out of the means."""
+    keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    means = {}
+    for name, values in metrics.items():
+        finite = np.isfinite(values)
+        total = np.bincount(inverse, weights=np.where(finite, values, 0.0), minlength=len(keys))
+        n = np.bincount(inverse, weights=finite, minlength=len(keys))
+        means[name] = np.divide(total, n, out=np.full(len(keys), np.nan), where=n > 0)
+    return keys, counts, means
+
+
+def analyze_doses(start, end, chunk_size=1000):
+    """
+    Metrics of every captured dose in [start, end), streamed from the
+    database `chunk_size` curves at a time. Returns (material_ids,
+    scale_ids, metrics) as aligned arrays; DEFAULT_STATION stands for the
+    default station and -1 for a deleted material.
+    """
+    stmt = (
+        select(
+            DoseCurve.data,
+            DosedRecipeMaterial.material_id,
+            DosedRecipeMaterial.set_point,
+            ProductionOrder.scale_id,
+        )
+        .join(DosedRecipeMaterial, DosedRecipeMaterial.id == DoseCurve.dosed_material_id)
+        .outerjoin(
+            ProductionOrderMaterial,
+            ProductionOrderMaterial.id == DosedRecipeMaterial.order_material_id,
+        )
+        .outerjoin(ProductionOrder, ProductionOrder.order_id == ProductionOrderMaterial.order_id)
+        .where(DosedRecipeMaterial.dosed_at >= start, DosedRecipeMaterial.dosed_at < end)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    chunks = []
+    material_ids = []
+    scale_ids = []
+    for rows in db.session.execute(stmt).partitions():
+        chunks.append(
+            curve_metrics(
+                [unpack_curve(row.data) for row in rows],
+                [row.set_point for row in rows],
+                Config.SCALE_STABLE_BAND_KG,
+            )
+        )
+        material_ids.extend(-1 if row.material_id is None else row.material_id for row in rows)
+        scale_ids.extend(DEFAULT_STATION if row.scale_id is None else row.scale_id for row in rows)
+
+    metrics = {
+        name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0)
+        for name in METRICS
+    }
+    return np.array(material_ids, dtype=np.int64), np.array(scale_ids, dtype=np.int64), metrics
@@ -0,0 +1,103 @@
+import io
+import logging
+import threading
+from collections import deque
+import numpy as np
+import zstandard
+from config import Config
+from extensions import socketio
+
+# One row per sample: seconds since the material became active, weight, motion bit
+CURVE_DTYPE = np.dtype([("t", "<f4"), ("weight_kg", "<f4"), ("motion", "u1")])
+
+
+def pack_curve(samples, started_at):
+    """
+    (monotonic time, weight_kg, motion) samples -> zstd-compressed .npy bytes
+    of a CURVE_DTYPE array, plus its sample count and duration (s).
+    """
+    curve = np.array(samples, dtype=[("t", "<f8"), ("weight_kg", "<f4"), ("motion", "u1")])
+    curve["t"] -= started_at
+    curve = curve.astype(CURVE_DTYPE)
+
+    buffer = io.BytesIO()
+    np.save(buffer, curve, allow_pickle=False)
+    data = zstandard.ZstdCompressor(level=Config.DOSE_CURVE_ZSTD_LEVEL).compress(buffer.getvalue())
+    duration = float(curve["t"][-1]) if len(curve) else 0.0
+    return data, len(curve), duration
+
+
+def unpack_curve(data):
+    """Inverse of pack_curve: the CURVE_DTYPE array."""
+    raw = zstandard.ZstdDecompressor().decompress(data)
+    return np.load(io.BytesIO(raw), allow_pickle=False)
+
+
+class DoseCurveRecorder:
+    """
+    Records one station's weight-vs-time curve while a material is active.
+    begin() switches the station's broadcaster to its fast capture rate and
+    starts a new curve; take() hands the samples over when the material is
+    dosed. Samples arrive through a capture subscription on a background
+    task, so the dosing checks keep their normal rate.
+    """
+
+    def __init__(self, broadcaster, rate_hz=50, max_samples=60000):
+        self.broadcaster = broadcaster
+        self.interval = 1.0 / rate_hz
+        self.rate_hz = rate_hz
+        self.key = None
+        self.started_at = None
+        self.samples = deque(maxlen=max_samples)
+        self.running = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.running:
+            return None
+        subscription = self.broadcaster.subscribe(capture=True)
+        self.running = True
+
+        def run():
+            while True:
+                item = subscription.get(timeout=self.broadcaster.interval * 5)
+                if item is None:
+                    continue
+                at, reading = item
+                if "error" in reading:
+                    continue
+                with self._lock:
+                    if self.key is not None:
+                        self.samples.append((at, reading["weight_kg"], bool(reading.get("motion"))))
+
+        socketio.start_background_task(run)
+        return subscription
+
+    def begin(self, key, started_at):
+        """Start a curve for `key` (an order target); no-op if already recording it."""
+        with self._lock:
+            if key == self.key:
+                return
+            self.key = key
+            self.started_at = started_at
+            self.samples.clear()
+        self.broadcaster.set_capture(self.interval)
+
+    def stop(self):
+        with self._lock:
+            self.key = None
+            self.samples.clear()
+        self.broadcaster.set_capture(None)
+
+    def take(self, key):
+        """Packed curve of `key` (see pack_curve) or None; recording goes on until stop()."""
+        with self._lock:
+            if key != self.key or not self.samples:
+                return None
+            samples = list(self.samples)
+            started_at = self.started_at
+        try:
+            return pack_curve(samples, started_at)
+        except Exception as e:
+            logging.error(f"❌ Dose curve packing failed: {e}", exc_info=True)
+            return None
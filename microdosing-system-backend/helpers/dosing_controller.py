@@ -0,0 +1,748 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from config import Config
+from extensions import db, socketio
+from helpers.dose_curve import DoseCurveRecorder
+from helpers.scale_broadcaster import get_broadcaster
+from helpers.scheduler import replan_orders
+from helpers.spc import record_dose
+from helpers.upsert import upsert
+from helpers.weight_filter import get_stability_monitor
+from models.dose_curve import DoseCurve
+from models.material import MaterialInflight
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import RecipeMaterial, DosedRecipeMaterial
+
+
+# Per-target state kept in memory only, carried across reloads
+TRANSIENT_KEYS = ("started_at", "cutoff_weight")
+
+
+def station_name(scale_id=None):
+    """Station key: "default" for the configured scale, else its Scale row."""
+    return "default" if scale_id is None else f"scale-{scale_id}"
+
+
+def cutoff_point(set_point, inflight_kg):
+    """
+    Weight (kg) at which to cut the feeder so the material still in flight
+    lands on set_point; never earlier than DOSING_INFLIGHT_MAX_FRACTION of it.
+    """
+    earliest = set_point * (1 - Config.DOSING_INFLIGHT_MAX_FRACTION)
+    return round(max(set_point - (inflight_kg or 0), earliest), 4)
+
+
+def station_room(scale_id=None):
+    """Socket.IO room for a station (the default station broadcasts to all)."""
+    return None if scale_id is None else f"station-{scale_id}"
+
+
+class DosingController:
+    """
+    Completes doses for one station (scale) as its readings arrive.
+
+    The station's active (verified) order and its targets
+    (production_order_material) are loaded once and kept in memory; each
+    sample from the scale broadcaster is checked against the current
+    material without touching the database. Only a dose transition writes
+    (one commit), then `material_updated` / `dose_completed` are pushed to
+    the station's room. Anything that changes orders or targets calls
+    `invalidate()` so the sequence is reloaded on the next sample, or
+    `refresh()` to reload it right away.
+
+    The same state backs the station's active-dosing view (`active_view()`),
+    pushed as `active_recipe_materials` only when it changes.
+    """
+
+    def __init__(self, scale_id=None, app=None):
+        self.scale_id = scale_id
+        self.name = station_name(scale_id)
+        self.room = station_room(scale_id)
+        self.app = app
+        self.monitor = get_stability_monitor(self.name, room=self.room)
+        self.order = None
+        self.materials = []
+        self.last_dose = None
+        self.running = False
+        self.doses = 0
+        self.view = None
+        self.recorder = None
+        self._dirty = True
+        self._lock = threading.RLock()
+
+    def start(self, broadcaster):
+        """Consume the scale broadcaster from a background task."""
+        if self.running:
+            return None
+        subscription = broadcaster.subscribe()
+        self.running = True
+        if Config.DOSE_CURVE_CAPTURE:
+            self.recorder = DoseCurveRecorder(
+                broadcaster,
+                rate_hz=Config.DOSE_CURVE_RATE_HZ,
+                max_samples=Config.DOSE_CURVE_MAX_SAMPLES,
+            )
+            self.recorder.start()
+            self._dirty = True  # begin capturing the current material
+
+        def run():
+            while True:
+                reading = subscription.get(timeout=broadcaster.interval * 5)
+                if reading is None:
+                    continue
+                self.monitor.feed(reading)
+                state = self.monitor.get_state()
+                if state is None:
+                    continue
+                try:
+                    self.evaluate(state["weight_kg"], state["stable"])
+                except Exception as e:
+                    logging.error(f"❌ Dosing controller error: {e}", exc_info=True)
+
+        socketio.start_background_task(run)
+        return subscription
+
+    def invalidate(self):
+        self._dirty = True
+
+    def refresh(self):
+        """Reload now (after a write), pushing the active view if it changed."""
+        with self._lock:
+            self.load()
+
+    def active_view(self):
+        """Active order and its pending materials; no query unless invalidated."""
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self.load()
+        return self.view
+
+    def read_weight(self):
+        """
+        Filtered weight and stability from the monitor, or a direct (cached)
+        read treated as settled when the monitor has no fresh sample.
+        """
+        state = self.monitor.get_state(max_age=Config.SCALE_POLL_INTERVAL * 3)
+        if state is not None:
+            return {"weight_kg": state["weight_kg"], "stable": state["stable"]}
+
+        if self.scale_id is None:
+            from helpers.scale_service import scale_service
+
+            reading = scale_service.get_reading()
+        else:
+            from helpers.scale_poller import scale_engine
+            from helpers.scale_service import get_scale_service
+            from models.scale import Scale
+
+            config = scale_engine.get_config(self.scale_id)
+            if config is None:
+                scale = db.session.get(Scale, self.scale_id)
+                if scale is None:
+                    return {"error": "Scale not found"}
+                config = scale.to_config()
+            reading = get_scale_service(config).get_reading()
+
+        if "error" in reading:
+            return {"error": reading["error"]}
+        return {"weight_kg": reading["weight_kg"], "stable": True}
+
+    def load(self):
+        """Reload the verified order and its material sequence."""
+        with self.app.app_context():
+            order = (
+                db.session.query(ProductionOrder)
+                .filter(
+                    ProductionOrder.status == "verified",
+                    ProductionOrder.scale_id.is_(None)
+                    if self.scale_id is None
+                    else ProductionOrder.scale_id == self.scale_id,
+                )
+                .order_by(ProductionOrder.created_at.desc())
+                .first()
+            )
+            materials = []
+            if order:
+                rows = load_order_materials(order)
+                materials = [
+                    {
+                        "order_material_id": m.id,
+                        "recipe_material_id": m.recipe_material_id,
+                        "recipe_id": order.recipe_id,
+                        "material_id": m.material_id,
+                        "material_name": m.material.title if m.material else None,
+                        "barcode": m.material.barcode_id if m.material else None,
+                        "bucket_id": m.recipe_material.bucket_id if m.recipe_material else None,
+                        "set_point": m.set_point,
+                        "actual": m.actual,
+                        "margin": m.margin,
+                        "margin_g": float(m.margin or 0),
+                        "status": m.status,
+                    }
+                    for m in rows
+                ]
+                inflight = dict(
+                    db.session.query(MaterialInflight.material_id, MaterialInflight.inflight_kg)
+                    .filter(MaterialInflight.material_id.in_({m.material_id for m in rows}))
+                    .all()
+                )
+                for material in materials:
+                    material["inflight_kg"] = inflight.get(material["material_id"], 0.0)
+                    material["cutoff"] = cutoff_point(material["set_point"], material["inflight_kg"])
+                order = {
+                    "order_id": order.order_id,
+                    "order_number": order.order_number,
+                    "recipe_id": order.recipe_id,
+                    "recipe_name": order.recipe.name if order.recipe else None,
+                    "batch_size": float(order.batch_size) if order.batch_size else 1,
+                }
+
+        with self._lock:
+            self._carry_over(materials)
+            self.order = order
+            self.materials = materials
+            self._dirty = False
+            self._track_current()
+            self._publish()
+
+    def _carry_over(self, materials):
+        """
+        Keep the in-progress state (start time, cutoff weight) of targets
+        that are still pending with the same set point, so a reload in the
+        middle of a dose does not restart its curve or its cutoff.
+        """
+        previous = {m["order_material_id"]: m for m in self.materials}
+        for material in materials:
+            before = previous.get(material["order_material_id"])
+            if (
+                before is None
+                or material["status"] != "pending"
+                or before["status"] != "pending"
+                or before["set_point"] != material["set_point"]
+            ):
+                continue
+            for key in TRANSIENT_KEYS:
+                if key in before:
+                    material[key] = before[key]
+
+    def _publish(self):
+        """Rebuild the active view; push it to the station only if it changed."""
+        view = None
+        if self.order:
+            view = {
+                "order_id": self.order["order_id"],
+                "scale_id": self.scale_id,
+                "recipe_id": self.order["recipe_id"],
+                "recipe_name": self.order["recipe_name"],
+                "materials": [
+                    {
+                        "order_id": self.order["order_id"],
+                        "order_material_id": m["order_material_id"],
+                        "recipe_id": m["recipe_id"],
+                        "recipe_name": self.order["recipe_name"],
+                        "material_id": m["material_id"],
+                        "material_name": m["material_name"],
+                        "barcode": m["barcode"],
+                        "set_point": m["set_point"],
+                        "actual": m["actual"],
+                        "margin": m["margin"],
+                        "status": m["status"],
+                        "bucket_id": m["bucket_id"],
+                    }
+                    for m in self.materials
+                    if m["status"] == "pending" and m["material_name"] is not None
+                ],
+            }
+        if view == self.view:
+            return
+        self.view = view
+        socketio.emit(
+            "active_recipe_materials",
+            view or {"order_id": None, "scale_id": self.scale_id, "materials": []},
+            namespace="/",
+            to=self.room,
+        )
+
+    def _current(self):
+        """(index, material) of the first pending material, or (None, None)."""
+        for index, material in enumerate(self.materials):
+            if material["status"] == "pending":
+                return index, material
+        return None, None
+
+    def _track_current(self):
+        index, material = self._current()
+        if material is None:
+            self.monitor.clear_target()
+            if self.recorder:
+                self.recorder.stop()
+            return
+        material.setdefault("started_at", time.monotonic())
+        if self.recorder:
+            self.recorder.begin(material["order_material_id"], material["started_at"])
+        self.monitor.set_target(
+            material["set_point"],
+            material["set_point"] - material["margin_g"] / 1000,
+            recipe_id=material["recipe_id"],
+            material_id=material["material_id"],
+            material_name=material["material_name"],
+            cutoff=material["cutoff"],
+        )
+
+    def evaluate(self, current_weight, stable, force=False, wait=True):
+        """
+        Check the current material against a weight (kg) and dose it when
+        in range and settled. `force` skips the stability check (operator
+        override); with `wait=False` a check already running for this
+        station is not queued behind. Returns the weigh-and-update body.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return {
+                "success": False,
+                "reason": "busy",
+                "message": "Dose check already in progress",
+            }
+        try:
+            return self._evaluate(current_weight, stable, force)
+        finally:
+            self._lock.release()
+
+    def _evaluate(self, current_weight, stable, force):
+        if self._dirty:
+            self.load()
+
+        if not self.order:
+            return {"success": False, "message": "No verified production order found"}
+
+        index, material = self._current()
+        if material is None:
+            return {"success": False, "message": "No pending materials found"}
+
+        # ✅ Ensure previous material is dosed
+        if index > 0 and self.materials[index - 1]["status"] != "Dosed":
+            return {
+                "success": False,
+                "message": "Waiting for previous material to be dosed",
+            }
+
+        set_point = material["set_point"]
+        lower_limit = set_point - material["margin_g"] / 1000
+        progress = {
+            "material_id": material["material_id"],
+            "material_name": material["material_name"],
+            "actual": current_weight,
+            "set_point": set_point,
+            "margin_g": material["margin_g"],
+            "cutoff": material["cutoff"],
+        }
+
+        # ✅ Pre-act: tell the feeder to stop while material is still in flight
+        if material.get("cutoff_weight") is None and current_weight >= material["cutoff"]:
+            material["cutoff_weight"] = current_weight
+            socketio.emit("feeder_cutoff", {
+                "station": self.name,
+                "order_id": self.order["order_id"],
+                "material_id": material["material_id"],
+                "set_point": set_point,
+                "cutoff": material["cutoff"],
+                "inflight_kg": material["inflight_kg"],
+                "weight_kg": current_weight,
+            }, to=self.room)
+
+        if current_weight < lower_limit:
+            return {
+                "success": False,
+                "reason": "underweight",
+                "message": "Weight not yet sufficient",
+                "data": progress,
+            }
+        if not stable and not force:
+            return {
+                "success": False,
+                "reason": "unstable",
+                "message": "Waiting for weight to settle",
+                "data": progress,
+            }
+
+        return self._dose(index, material, current_weight)
+
+    def _dose(self, index, material, current_weight):
+        set_point = material["set_point"]
+        margin = round((current_weight - set_point) * 1000, 2)
+        order_id = self.order["order_id"]
+        recipe_id = self.order["recipe_id"]
+        batch_size = self.order["batch_size"]
+
+        # One transaction, one commit. The target row is claimed with
+        # SELECT ... FOR UPDATE SKIP LOCKED, so a concurrent transition (another
+        # worker or process) makes us back off instead of dosing it twice or
+        # waiting on it; the unique order_material_id on the history row is
+        # the last line of defence.
+        with self.app.app_context():
+            try:
+                row = (
+                    db.session.query(ProductionOrderMaterial)
+                    .filter(
+                        ProductionOrderMaterial.id == material["order_material_id"],
+                        ProductionOrderMaterial.status == "pending",
+                    )
+                    .with_for_update(skip_locked=True)
+                    .first()
+                )
+                if row is None:
+                    # Dosed or being dosed elsewhere; resync on the next sample
+                    db.session.rollback()
+                    self._dirty = True
+                    return {
+                        "success": False,
+                        "reason": "in_progress",
+                        "message": "Material already dosed or being dosed",
+                    }
+
+                row.actual = current_weight
+                row.deviation = margin
+                row.status = "Dosed"
+                row.dosed_at = datetime.utcnow()
+
+                # Learn before logging: first-time estimates are seeded from
+                # the history, which must not already contain this dose
+                self._learn_inflight(material, current_weight)
+                record_dose(material["material_id"], recipe_id, margin)
+
+                dosed = DosedRecipeMaterial(
+                    recipe_id=recipe_id,
+                    material_id=material["material_id"],
+                    order_material_id=row.id,
+                    set_point=set_point,
+                    actual=current_weight,
+                    margin=margin,
+                    batch_size=batch_size,
+                )
+                db.session.add(dosed)
+                db.session.flush()
+                dosed_id = dosed.id
+
+                curve = self.recorder.take(row.id) if self.recorder else None
+                if curve is not None:
+                    data, samples, duration = curve
+                    db.session.add(
+                        DoseCurve(
+                            dosed_material_id=dosed.id,
+                            samples=samples,
+                            duration_s=duration,
+                            rate_hz=self.recorder.rate_hz,
+                            data=data,
+                        )
+                    )
+
+                remaining = (
+                    db.session.query(func.count(ProductionOrderMaterial.id))
+                    .filter(
+                        ProductionOrderMaterial.order_id == order_id,
+                        ProductionOrderMaterial.status == "pending",
+                    )
+                    .scalar()
+                )
+                is_final_material = remaining == 0
+
+                # ✅ Final material completes the order
+                if is_final_material:
+                    db.session.query(ProductionOrder).filter(
+                        ProductionOrder.order_id == order_id,
+                        ProductionOrder.status == "verified",
+                    ).update({"status": "completed"}, synchronize_session=False)
+
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                self._dirty = True
+                return {
+                    "success": False,
+                    "reason": "in_progress",
+                    "message": "Material already dosed or being dosed",
+                }
+            except Exception:
+                db.session.rollback()
+                self._dirty = True
+                raise
+
+        self.doses += 1
+        material["status"] = "Dosed"
+        material["actual"] = current_weight
+        # order completed (pick up the next one) or targets changed elsewhere
+        reload = is_final_material or remaining != sum(
+            1 for m in self.materials if m["status"] == "pending"
+        )
+
+        result = {
+            "success": True,
+            "message": "Dosed successfully",
+            "reset_done": is_final_material,
+            "total_remaining": remaining,
+            "data": {
+                "order_id": order_id,
+                "order_material_id": material["order_material_id"],
+                "dosed_material_id": dosed_id,
+                "recipe_material_id": material["recipe_material_id"],
+                "material_id": material["material_id"],
+                "material_name": material["material_name"],
+                "set_point": set_point,
+                "actual": current_weight,
+                "margin": margin,
+                "cutoff": material["cutoff"],
+                "status": "Dosed",
+            },
+        }
+        self.last_dose = result
+
+        if is_final_material:
+            socketio.emit("order_completed", {
+                "order_id": order_id,
+                "order_number": self.order["order_number"],
+                "recipe_id": recipe_id,
+                "station": self.name,
+            }, to=self.room)
+        socketio.emit("material_updated", {
+            "station": self.name,
+            "order_id": order_id,
+            "recipe_id": recipe_id,
+            "material_id": material["material_id"],
+            "material_name": material["material_name"],
+            "status": "Dosed",
+            "actual": current_weight,
+            "set_point": set_point,
+            "deviation": margin
+        }, to=self.room)
+        socketio.emit("dose_completed", dict(result, station=self.name), to=self.room)
+
+        if is_final_material:
+            # Runs on the station's background task: the re-plan (and its
+            # rollback on failure) needs an app context of its own
+            with self.app.app_context():
+                replan_orders([order_id])
+
+        if reload:
+            self._dirty = True
+            try:
+                self.load()
+            except Exception as e:
+                # the dose is committed; the next sample retries the reload
+                logging.error(f"❌ Dosing reload failed: {e}", exc_info=True)
+        else:
+            self._track_current()
+            self._publish()
+        return result
+
+    def _learn_inflight(self, material, current_weight):
+        """Fold this dose into the material's in-flight estimate (same transaction)."""
+        estimate = db.session.get(MaterialInflight, material["material_id"], with_for_update=True)
+        if estimate is None:
+            bootstrap_inflight(material["material_id"])
+            estimate = db.session.get(MaterialInflight, material["material_id"], with_for_update=True)
+        cutoff_weight = material.get("cutoff_weight")
+        estimate.observe(
+            current_weight - material["set_point"],
+            inflight_kg=current_weight - cutoff_weight if cutoff_weight is not None else None,
+            cycle_s=time.monotonic() - material["started_at"] if "started_at" in material else None,
+            alpha=Config.DOSING_INFLIGHT_ALPHA,
+        )
+        for m in self.materials:
+            if m["material_id"] == material["material_id"] and m["status"] == "pending":
+                m["inflight_kg"] = estimate.inflight_kg
+                m["cutoff"] = cutoff_point(m["set_point"], estimate.inflight_kg)
+
+    def get_status(self):
+        with self._lock:
+            index, material = self._current()
+            return {
+                "station": self.name,
+                "scale_id": self.scale_id,
+                "running": self.running,
+                "order": self.order,
+                "current": material,
+                "remaining": sum(1 for m in self.materials if m["status"] == "pending"),
+                "scale": self.monitor.get_state(),
+                "last_dose": self.last_dose,
+                "doses": self.doses,
+            }
+
+
+def load_order_materials(order):
+    """
+    An order's targets in dosing order. Orders created before targets were
+    stored per order get them materialized here, once, from their recipe.
+    """
+    rows = (
+        db.session.query(ProductionOrderMaterial)
+        .options(
+            joinedload(ProductionOrderMaterial.material),
+            joinedload(ProductionOrderMaterial.recipe_material),
+        )
+        .filter(ProductionOrderMaterial.order_id == order.order_id)
+        .order_by(ProductionOrderMaterial.sequence)
+        .all()
+    )
+    if rows:
+        return rows
+
+    recipe_materials = (
+        RecipeMaterial.query.filter_by(recipe_id=order.recipe_id)
+        .order_by(RecipeMaterial.recipe_material_id)
+        .all()
+    )
+    rows = ProductionOrderMaterial.for_order(order, recipe_materials)
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+_controllers = {}
+_controllers_lock = threading.Lock()
+_app = None
+
+
+def init_dosing(app):
+    global _app
+    _app = app
+    with _controllers_lock:
+        for controller in _controllers.values():
+            controller.app = app
+
+
+def get_dosing_controller(scale_id=None):
+    """Controller for one station; None is the default (configured) scale."""
+    with _controllers_lock:
+        controller = _controllers.get(scale_id)
+        if controller is None:
+            controller = _controllers[scale_id] = DosingController(scale_id, app=_app)
+        return controller
+
+
+def start_station_controllers(scale_ids):
+    """Dose from each configured scale's poller (see helpers/scale_poller.py)."""
+    for scale_id in scale_ids:
+        controller = get_dosing_controller(scale_id)
+        controller.start(get_broadcaster(controller.name))
+
+
+def refresh_all(*scale_ids):
+    """
+    Reload every station after orders or targets changed (also creating the
+    controllers of `scale_ids`), so their active views are pushed right away.
+    Called after commit, so it never fails the caller: a station that cannot
+    reload is marked dirty and reloads on its next sample.
+    """
+    for scale_id in scale_ids:
+        get_dosing_controller(scale_id)
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    for controller in controllers:
+        try:
+            controller.refresh()
+        except Exception as e:
+            controller.invalidate()
+            logging.error(f"❌ Dosing reload failed for {controller.name}: {e}", exc_info=True)
+
+
+def all_dosing_status():
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    return [controller.get_status() for controller in controllers]
+
+
+def bypass_pending(order_filter):
+    """
+    Reject every pending target of the orders matched by `order_filter` (a
+    condition on ProductionOrder) with one UPDATE, log them with one
+    multi-row insert and commit once. Targets being dosed right now are
+    skipped. Returns the rejected targets; emitting is left to the caller
+    (after this commit).
+    """
+    targets = (
+        db.session.query(
+            ProductionOrderMaterial.id,
+            ProductionOrderMaterial.order_id,
+            ProductionOrderMaterial.recipe_material_id,
+            ProductionOrderMaterial.material_id,
+            ProductionOrderMaterial.set_point,
+            ProductionOrder.recipe_id,
+            ProductionOrder.batch_size,
+            ProductionOrder.scale_id,
+        )
+        .join(ProductionOrder, ProductionOrder.order_id == ProductionOrderMaterial.order_id)
+        .filter(order_filter, ProductionOrderMaterial.status == "pending")
+        .with_for_update(of=ProductionOrderMaterial, skip_locked=True)
+        .all()
+    )
+    if not targets:
+        db.session.rollback()
+        return []
+
+    db.session.query(ProductionOrderMaterial).filter(
+        ProductionOrderMaterial.id.in_([t.id for t in targets]),
+        ProductionOrderMaterial.status == "pending",
+    ).update({"status": "Rejected"}, synchronize_session=False)
+    db.session.execute(
+        insert(DosedRecipeMaterial),
+        [
+            {
+                "recipe_id": t.recipe_id,
+                "material_id": t.material_id,
+                "order_material_id": t.id,
+                "set_point": t.set_point,
+                "actual": None,
+                "margin": None,
+                "batch_size": float(t.batch_size or 1),
+                "status": "Rejected",
+            }
+            for t in targets
+        ],
+    )
+    db.session.commit()
+    refresh_all()
+
+    return [
+        {
+            "order_id": t.order_id,
+            "order_material_id": t.id,
+            "recipe_id": t.recipe_id,
+            "recipe_material_id": t.recipe_material_id,
+            "material_id": t.material_id,
+            "scale_id": t.scale_id,
+            "status": "Rejected",
+        }
+        for t in targets
+    ]
+
+
+def bootstrap_inflight(material_id):
+    """
+    New in-flight estimate for a material, seeded from its dose history
+    (mean overshoot over set point) so the first cut-off is not blind.
+    """
+    mean_overshoot, count = (
+        db.session.query(
+            func.avg(DosedRecipeMaterial.actual - DosedRecipeMaterial.set_point),
+            func.count(DosedRecipeMaterial.id),
+        )
+        .filter(
+            DosedRecipeMaterial.material_id == material_id,
+            DosedRecipeMaterial.actual.isnot(None),
+        )
+        .one()
+    )
+    db.session.execute(upsert(MaterialInflight.__table__, dict(
+        material_id=material_id,
+        inflight_kg=max(float(mean_overshoot or 0), 0.0),
+        samples=0,
+        mean_overshoot_kg=float(mean_overshoot) if count else None,
+    )))
+
+
+dosing_controller = get_dosing_controller()
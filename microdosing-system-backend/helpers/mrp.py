@@ -0,0 +1,120 @@
+from collections import defaultdict
+from sqlalchemy import exists, func, select, union_all
+from extensions import db
+from models.material import Material
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import RecipeMaterial
+
+# Orders that still draw on stock
+OPEN_STATUSES = ("planned", "verified")
+
+# Set points are in kg; stock is kept in the material's unit of measure
+UNIT_FACTORS = {"Kilogram (kg)": 1.0, "Gram (g)": 1000.0, "Milligram (mg)": 1000000.0}
+
+
+def daily_demand(end):
+    """
+    (day, material_id, kg) still required by open orders scheduled up to
+    `end`, in one grouped query. Orders with dosing targets count their
+    pending targets; older orders without targets are expanded through
+    their recipe (set_point * batch_size).
+    """
+    targets = (
+        select(
+            ProductionOrder.scheduled_date.label("day"),
+            ProductionOrderMaterial.material_id.label("material_id"),
+            ProductionOrderMaterial.set_point.label("quantity"),
+        )
+        .join(ProductionOrderMaterial, ProductionOrderMaterial.order_id == ProductionOrder.order_id)
+        .where(
+            ProductionOrder.status.in_(OPEN_STATUSES),
+            ProductionOrder.scheduled_date <= end,
+            ProductionOrderMaterial.status == "pending",
+        )
+    )
+    legacy = (
+        select(
+            ProductionOrder.scheduled_date.label("day"),
+            RecipeMaterial.material_id.label("material_id"),
+            (RecipeMaterial.set_point * ProductionOrder.batch_size).label("quantity"),
+        )
+        .join(RecipeMaterial, RecipeMaterial.recipe_id == ProductionOrder.recipe_id)
+        .where(
+            ProductionOrder.status.in_(OPEN_STATUSES),
+            ProductionOrder.scheduled_date <= end,
+            ~exists().where(ProductionOrderMaterial.order_id == ProductionOrder.order_id),
+        )
+    )
+    demand = union_all(targets, legacy).subquery()
+    return (
+        db.session.query(demand.c.day, demand.c.material_id, func.sum(demand.c.quantity))
+        .group_by(demand.c.day, demand.c.material_id)
+        .order_by(demand.c.material_id, demand.c.day)
+        .all()
+    )
+
+
+def material_requirements(start, end):
+    """
+    Per-material requirement over [start, end] against stock: each day's
+    requirement, the projected stock after it, and the first day stock
+    falls below the minimum or runs out. Open orders scheduled before
+    `start` are due on `start`.
+    """
+    required = defaultdict(lambda: defaultdict(float))
+    for day, material_id, quantity in daily_demand(end):
+        required[material_id][max(day, start)] += float(quantity or 0)
+
+    materials = {
+        m.material_id: m
+        for m in db.session.query(
+            Material.material_id,
+            Material.title,
+            Material.unit_of_measure,
+            Material.current_quantity,
+            Material.minimum_quantity,
+        ).filter(Material.material_id.in_(list(required)))
+    } if required else {}
+
+    result = []
+    for material_id, days in required.items():
+        material = materials.get(material_id)
+        if material is None:
+            continue
+        factor = UNIT_FACTORS.get(material.unit_of_measure, 1.0)
+        stock = float(material.current_quantity or 0)
+        minimum = float(material.minimum_quantity or 0)
+
+        projected = stock
+        below_minimum_on = None
+        short_on = None
+        schedule = []
+        for day in sorted(days):
+            quantity = days[day] * factor
+            projected -= quantity
+            if below_minimum_on is None and projected < minimum:
+                below_minimum_on = day
+            if short_on is None and projected < 0:
+                short_on = day
+            schedule.append({
+                "date": day.isoformat(),
+                "required": round(quantity, 3),
+                "projected": round(projected, 3),
+            })
+
+        result.append({
+            "material_id": material_id,
+            "title": material.title,
+            "unit": material.unit_of_measure,
+            "current_quantity": stock,
+            "minimum_quantity": minimum,
+            "required": round(stock - projected, 3),
+            "projected": round(projected, 3),
+            "shortage": round(max(-projected, 0.0), 3),
+            "below_minimum_on": below_minimum_on.isoformat() if below_minimum_on else None,
+            "short_on": short_on.isoformat() if short_on else None,
+            "days": schedule,
+        })
+
+    result.sort(key=lambda m: (m["short_on"] is None, m["below_minimum_on"] is None, m["title"]))
+    return result
@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+from extensions import socketio
+
+
+class Subscription:
+    """
+    Bounded queue of readings for one consumer. When the consumer falls
+    behind, the oldest reading is dropped so the poller never blocks.
+    """
+
+    def __init__(self, maxsize=10):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, reading):
+        while True:
+            try:
+                self.queue.put_nowait(reading)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ScaleBroadcaster:
+    """
+    Polls one scale from a single background task and fans every reading
+    out to all subscribers. The poller only runs while someone is subscribed,
+    so device load is one read per interval regardless of viewer count.
+    With read_fn=None the broadcaster has no poller of its own and is fed
+    through publish() (e.g. by the scale polling engine).
+
+    While a capture is on (set_capture) the scale is polled faster; capture
+    subscribers get every (monotonic time, reading) pair, regular
+    subscribers still get readings at the normal interval.
+    """
+
+    def __init__(self, name, read_fn, interval=1.0, queue_size=10):
+        self.name = name
+        self.read_fn = read_fn
+        self.interval = interval
+        self.queue_size = queue_size
+        self.capture_interval = None
+        self.latest = None
+        self._subscribers = set()
+        self._capture_subscribers = set()
+        self._last_fanout = 0.0
+        self._lock = threading.Lock()
+        self._running = False
+
+    def subscribe(self, capture=False):
+        if capture:
+            # room for a few seconds of fast samples
+            subscription = Subscription(maxsize=self.queue_size * 50)
+        else:
+            subscription = Subscription(maxsize=self.queue_size)
+        with self._lock:
+            (self._capture_subscribers if capture else self._subscribers).add(subscription)
+            start = self.read_fn is not None and not self._running
+            if start:
+                self._running = True
+        if self.latest is not None and not capture:
+            subscription.put(self.latest)
+        if start:
+            socketio.start_background_task(self._poll)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            self._capture_subscribers.discard(subscription)
+
+    def set_capture(self, interval):
+        """Poll every `interval` s until set_capture(None)."""
+        self.capture_interval = interval
+
+    def next_interval(self, interval=None):
+        """Seconds until the next poll (the capture interval while capturing)."""
+        return self.capture_interval or (self.interval if interval is None else interval)
+
+    def publish(self, reading):
+        now = time.monotonic()
+        with self._lock:
+            captures = list(self._capture_subscribers)
+            # fast capture readings reach regular subscribers at the normal rate
+            fanout = self.capture_interval is None or now - self._last_fanout >= self.interval
+            if fanout:
+                self._last_fanout = now
+                subscribers = list(self._subscribers)
+        for subscription in captures:
+            subscription.put((now, reading))
+        if not fanout:
+            return
+        self.latest = reading
+        for subscription in subscribers:
+            subscription.put(reading)
+
+    def _poll(self):
+        while True:
+            with self._lock:
+                if not self._subscribers and not self._capture_subscribers:
+                    self._running = False
+                    return
+            try:
+                reading = self.read_fn()
+            except Exception as e:
+                reading = {"error": str(e)}
+            self.publish(reading)
+            socketio.sleep(self.next_interval())
+
+    def get_stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "name": self.name,
+            "running": self._running,
+            "interval": self.interval,
+            "capture_interval": self.capture_interval,
+            "subscribers": len(subscribers),
+            "dropped": sum(s.dropped for s in subscribers),
+        }
+
+
+_broadcasters = {}
+_broadcasters_lock = threading.Lock()
+
+
+def get_broadcaster(name, read_fn=None, interval=1.0):
+    """Return the process-wide broadcaster for a scale, creating it on first use."""
+    with _broadcasters_lock:
+        broadcaster = _broadcasters.get(name)
+        if broadcaster is None:
+            broadcaster = ScaleBroadcaster(name, read_fn, interval=interval)
+            _broadcasters[name] = broadcaster
+        return broadcaster
+
+
+class SocketRelay:
+    """
+    Forwards a broadcaster's readings to a Socket.IO room through its own
+    queue, so slow socket delivery cannot stall the poller. Subscribed only
+    while the room has clients (join/leave by socket id): when the last one
+    leaves or disconnects the subscription is dropped, so a demand-driven
+    poller can stop.
+    """
+
+    def __init__(self, broadcaster, event="weight", room=None):
+        self.broadcaster = broadcaster
+        self.event = event
+        self.room = room
+        self.subscription = None
+        self._clients = set()
+        self._lock = threading.Lock()
+
+    def join(self, sid):
+        with self._lock:
+            self._clients.add(sid)
+            if self.subscription is not None:
+                return
+            subscription = self.subscription = self.broadcaster.subscribe()
+        socketio.start_background_task(self._relay, subscription)
+
+    def leave(self, sid):
+        with self._lock:
+            self._clients.discard(sid)
+            if self._clients or self.subscription is None:
+                return
+            subscription, self.subscription = self.subscription, None
+        self.broadcaster.unsubscribe(subscription)
+
+    def _relay(self, subscription):
+        while self.subscription is subscription:
+            reading = subscription.get(timeout=self.broadcaster.interval * 5)
+            if reading is not None and self.subscription is subscription:
+                socketio.emit(self.event, reading, to=self.room)
+
+    def get_stats(self):
+        with self._lock:
+            return {"clients": len(self._clients), "subscribed": self.subscription is not None}
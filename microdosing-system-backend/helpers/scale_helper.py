@@ -1,13 +1,130 @@
-from models.scale_data import ScaleData
-from extensions import db
-
-
-def save_scale_data(weight, error_code, error_message):
-    """
-    Save one record into the scale_data table.
-    """
-    scale_entry = ScaleData(
-        weight=weight, error_code=error_code, error_message=error_message
-    )
-    db.session.add(scale_entry)
-    db.session.commit()
+import atexit
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from models.scale_data import ScaleData
+from extensions import db
+from helpers.scale_rollup import apply_rollups
+
+
+class ScaleDataWriter:
+    """
+    Buffers scale readings in memory and writes them with one multi-row
+    INSERT per flush (every `flush_interval` seconds or `batch_size` rows).
+    The minute/hour rollups are updated in the same transaction.
+
+    The buffer is bounded: while the database is slow or down the oldest
+    readings are dropped (and counted) instead of blocking the reader, and
+    rows from a failed flush are put back for the next attempt.
+    """
+
+    def __init__(self, flush_interval=1.0, batch_size=500, max_buffer=20000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.app = None
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    def init_app(self, app):
+        self.app = app
+        self.flush_interval = app.config.get("SCALE_WRITER_FLUSH_INTERVAL", self.flush_interval)
+        self.batch_size = app.config.get("SCALE_WRITER_BATCH_SIZE", self.batch_size)
+        self.max_buffer = app.config.get("SCALE_WRITER_MAX_BUFFER", self.max_buffer)
+        atexit.register(self.stop)
+
+    def add(self, weight, error_code, error_message, timestamp=None):
+        row = {
+            "timestamp": timestamp or datetime.utcnow(),
+            "weight": weight,
+            "error_code": error_code,
+            "error_message": error_message,
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+
+        self._ensure_started()
+        if full:
+            self._wakeup.set()
+
+    def _ensure_started(self):
+        if self._thread is None and self.app is not None:
+            self._thread = threading.Thread(
+                target=self._run, name="scale-data-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self.flush():
+                # Back off while the database is unavailable
+                self._wakeup.wait(self.flush_interval * 5)
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _requeue(self, rows):
+        with self._lock:
+            room = self.max_buffer - len(self._buffer)
+            if room < len(rows):
+                self.dropped += len(rows) - room
+                rows = rows[len(rows) - room :] if room > 0 else []
+            self._buffer.extendleft(reversed(rows))
+
+    def flush(self):
+        """Write everything buffered so far. Returns False if a write failed."""
+        with self.app.app_context():
+            while True:
+                rows = self._take_batch()
+                if not rows:
+                    return True
+                try:
+                    db.session.execute(insert(ScaleData), rows)
+                    apply_rollups(rows)
+                    db.session.commit()
+                    self.written += len(rows)
+                except Exception as e:
+                    db.session.rollback()
+                    self.failed_flushes += 1
+                    self._requeue(rows)
+                    print(f"[Scale Writer] Flush of {len(rows)} rows failed: {e}")
+                    return False
+
+    def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self.app is not None and self._buffer:
+            self.flush()
+
+    def get_stats(self):
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+scale_data_writer = ScaleDataWriter()
+
+
+def save_scale_data(weight, error_code, error_message):
+    """
+    Queue one record for the scale_data table (written in bulk).
+    """
+    scale_data_writer.add(weight, error_code, error_message)
@@ -0,0 +1,197 @@
+import asyncio
+import queue
+import threading
+import time
+from pymodbus.client import AsyncModbusTcpClient
+from extensions import socketio
+from helpers.scale_broadcaster import get_broadcaster
+from helpers.scale_service import get_scale_service
+from utils.register_map import get_register_map, register_span, decode_registers
+from utils.scale_connection import build_reading
+from utils.circuit_breaker import get_breaker, CircuitOpenError
+
+try:
+    # app.py monkey-patches with eventlet: the engine's loop must run in a
+    # real OS thread, not a green thread that would starve the eventlet hub
+    from eventlet import patcher, tpool
+
+    _threading = patcher.original("threading")
+    _queue = patcher.original("queue")
+except ImportError:
+    tpool = None
+    _threading = threading
+    _queue = queue
+
+
+class ScalePollingEngine:
+    """
+    Polls every active Scale concurrently from one asyncio loop running in a
+    background OS thread. Each scale has its own task and poll interval, so a
+    slow or unreachable device only delays itself and a polling round takes
+    as long as the slowest device rather than the sum of all of them.
+
+    Readings cross back to the eventlet hub through a thread-safe queue and
+    are pushed from a background task into the scale's reading service (for
+    read-weight) and its broadcaster (for live streams).
+
+    Opt-in (SCALE_POLLING_ENABLED). State is per process: deploy the app as
+    a single worker process, or every worker polls every scale.
+    """
+
+    def __init__(self, queue_size=1000):
+        self._loop = None
+        self._thread = None
+        self._tasks = {}
+        self._configs = {}
+        self._stats = {}
+        self._readings = _queue.Queue(maxsize=queue_size)
+
+    @staticmethod
+    def _load_configs(app):
+        from models.scale import Scale
+
+        with app.app_context():
+            return [s.to_config() for s in Scale.query.filter_by(active=True).all()]
+
+    def start(self, app):
+        if self._thread is not None:
+            return
+        configs = self._load_configs(app)
+        self._loop = asyncio.new_event_loop()
+        self._thread = _threading.Thread(
+            target=self._run, args=(configs,), name="scale-poller", daemon=True
+        )
+        self._thread.start()
+        socketio.start_background_task(self._deliver)
+
+    def reload(self, app):
+        """Re-read the Scale table and start/stop/restart polling tasks."""
+        if self._loop is None:
+            return self.start(app)
+        configs = self._load_configs(app)
+        self._loop.call_soon_threadsafe(self._apply_configs, configs)
+
+    def get_config(self, scale_id):
+        return self._configs.get(scale_id)
+
+    def _run(self, configs):
+        asyncio.set_event_loop(self._loop)
+        self._apply_configs(configs)
+        self._loop.run_forever()
+
+    def _deliver(self):
+        """Hand the loop's readings to the services and broadcasters (on the hub)."""
+        while True:
+            try:
+                if tpool is not None:
+                    item = tpool.execute(self._readings.get, timeout=1)
+                else:
+                    item = self._readings.get(timeout=1)
+            except _queue.Empty:
+                continue
+            service, broadcaster, reading = item
+            service.update(reading)
+            broadcaster.publish(reading)
+
+    def _apply_configs(self, configs):
+        wanted = {c["scale_id"]: c for c in configs}
+
+        for scale_id in list(self._tasks):
+            if wanted.get(scale_id) != self._configs.get(scale_id):
+                self._tasks.pop(scale_id).cancel()
+                self._configs.pop(scale_id, None)
+                self._stats.pop(scale_id, None)
+
+        for scale_id, config in wanted.items():
+            if scale_id not in self._tasks:
+                self._configs[scale_id] = config
+                self._tasks[scale_id] = self._loop.create_task(self._poll_scale(config))
+
+    async def _poll_scale(self, config):
+        scale_id = config["scale_id"]
+        register_map = get_register_map(config["register_map"])
+        start, count = register_span(register_map)
+        service = get_scale_service(config)
+        broadcaster = get_broadcaster(f"scale-{scale_id}", interval=config["poll_interval"])
+        stats = self._stats[scale_id] = {
+            "polls": 0,
+            "errors": 0,
+            "last_poll_ms": None,
+            "max_poll_ms": 0.0,
+            "dropped": 0,
+        }
+        client = AsyncModbusTcpClient(config["host"], port=config["port"], timeout=3)
+        breaker = get_breaker(config["host"], config["port"], config["unit_id"])
+
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    breaker.check()
+                    try:
+                        if not client.connected:
+                            await client.connect()
+                        if not client.connected:
+                            raise ConnectionError("Unable to connect to scale")
+
+                        result = await client.read_holding_registers(
+                            address=start, count=count, slave=config["unit_id"]
+                        )
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        breaker.record_failure(e)
+                        client.close()
+                        raise
+                    breaker.record_success()
+
+                    if result.isError():
+                        raise Exception("Error reading register from scale")
+
+                    values = decode_registers(register_map, result.registers, start)
+                    reading = build_reading(values, register_map, config["scaling_factor"])
+                except asyncio.CancelledError:
+                    raise
+                except CircuitOpenError as e:
+                    reading = {"error": str(e)}
+                except Exception as e:
+                    stats["errors"] += 1
+                    reading = {"error": str(e)}
+
+                reading["scale_id"] = scale_id
+                elapsed = time.perf_counter() - started
+                stats["polls"] += 1
+                stats["last_poll_ms"] = round(elapsed * 1000, 2)
+                stats["max_poll_ms"] = round(max(stats["max_poll_ms"], elapsed * 1000), 2)
+
+                try:
+                    self._readings.put_nowait((service, broadcaster, reading))
+                except _queue.Full:
+                    stats["dropped"] += 1
+
+                await asyncio.sleep(
+                    max(broadcaster.next_interval(config["poll_interval"]) - elapsed, 0)
+                )
+        finally:
+            client.close()
+
+    def get_stats(self):
+        scales = []
+        for scale_id, config in list(self._configs.items()):
+            scales.append(
+                {
+                    "scale_id": scale_id,
+                    "name": config["name"],
+                    "poll_interval": config["poll_interval"],
+                    **self._stats.get(scale_id, {}),
+                }
+            )
+        poll_times = [s["last_poll_ms"] for s in scales if s.get("last_poll_ms") is not None]
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "scales": scales,
+            "slowest_poll_ms": max(poll_times) if poll_times else None,
+        }
+
+
+scale_engine = ScalePollingEngine()
@@ -1,23 +1,26 @@
-import time
-from utils.scale_connection import read_scale_data
-from helpers.scale_helper import save_scale_data
-
-
-def start_scale_reader(app):
-    with app.app_context():
-        while True:
-            data = read_scale_data()
-
-            if "error" not in data:
-                save_scale_data(
-                    weight=data["weight"],
-                    error_code=data["error_code"],
-                    error_message=data["error_message"],
-                )
-                print(
-                    f"[Scale Reader] Saved weight: {data['weight']} at {data['timestamp']}"
-                )
-            else:
-                print(f"[Scale Reader] Error reading scale: {data['error']}")
-
-            time.sleep(1)
+import time
+from helpers.scale_service import scale_service
+from helpers.scale_helper import save_scale_data
+
+
+def start_scale_reader(app):
+    """
+    Capture readings of the default scale every SCALE_CAPTURE_INTERVAL
+    seconds (0.05-0.1 for 10-20 Hz during doses). Rows are buffered and
+    written in bulk by the scale data writer.
+    """
+    interval = app.config.get("SCALE_CAPTURE_INTERVAL", 1.0)
+    while True:
+        started = time.monotonic()
+        data = scale_service.refresh()
+
+        if "error" not in data:
+            save_scale_data(
+                weight=data["weight"],
+                error_code=data["error_code"],
+                error_message=data["error_message"],
+            )
+        else:
+            print(f"[Scale Reader] Error reading scale: {data['error']}")
+
+        time.sleep(max(interval - (time.monotonic() - started), 0))
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from sqlalchemy import case
+from extensions import db
+from helpers.upsert import upsert
+from models.scale_data import ScaleData, ScaleDataMinute, ScaleDataHour
+
+# resolution name -> (model, bucket width in seconds)
+ROLLUPS = {
+    "minute": (ScaleDataMinute, 60),
+    "hour": (ScaleDataHour, 3600),
+}
+
+
+def bucket_start(timestamp, seconds):
+    if seconds == 60:
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate_rows(rows, seconds):
+    """Group raw scale_data rows into {bucket: aggregate} in one pass."""
+    buckets = {}
+    for row in rows:
+        key = bucket_start(row["timestamp"], seconds)
+        weight = row["weight"]
+        agg = buckets.get(key)
+        if agg is None:
+            agg = buckets[key] = {
+                "bucket": key,
+                "count": 0,
+                "sum_weight": 0.0,
+                "min_weight": weight,
+                "max_weight": weight,
+                "last_weight": weight,
+                "last_timestamp": row["timestamp"],
+                "error_count": 0,
+            }
+        agg["count"] += 1
+        agg["sum_weight"] += weight
+        agg["min_weight"] = min(agg["min_weight"], weight)
+        agg["max_weight"] = max(agg["max_weight"], weight)
+        if row["timestamp"] >= agg["last_timestamp"]:
+            agg["last_weight"] = weight
+            agg["last_timestamp"] = row["timestamp"]
+        if row["error_code"]:
+            agg["error_count"] += 1
+    return list(buckets.values())
+
+
+def apply_rollups(rows):
+    """
+    Merge a batch of newly inserted scale_data rows into the minute and
+    hour rollups with one upsert per table. Runs in the caller's transaction.
+    """
+    for model, seconds in ROLLUPS.values():
+        aggregates = aggregate_rows(rows, seconds)
+        if not aggregates:
+            continue
+
+        table = model.__table__.c
+
+        def merge(new):
+            def pick(condition, name):
+                # the incoming value where `condition` holds, else the stored one
+                return case((condition, new[name]), else_=table[name])
+
+            # Columns are indexed by name (`count` is also a method). Order matters
+            # on MySQL, which applies the assignments in turn: last_weight must be
+            # compared before last_timestamp moves.
+            return [
+                ("count", table["count"] + new["count"]),
+                ("sum_weight", table["sum_weight"] + new["sum_weight"]),
+                ("min_weight", pick(new["min_weight"] < table["min_weight"], "min_weight")),
+                ("max_weight", pick(new["max_weight"] > table["max_weight"], "max_weight")),
+                ("last_weight", pick(new["last_timestamp"] >= table["last_timestamp"], "last_weight")),
+                ("last_timestamp", pick(new["last_timestamp"] > table["last_timestamp"], "last_timestamp")),
+                ("error_count", table["error_count"] + new["error_count"]),
+            ]
+
+        db.session.execute(upsert(model.__table__, aggregates, update=merge))
+
+
+def choose_resolution(start, end, max_points, raw_interval):
+    """Finest resolution whose point count over [start, end) fits max_points."""
+    span = max((end - start).total_seconds(), 0)
+    if span / max(raw_interval, 0.001) <= max_points:
+        return "raw"
+    if span / 60 <= max_points:
+        return "minute"
+    return "hour"
+
+
+def query_series(start, end, resolution):
+    if resolution == "raw":
+        records = (
+            db.session.query(ScaleData.timestamp, ScaleData.weight, ScaleData.error_code)
+            .filter(ScaleData.timestamp >= start, ScaleData.timestamp < end)
+            .order_by(ScaleData.timestamp)
+            .all()
+        )
+        return [
+            {
+                "timestamp": r.timestamp.isoformat(),
+                "count": 1,
+                "min": r.weight,
+                "max": r.weight,
+                "mean": r.weight,
+                "last": r.weight,
+                "error_count": 1 if r.error_code else 0,
+            }
+            for r in records
+        ]
+
+    model, seconds = ROLLUPS[resolution]
+    records = (
+        model.query.filter(
+            model.bucket >= bucket_start(start, seconds), model.bucket < end
+        )
+        .order_by(model.bucket)
+        .all()
+    )
+    return [
+        {
+            "timestamp": r.bucket.isoformat(),
+            "count": r.count,
+            "min": r.min_weight,
+            "max": r.max_weight,
+            "mean": round(r.mean_weight, 3) if r.count else None,
+            "last": r.last_weight,
+            "error_count": r.error_count,
+        }
+        for r in records
+    ]
+
+
+def parse_datetime(value, name):
+    """ISO datetime query value; ValueError with a client-facing message."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an ISO datetime")
+
+
+def parse_range(from_arg, to_arg, default_span=timedelta(hours=1)):
+    end = parse_datetime(to_arg, "to") if to_arg else datetime.utcnow()
+    start = parse_datetime(from_arg, "from") if from_arg else end - default_span
+    if start >= end:
+        raise ValueError("'from' must be before 'to'")
+    return start, end
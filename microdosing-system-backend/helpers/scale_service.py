@@ -0,0 +1,161 @@
+import threading
+import time
+from config import Config
+from helpers.scale_broadcaster import SocketRelay, get_broadcaster
+from utils.modbus_pool import modbus_pool
+from utils.register_map import get_register_map, read_register_map
+from utils.scale_connection import read_scale_data, raw_to_kg, build_reading
+
+
+def read_default_scale():
+    data = read_scale_data()
+    if "error" not in data:
+        data["weight_kg"] = raw_to_kg(data["weight"])
+    return data
+
+
+class ScaleReadingService:
+    """
+    Latest-reading cache in front of a scale. Readings younger than `ttl`
+    seconds are served from memory, and concurrent callers that miss the
+    cache share a single in-flight Modbus transaction.
+
+    When a read fails (e.g. the circuit breaker is open) the result still
+    carries "error", plus the last-known-good reading's fields and
+    "stale": True, so callers answer immediately and can show the last
+    weight without ever dosing against it.
+    """
+
+    def __init__(self, read_fn, ttl=0.5):
+        self.read_fn = read_fn
+        self.ttl = ttl
+        self._reading = None
+        self._read_at = 0.0
+        self._inflight = None
+        self._last_good = None
+        self._last_good_at = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_reading(self, max_age=None):
+        max_age = self.ttl if max_age is None else max_age
+
+        with self._lock:
+            if self._reading is not None and time.monotonic() - self._read_at <= max_age:
+                self.hits += 1
+                return self._present(self._reading)
+
+            self.misses += 1
+            inflight = self._inflight
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight = threading.Event()
+
+        if not leader:
+            inflight.wait()
+            with self._lock:
+                return self._present(self._reading or {"error": "No reading available"})
+
+        try:
+            reading = self.read_fn()
+        except Exception as e:
+            reading = {"error": str(e)}
+
+        self.update(reading)
+        with self._lock:
+            self._inflight = None
+            presented = self._present(reading)
+        inflight.set()
+        return presented
+
+    def refresh(self):
+        """Force a fresh read (still shared with concurrent callers)."""
+        return self.get_reading(max_age=0)
+
+    def update(self, reading):
+        with self._lock:
+            self._reading = reading
+            self._read_at = time.monotonic()
+            if "error" not in reading:
+                self._last_good = reading
+                self._last_good_at = self._read_at
+
+    def _present(self, reading):
+        # Called with self._lock held
+        if "error" not in reading:
+            return dict(reading, stale=False)
+        if self._last_good is None:
+            return dict(reading, stale=True, unavailable=True)
+        return dict(
+            self._last_good,
+            error=reading["error"],
+            stale=True,
+            unavailable=True,
+            stale_ms=round((time.monotonic() - self._last_good_at) * 1000, 2),
+        )
+
+    def get_stats(self):
+        with self._lock:
+            age = time.monotonic() - self._read_at if self._reading is not None else None
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "age_ms": round(age * 1000, 2) if age is not None else None,
+        }
+
+
+scale_service = ScaleReadingService(read_default_scale, ttl=Config.SCALE_READING_TTL)
+
+# Single poller for the default scale: live-weight streams and the stability
+# monitor subscribe to it, and every poll refreshes the reading cache.
+live_weight_broadcaster = get_broadcaster(
+    "default", scale_service.refresh, interval=Config.SCALE_POLL_INTERVAL
+)
+
+# `weight` Socket.IO room: subscribed to the poller only while it has clients
+weight_relay = SocketRelay(live_weight_broadcaster, event="weight", room="weight")
+
+
+def make_scale_reader(config):
+    """Synchronous (pooled) reader for a configured Scale, see Scale.to_config()."""
+    register_map = get_register_map(config["register_map"])
+
+    def read():
+        try:
+            values = modbus_pool.transaction(
+                config["host"],
+                config["port"],
+                config["unit_id"],
+                lambda client, unit_id: read_register_map(client, unit_id, register_map),
+            )
+            reading = build_reading(values, register_map, config["scaling_factor"])
+            reading["scale_id"] = config["scale_id"]
+            return reading
+        except Exception as e:
+            return {"error": str(e), "scale_id": config["scale_id"]}
+
+    return read
+
+
+_scale_services = {}
+_scale_services_lock = threading.Lock()
+
+
+def get_scale_service(config):
+    """
+    Reading service for a configured Scale. The polling engine keeps it
+    fresh; a direct pooled read is only made when the engine falls behind.
+    """
+    scale_id = config["scale_id"]
+    ttl = max(Config.SCALE_READING_TTL, 2 * config["poll_interval"])
+    with _scale_services_lock:
+        service = _scale_services.get(scale_id)
+        if service is None:
+            service = ScaleReadingService(make_scale_reader(config), ttl=ttl)
+            _scale_services[scale_id] = service
+        else:
+            service.read_fn = make_scale_reader(config)
+            service.ttl = ttl
+        return service
@@ -0,0 +1,351 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, literal_column, select
+from config import Config
+from extensions import db, socketio
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial, RecipeMaterial
+from models.scale import Scale
+from models.schedule import ProductionSchedule
+
+# Orders that still need a station
+OPEN_STATUSES = ("planned", "verified")
+
+# A station's head slot is re-anchored to now once it is this far behind (s)
+SLACK_S = 60
+
+_lock = threading.Lock()
+_rates = {"at": None, "value": None}
+RATES_TTL = 300
+
+
+def _shift_time(value):
+    hours, minutes = value.split(":")
+    return datetime.min.replace(hour=int(hours), minute=int(minutes)).time()
+
+
+SHIFT_START = _shift_time(Config.SCHEDULER_SHIFT_START)
+SHIFT_END = _shift_time(Config.SCHEDULER_SHIFT_END)
+
+
+def recipe_rates():
+    """
+    Seconds per material for each recipe, from the gaps between consecutive
+    doses of the same order (dosed_at deltas) over the history window, in
+    one grouped query. Orders with gaps longer than SCHEDULER_MAX_INTERVAL_S
+    on average (breaks, stopped lines) are left out. Returns
+    ({recipe_id: seconds}, overall seconds); cached for RATES_TTL.
+    """
+    if _rates["at"] is not None and time.monotonic() - _rates["at"] < RATES_TTL:
+        return _rates["value"]
+
+    since = datetime.now() - timedelta(days=Config.SCHEDULER_HISTORY_DAYS)
+    per_order = (
+        select(
+            ProductionOrder.recipe_id.label("recipe_id"),
+            func.timestampdiff(
+                literal_column("SECOND"),
+                func.min(DosedRecipeMaterial.dosed_at),
+                func.max(DosedRecipeMaterial.dosed_at),
+            ).label("span"),
+            (func.count(DosedRecipeMaterial.id) - 1).label("gaps"),
+        )
+        .join(
+            ProductionOrderMaterial,
+            ProductionOrderMaterial.id == DosedRecipeMaterial.order_material_id,
+        )
+        .join(ProductionOrder, ProductionOrder.order_id == ProductionOrderMaterial.order_id)
+        .where(DosedRecipeMaterial.status == "Dosed", DosedRecipeMaterial.dosed_at >= since)
+        .group_by(ProductionOrderMaterial.order_id, ProductionOrder.recipe_id)
+        .having(func.count(DosedRecipeMaterial.id) > 1)
+        .subquery()
+    )
+    rows = (
+        db.session.query(per_order.c.recipe_id, func.sum(per_order.c.span), func.sum(per_order.c.gaps))
+        .filter(per_order.c.span <= per_order.c.gaps * Config.SCHEDULER_MAX_INTERVAL_S)
+        .group_by(per_order.c.recipe_id)
+        .all()
+    )
+
+    rates = {recipe_id: float(span) / float(gaps) for recipe_id, span, gaps in rows if gaps}
+    total_gaps = sum(float(gaps or 0) for _, _, gaps in rows)
+    overall = (
+        sum(float(span or 0) for _, span, _ in rows) / total_gaps
+        if total_gaps
+        else Config.SCHEDULER_DEFAULT_MATERIAL_S
+    )
+    _rates["value"] = (rates, overall)
+    _rates["at"] = time.monotonic()
+    return _rates["value"]
+
+
+def open_orders():
+    """Open orders with their pending material counts (two queries)."""
+    pending = (
+        select(
+            ProductionOrderMaterial.order_id,
+            func.count(ProductionOrderMaterial.id).label("pending"),
+        )
+        .where(ProductionOrderMaterial.status == "pending")
+        .group_by(ProductionOrderMaterial.order_id)
+        .subquery()
+    )
+    targets = (
+        select(ProductionOrderMaterial.order_id)
+        .group_by(ProductionOrderMaterial.order_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(
+            ProductionOrder.order_id,
+            ProductionOrder.order_number,
+            ProductionOrder.recipe_id,
+            ProductionOrder.status,
+            ProductionOrder.scale_id,
+            ProductionOrder.scheduled_date,
+            ProductionOrder.created_at,
+            pending.c.pending,
+            targets.c.order_id.label("has_targets"),
+        )
+        .outerjoin(pending, pending.c.order_id == ProductionOrder.order_id)
+        .outerjoin(targets, targets.c.order_id == ProductionOrder.order_id)
+        .filter(ProductionOrder.status.in_(OPEN_STATUSES))
+        .all()
+    )
+
+    # Orders from before per-order targets: count their recipe's materials
+    legacy = {r.recipe_id for r in rows if r.has_targets is None}
+    recipe_counts = dict(
+        db.session.query(RecipeMaterial.recipe_id, func.count(RecipeMaterial.recipe_material_id))
+        .filter(RecipeMaterial.recipe_id.in_(legacy))
+        .group_by(RecipeMaterial.recipe_id)
+        .all()
+    ) if legacy else {}
+
+    orders = {}
+    for r in rows:
+        materials = r.pending if r.has_targets is not None else recipe_counts.get(r.recipe_id, 0)
+        orders[r.order_id] = {
+            "order_id": r.order_id,
+            "order_number": r.order_number,
+            "recipe_id": r.recipe_id,
+            "status": r.status,
+            "scale_id": r.scale_id,
+            "scheduled_date": r.scheduled_date,
+            "created_at": r.created_at,
+            "materials": int(materials or 0),
+        }
+    return orders
+
+
+def _sort_key(order):
+    return (order["scheduled_date"], order["created_at"] or datetime.min, order["order_id"])
+
+
+def _fit(start, seconds):
+    """Earliest start >= `start` inside a shift (a slot longer than a shift starts at its opening)."""
+    opening = datetime.combine(start.date(), SHIFT_START)
+    closing = datetime.combine(start.date(), SHIFT_END)
+    if start < opening:
+        start = opening
+    elif start >= closing:
+        start = opening + timedelta(days=1)
+    closing = datetime.combine(start.date(), SHIFT_END)
+    if start + timedelta(seconds=seconds) > closing and start.time() != SHIFT_START:
+        start = datetime.combine(start.date() + timedelta(days=1), SHIFT_START)
+    return start
+
+
+class _Plan:
+    """The stations' queues while one re-plan runs."""
+
+    def __init__(self, orders, stations, rates, now):
+        self.orders = orders
+        self.stations = stations
+        self.rates, self.overall = rates
+        self.now = now
+        self.queues = {station: [] for station in stations}
+        self.touched = set()
+
+    def estimate(self, order):
+        rate = self.rates.get(order["recipe_id"], self.overall)
+        # whole seconds, like the DATETIME columns, so unchanged slots compare equal
+        return round(max(order["materials"], 1) * rate)
+
+    def recompute(self, station, first):
+        """Re-time a queue from `first`; stops once a slot comes out unchanged."""
+        queue = self.queues[station]
+        for index in range(first, len(queue)):
+            row = queue[index]
+            order = self.orders[row.order_id]
+            seconds = self.estimate(order)
+            previous_end = queue[index - 1].planned_end if index else self.now
+            if order["status"] == "verified":
+                # running: keep its start, the remaining materials run from now
+                start = max(previous_end, self.now) if row.planned_start is None else row.planned_start
+                end = max(start, self.now) + timedelta(seconds=seconds)
+            else:
+                earliest = max(previous_end, datetime.combine(order["scheduled_date"], SHIFT_START))
+                start = _fit(max(earliest, self.now), seconds)
+                end = start + timedelta(seconds=seconds)
+
+            if (
+                row.order_id not in self.touched
+                and row.position == index
+                and row.planned_start == start
+                and row.planned_end == end
+            ):
+                break
+            row.scale_id = station
+            row.position = index
+            row.planned_start = start
+            row.planned_end = end
+            row.estimated_s = seconds
+            self.touched.add(row.order_id)
+
+    def place(self, order):
+        """Insert an order into the queue (of its own station, if fixed) that finishes it first."""
+        if order["status"] == "verified" or order["scale_id"] is not None:
+            candidates = [order["scale_id"]] if order["scale_id"] in self.queues else list(self.queues)
+        else:
+            candidates = list(self.queues)
+
+        key = _sort_key(order)
+        seconds = self.estimate(order)
+        best = None
+        for station in candidates:
+            queue = self.queues[station]
+            if order["status"] == "verified":
+                position = 0
+            else:
+                position = len(queue)
+                for index, row in enumerate(queue):
+                    queued = self.orders[row.order_id]
+                    if queued["status"] != "verified" and _sort_key(queued) > key:
+                        position = index
+                        break
+            previous_end = queue[position - 1].planned_end if position else self.now
+            earliest = max(previous_end, datetime.combine(order["scheduled_date"], SHIFT_START), self.now)
+            finish = _fit(earliest, seconds) + timedelta(seconds=seconds)
+            if best is None or finish < best[0]:
+                best = (finish, station, position)
+
+        _, station, position = best
+        row = ProductionSchedule(order_id=order["order_id"], scale_id=station, position=position)
+        self.queues[station].insert(position, row)
+        self.touched.add(row.order_id)
+        self.recompute(station, position)
+        return row
+
+
+def replan(order_ids=(), full=False):
+    """
+    Bring the schedule up to date. Incremental by default: slots of closed
+    or changed orders (`order_ids`) are dropped, the orders without a slot
+    are inserted, and only the queue tails behind a change are re-timed.
+    `full` rebuilds every queue. Returns a summary of what changed.
+    """
+    with _lock:
+        changed = set(order_ids)
+        orders = open_orders()
+        stations = [None] + [
+            scale_id for (scale_id,) in db.session.query(Scale.scale_id).filter(Scale.active.is_(True))
+        ]
+        plan = _Plan(orders, stations, recipe_rates(), datetime.now().replace(microsecond=0))
+
+        removed = []
+        affected = {}
+        rows = ProductionSchedule.query.order_by(ProductionSchedule.position).all()
+        for row in rows:
+            if (
+                full
+                or row.order_id not in orders
+                or row.order_id in changed
+                or row.scale_id not in plan.queues
+            ):
+                removed.append(row)
+                if row.scale_id in plan.queues:
+                    affected[row.scale_id] = min(affected.get(row.scale_id, row.position), row.position)
+            else:
+                plan.queues[row.scale_id].append(row)
+
+        for station, queue in plan.queues.items():
+            # queue behind: its head should have finished by now
+            if queue and queue[0].planned_end < plan.now - timedelta(seconds=SLACK_S):
+                affected[station] = 0
+            if station in affected:
+                plan.recompute(station, min(affected[station], len(queue)))
+
+        placed = {row.order_id for queue in plan.queues.values() for row in queue}
+        added = []
+        for order in sorted(orders.values(), key=lambda o: (o["status"] != "verified", _sort_key(o))):
+            if order["order_id"] not in placed:
+                added.append(plan.place(order))
+
+        for row in removed:
+            db.session.delete(row)
+        db.session.add_all(added)
+        db.session.commit()
+
+    summary = {"removed": len(removed), "added": len(added), "retimed": len(plan.touched)}
+    if removed or plan.touched:
+        socketio.emit("schedule_updated", summary)
+    return summary
+
+
+def replan_orders(order_ids):
+    """Incremental re-plan after orders changed; never fails the caller."""
+    try:
+        replan(order_ids)
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"❌ Re-planning failed: {e}", exc_info=True)
+
+
+def get_schedule(horizon_hours=24):
+    """Each station's queue, with its utilisation over the next `horizon_hours`."""
+    now = datetime.now()
+    horizon = now + timedelta(hours=horizon_hours)
+    rows = (
+        db.session.query(
+            ProductionSchedule,
+            ProductionOrder.order_number,
+            ProductionOrder.recipe_id,
+            ProductionOrder.status,
+            ProductionOrder.scheduled_date,
+        )
+        .join(ProductionOrder, ProductionOrder.order_id == ProductionSchedule.order_id)
+        .filter(ProductionOrder.status.in_(OPEN_STATUSES))
+        .order_by(ProductionSchedule.scale_id, ProductionSchedule.position)
+        .all()
+    )
+    names = dict(db.session.query(Scale.scale_id, Scale.name))
+
+    stations = {}
+    for slot, order_number, recipe_id, status, scheduled_date in rows:
+        station = stations.setdefault(slot.scale_id, {
+            "scale_id": slot.scale_id,
+            "name": names.get(slot.scale_id, "default"),
+            "busy_s": 0.0,
+            "queue": [],
+        })
+        overlap = (min(slot.planned_end, horizon) - max(slot.planned_start, now)).total_seconds()
+        station["busy_s"] += max(overlap, 0.0)
+        station["queue"].append({
+            "order_id": slot.order_id,
+            "order_number": order_number,
+            "recipe_id": recipe_id,
+            "status": status,
+            "scheduled_date": scheduled_date.strftime("%Y-%m-%d") if scheduled_date else None,
+            "position": slot.position,
+            "planned_start": slot.planned_start.isoformat(),
+            "planned_end": slot.planned_end.isoformat(),
+            "estimated_s": slot.estimated_s,
+        })
+
+    result = list(stations.values())
+    for station in result:
+        station["utilisation"] = round(station.pop("busy_s") / (horizon_hours * 3600), 3)
+    return result
@@ -0,0 +1,146 @@
+from sqlalchemy import func
+from config import Config
+from extensions import db
+from helpers.upsert import upsert
+from models.dose_statistics import DoseStatistic, DoseSubgroup
+from models.recipe import DosedRecipeMaterial
+
+# X-bar/R control chart constants by subgroup size: (A2, D3, D4)
+CONTROL_CONSTANTS = {
+    2: (1.880, 0.0, 3.267),
+    3: (1.023, 0.0, 2.574),
+    4: (0.729, 0.0, 2.282),
+    5: (0.577, 0.0, 2.114),
+    6: (0.483, 0.0, 2.004),
+    7: (0.419, 0.076, 1.924),
+    8: (0.373, 0.136, 1.864),
+    9: (0.337, 0.184, 1.816),
+    10: (0.308, 0.223, 1.777),
+}
+
+# Western Electric rule 2: this many consecutive points on one side of the centre line
+RUN_LENGTH = 8
+
+
+def _bootstrap(scope, ref_id):
+    """
+    Create the statistic of a material/recipe, seeded from its dose history
+    in one query; a no-op when another station created it first.
+    """
+    column = (
+        DosedRecipeMaterial.material_id if scope == "material" else DosedRecipeMaterial.recipe_id
+    )
+    deviation = (DosedRecipeMaterial.actual - DosedRecipeMaterial.set_point) * 1000
+    count, total, squares, low, high = (
+        db.session.query(
+            func.count(DosedRecipeMaterial.id),
+            func.sum(deviation),
+            func.sum(deviation * deviation),
+            func.min(deviation),
+            func.max(deviation),
+        )
+        .filter(column == ref_id, DosedRecipeMaterial.actual.isnot(None))
+        .one()
+    )
+    mean = float(total) / count if count else None
+    # sum of squared differences from the mean, as observe() accumulates it
+    m2 = max(float(squares) - mean * float(total), 0.0) if count else 0.0
+    db.session.execute(upsert(DoseStatistic.__table__, dict(
+        scope=scope,
+        ref_id=ref_id,
+        count=count or 0,
+        mean=mean or 0.0,
+        m2=m2,
+        min_deviation=float(low) if low is not None else None,
+        max_deviation=float(high) if high is not None else None,
+        ewma=mean,
+        subgroup_count=0,
+        subgroup_sum=0.0,
+        subgroups=0,
+        xbar_sum=0.0,
+        range_sum=0.0,
+    )))
+
+
+def record_dose(material_id, recipe_id, deviation_g):
+    """
+    Fold one dose into its material and recipe statistics. Runs in the
+    caller's transaction, before that dose's DosedRecipeMaterial row is
+    added (a first-time statistic is seeded from the history). The row is
+    locked for the update, so concurrent doses are folded in one by one.
+    """
+    size = Config.SPC_SUBGROUP_SIZE
+    for scope, ref_id in (("material", material_id), ("recipe", recipe_id)):
+        if ref_id is None:
+            continue
+        stat = db.session.get(DoseStatistic, (scope, ref_id), with_for_update=True)
+        if stat is None:
+            _bootstrap(scope, ref_id)
+            stat = db.session.get(DoseStatistic, (scope, ref_id), with_for_update=True)
+        closed = stat.observe(deviation_g, alpha=Config.SPC_EWMA_ALPHA, subgroup_size=size)
+        if closed is not None:
+            db.session.add(
+                DoseSubgroup(scope=scope, ref_id=ref_id, size=size, mean=closed[0], range=closed[1])
+            )
+
+
+def control_limits(stat, size):
+    """X-bar and R chart limits from the closed-subgroup totals, or None."""
+    if not stat.subgroups:
+        return None
+    a2, d3, d4 = CONTROL_CONSTANTS.get(size, CONTROL_CONSTANTS[5])
+    xbar = stat.xbar_sum / stat.subgroups
+    rbar = stat.range_sum / stat.subgroups
+    return {
+        "xbar": {"cl": round(xbar, 3), "ucl": round(xbar + a2 * rbar, 3), "lcl": round(xbar - a2 * rbar, 3)},
+        "range": {"cl": round(rbar, 3), "ucl": round(d4 * rbar, 3), "lcl": round(d3 * rbar, 3)},
+    }
+
+
+def control_chart(scope, ref_id, limit=50):
+    stat = db.session.get(DoseStatistic, (scope, ref_id))
+    if stat is None:
+        return None
+
+    size = Config.SPC_SUBGROUP_SIZE
+    subgroups = (
+        DoseSubgroup.query.filter_by(scope=scope, ref_id=ref_id)
+        .order_by(DoseSubgroup.id.desc())
+        .limit(limit)
+        .all()
+    )[::-1]
+    limits = control_limits(stat, size)
+
+    points = []
+    side_run = 0
+    last_side = 0
+    for sg in subgroups:
+        flags = []
+        if limits:
+            if not limits["xbar"]["lcl"] <= sg.mean <= limits["xbar"]["ucl"]:
+                flags.append("xbar_out_of_limits")
+            if not limits["range"]["lcl"] <= sg.range <= limits["range"]["ucl"]:
+                flags.append("range_out_of_limits")
+
+            side = (sg.mean > limits["xbar"]["cl"]) - (sg.mean < limits["xbar"]["cl"])
+            side_run = side_run + 1 if side and side == last_side else (1 if side else 0)
+            last_side = side
+            if side_run >= RUN_LENGTH:
+                flags.append("run_one_side")
+
+        points.append({
+            "id": sg.id,
+            "mean": round(sg.mean, 3),
+            "range": round(sg.range, 3),
+            "size": sg.size,
+            "closed_at": sg.closed_at.isoformat() if sg.closed_at else None,
+            "out_of_control": bool(flags),
+            "flags": flags,
+        })
+
+    return {
+        "statistics": stat.to_dict(),
+        "subgroup_size": size,
+        "limits": limits,
+        "points": points,
+    }
@@ -0,0 +1,32 @@
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from extensions import db
+
+
+def upsert(table, values, update=None):
+    """
+    INSERT statement for `values` (a row or a list of rows) that resolves a
+    primary-key conflict in the database instead of raising: the existing
+    row is kept, or with `update`, updated. Used where two stations may
+    create the same row at once, so neither transaction (and the dose in it)
+    is rolled back over a duplicate key.
+
+    `update(new)` returns (column name, expression) pairs, where new[name]
+    is the value being inserted. The statement follows the engine's dialect:
+    ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT on PostgreSQL and SQLite.
+    """
+    dialect = db.engine.dialect.name
+    keys = list(table.primary_key.columns)
+
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table).values(values)
+        if update is None:
+            # MySQL has no DO NOTHING; re-assign the key instead of INSERT IGNORE,
+            # which would also swallow other errors
+            return stmt.on_duplicate_key_update([(keys[0].name, keys[0])])
+        return stmt.on_duplicate_key_update(update(stmt.inserted))
+
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(table).values(values)
+    if update is None:
+        return stmt.on_conflict_do_nothing(index_elements=keys)
+    return stmt.on_conflict_do_update(index_elements=keys, set_=dict(update(stmt.excluded)))
@@ -0,0 +1,154 @@
+import statistics
+import threading
+import time
+from collections import deque
+from config import Config
+from extensions import socketio
+
+
+class StabilityDetector:
+    """
+    Streaming filter over scale readings: a moving median over the last
+    `window` samples, stable once the window is full, its spread is within
+    `band_kg` and the indicator's motion bit (when it has one) is clear.
+    """
+
+    def __init__(self, window=3, band_kg=0.05):
+        self.samples = deque(maxlen=window)
+        self.band_kg = band_kg
+        self.filtered = None
+        self.stable = False
+        self.motion = None
+
+    def reset(self):
+        self.samples.clear()
+        self.filtered = None
+        self.stable = False
+
+    def feed(self, weight_kg, motion=None):
+        """Add a sample; returns True if the stable state changed."""
+        self.samples.append(weight_kg)
+        self.motion = motion
+        self.filtered = round(statistics.median(self.samples), 3)
+
+        stable = (
+            len(self.samples) == self.samples.maxlen
+            and max(self.samples) - min(self.samples) <= self.band_kg
+            and not motion
+        )
+        changed = stable != self.stable
+        self.stable = stable
+        return changed
+
+
+class StabilityMonitor:
+    """
+    Feeds one scale's readings through a StabilityDetector and emits
+    `weight_stable` and `target_reached` over Socket.IO only when their
+    state changes. The dosing target is set by the dosing code paths.
+    """
+
+    def __init__(self, name, window=3, band_kg=0.05, room=None):
+        self.name = name
+        self.room = room
+        self.detector = StabilityDetector(window=window, band_kg=band_kg)
+        self.target = None
+        self.target_reached = False
+        self.updated_at = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def set_target(self, set_point, lower_limit, **context):
+        """Track a new dosing target (kg); clears the target_reached edge."""
+        with self._lock:
+            self.target = dict(context, set_point=set_point, lower_limit=lower_limit)
+            self.target_reached = False
+
+    def clear_target(self):
+        with self._lock:
+            self.target = None
+            self.target_reached = False
+
+    def feed(self, reading):
+        with self._lock:
+            events = self._update(reading)
+        for event, payload in events:
+            socketio.emit(event, payload, to=self.room)
+        return events
+
+    def _update(self, reading):
+        events = []
+        if "error" in reading:
+            self.error = reading["error"]
+            if self.detector.stable:
+                self.detector.reset()
+                events.append(("weight_stable", self._stable_payload()))
+            return events
+
+        self.error = None
+        self.updated_at = time.monotonic()
+        if self.detector.feed(reading["weight_kg"], reading.get("motion")):
+            events.append(("weight_stable", self._stable_payload()))
+
+        reached = bool(
+            self.target
+            and self.detector.stable
+            and self.detector.filtered >= self.target["lower_limit"]
+        )
+        if reached != self.target_reached:
+            self.target_reached = reached
+            events.append(
+                (
+                    "target_reached",
+                    dict(
+                        self.target,
+                        scale=self.name,
+                        reached=reached,
+                        weight_kg=self.detector.filtered,
+                    ),
+                )
+            )
+        return events
+
+    def _stable_payload(self):
+        return {
+            "scale": self.name,
+            "stable": self.detector.stable,
+            "weight_kg": self.detector.filtered,
+        }
+
+    def get_state(self, max_age=None):
+        """
+        Filtered weight and stability, or None when no fresh sample has been
+        seen within `max_age` seconds (e.g. the monitor is not running).
+        """
+        with self._lock:
+            if self.updated_at is None or self.error is not None:
+                return None
+            if max_age is not None and time.monotonic() - self.updated_at > max_age:
+                return None
+            return {
+                "weight_kg": self.detector.filtered,
+                "stable": self.detector.stable,
+                "motion": self.detector.motion,
+                "target": self.target,
+                "target_reached": self.target_reached,
+            }
+
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def get_stability_monitor(name="default", room=None):
+    with _monitors_lock:
+        monitor = _monitors.get(name)
+        if monitor is None:
+            monitor = StabilityMonitor(
+                name,
+                window=Config.SCALE_STABLE_SAMPLES,
+                band_kg=Config.SCALE_STABLE_BAND_KG,
+                room=room,
+            )
+            _monitors[name] = monitor
+        return monitor
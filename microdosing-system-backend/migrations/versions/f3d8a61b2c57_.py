@@ -0,0 +1,159 @@
+"""restore recipe set points scaled by legacy orders, materialize their targets
+
+Revision ID: f3d8a61b2c57
+Revises: e6a2c9d4b175
+Create Date: 2026-10-18 21:06:31.482190
+
+Before per-order targets (c47e2a9d13f6), creating an order multiplied its
+recipe's RecipeMaterial.set_point by the batch size in place, and the
+order's final dose divided it back. Targets are now scaled per order, so
+an order created before that change would be scaled twice, and its recipe
+would stay inflated.
+
+For every open order without targets (planned or verified):
+
+- A verified order whose recipe was dosed through since it was created
+  (every material has a legacy dose, none is left Dosed mid-round) was
+  divided back already; it is completed.
+- The recipe's set points are divided by the batch size of each remaining
+  open order, as their final doses would have done.
+- The orders get their targets from the restored set points. Materials a
+  verified order had dosed keep their Dosed state and actual weight.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3d8a61b2c57'
+down_revision = 'e6a2c9d4b175'
+branch_labels = None
+depends_on = None
+
+
+production_order = sa.table(
+    'production_order',
+    sa.column('order_id', sa.Integer),
+    sa.column('recipe_id', sa.Integer),
+    sa.column('batch_size', sa.Float),
+    sa.column('status', sa.String),
+    sa.column('created_at', sa.TIMESTAMP),
+)
+recipe_material = sa.table(
+    'recipe_material',
+    sa.column('recipe_material_id', sa.Integer),
+    sa.column('recipe_id', sa.Integer),
+    sa.column('material_id', sa.Integer),
+    sa.column('set_point', sa.Float),
+    sa.column('margin', sa.Float),
+    sa.column('actual', sa.Float),
+    sa.column('status', sa.String),
+)
+production_order_material = sa.table(
+    'production_order_material',
+    sa.column('order_id', sa.Integer),
+    sa.column('recipe_material_id', sa.Integer),
+    sa.column('material_id', sa.Integer),
+    sa.column('sequence', sa.Integer),
+    sa.column('set_point', sa.Float),
+    sa.column('margin', sa.Float),
+    sa.column('actual', sa.Float),
+    sa.column('status', sa.String),
+)
+dosed_recipe_material = sa.table(
+    'dosed_recipe_material',
+    sa.column('recipe_id', sa.Integer),
+    sa.column('material_id', sa.Integer),
+    sa.column('order_material_id', sa.Integer),
+    sa.column('dosed_at', sa.TIMESTAMP),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    with_targets = sa.select(production_order_material.c.order_id).distinct()
+    orders = bind.execute(
+        sa.select(production_order)
+        .where(
+            production_order.c.status.in_(('planned', 'verified')),
+            production_order.c.order_id.not_in(with_targets),
+        )
+        .order_by(production_order.c.created_at, production_order.c.order_id)
+    ).all()
+
+    by_recipe = {}
+    for order in orders:
+        by_recipe.setdefault(order.recipe_id, []).append(order)
+
+    for recipe_id, recipe_orders in by_recipe.items():
+        materials = bind.execute(
+            sa.select(recipe_material)
+            .where(recipe_material.c.recipe_id == recipe_id)
+            .order_by(recipe_material.c.recipe_material_id)
+        ).all()
+        if not materials:
+            continue
+        mid_round = any(m.status == 'Dosed' for m in materials)
+
+        open_orders = []
+        for order in recipe_orders:
+            if order.status == 'verified' and not mid_round and order.created_at is not None:
+                dosed = bind.execute(
+                    sa.select(sa.func.count(sa.distinct(dosed_recipe_material.c.material_id)))
+                    .where(
+                        dosed_recipe_material.c.recipe_id == recipe_id,
+                        dosed_recipe_material.c.order_material_id.is_(None),
+                        dosed_recipe_material.c.dosed_at >= order.created_at,
+                    )
+                ).scalar()
+                if dosed >= len({m.material_id for m in materials}):
+                    bind.execute(
+                        production_order.update()
+                        .where(production_order.c.order_id == order.order_id)
+                        .values(status='completed')
+                    )
+                    continue
+            open_orders.append(order)
+
+        factor = 1.0
+        for order in open_orders:
+            factor *= float(order.batch_size or 1)
+        base = {m.recipe_material_id: round(float(m.set_point or 0) / factor, 6) for m in materials}
+        if factor != 1.0:
+            for m in materials:
+                bind.execute(
+                    recipe_material.update()
+                    .where(recipe_material.c.recipe_material_id == m.recipe_material_id)
+                    .values(set_point=base[m.recipe_material_id])
+                )
+
+        targets = []
+        for order in open_orders:
+            batch_size = float(order.batch_size or 1)
+            for sequence, m in enumerate(materials, start=1):
+                dosed = order.status == 'verified' and m.status == 'Dosed'
+                targets.append({
+                    'order_id': order.order_id,
+                    'recipe_material_id': m.recipe_material_id,
+                    'material_id': m.material_id,
+                    'sequence': sequence,
+                    'set_point': round(base[m.recipe_material_id] * batch_size, 6),
+                    'margin': m.margin,
+                    'actual': m.actual if dosed else None,
+                    'status': 'Dosed' if dosed else 'pending',
+                })
+        if targets:
+            bind.execute(production_order_material.insert(), targets)
+        if mid_round:
+            # the round's progress now lives in the verified order's targets
+            bind.execute(
+                recipe_material.update()
+                .where(recipe_material.c.recipe_id == recipe_id)
+                .values(status='pending', actual=None)
+            )
+
+
+def downgrade():
+    # Data only: the restored set points and the targets stay (the targets
+    # table itself goes with c47e2a9d13f6)
+    pass
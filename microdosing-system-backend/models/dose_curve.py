@@ -0,0 +1,29 @@
+from extensions import db
+
+
+class DoseCurve(db.Model):
+    """
+    Weight-vs-time curve of one dose, captured at a high rate while the
+    material was active and stored as one zstd-compressed NumPy array
+    (see helpers/dose_curve.py).
+    """
+
+    __tablename__ = "dose_curve"
+
+    id = db.Column(db.Integer, primary_key=True)
+    dosed_material_id = db.Column(
+        db.Integer,
+        db.ForeignKey("dosed_recipe_material.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    samples = db.Column(db.Integer, nullable=False)
+    duration_s = db.Column(db.Float, nullable=False)
+    rate_hz = db.Column(db.Float, nullable=False)
+    data = db.Column(db.LargeBinary(length=16777215), nullable=False)  # MEDIUMBLOB
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+
+    dosed_material = db.relationship(
+        "DosedRecipeMaterial",
+        backref=db.backref("curve", uselist=False, lazy=True, passive_deletes=True),
+    )
@@ -0,0 +1,103 @@
+import math
+from extensions import db
+from sqlalchemy import Index
+
+
+class DoseStatistic(db.Model):
+    """
+    Running accuracy statistics of dose deviation (actual - set_point, in
+    grams) for one material or recipe, updated on every dose in O(1):
+    count / mean / variance (Welford), min / max, an EWMA, and the open
+    subgroup used for X-bar/R control charts.
+    """
+
+    __tablename__ = "dose_statistic"
+
+    scope = db.Column(db.Enum("material", "recipe", name="dose_stat_scope"), primary_key=True)
+    ref_id = db.Column(db.Integer, primary_key=True)  # material_id or recipe_id
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+    mean = db.Column(db.Float, nullable=False, default=0.0)
+    m2 = db.Column(db.Float, nullable=False, default=0.0)
+    min_deviation = db.Column(db.Float, nullable=True)
+    max_deviation = db.Column(db.Float, nullable=True)
+    ewma = db.Column(db.Float, nullable=True)
+
+    # Open subgroup (consecutive doses) and the closed-subgroup totals
+    subgroup_count = db.Column(db.Integer, nullable=False, default=0)
+    subgroup_sum = db.Column(db.Float, nullable=False, default=0.0)
+    subgroup_min = db.Column(db.Float, nullable=True)
+    subgroup_max = db.Column(db.Float, nullable=True)
+    subgroups = db.Column(db.Integer, nullable=False, default=0)
+    xbar_sum = db.Column(db.Float, nullable=False, default=0.0)
+    range_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+    def observe(self, deviation, alpha=0.2, subgroup_size=5):
+        """
+        Fold one deviation (g) in. Returns (mean, range) when this dose
+        closes a subgroup, else None.
+        """
+        self.count = (self.count or 0) + 1
+        delta = deviation - (self.mean or 0.0)
+        self.mean = (self.mean or 0.0) + delta / self.count
+        self.m2 = (self.m2 or 0.0) + delta * (deviation - self.mean)
+        self.min_deviation = deviation if self.min_deviation is None else min(self.min_deviation, deviation)
+        self.max_deviation = deviation if self.max_deviation is None else max(self.max_deviation, deviation)
+        self.ewma = deviation if self.ewma is None else self.ewma + alpha * (deviation - self.ewma)
+
+        self.subgroup_count = (self.subgroup_count or 0) + 1
+        self.subgroup_sum = (self.subgroup_sum or 0.0) + deviation
+        self.subgroup_min = deviation if self.subgroup_min is None else min(self.subgroup_min, deviation)
+        self.subgroup_max = deviation if self.subgroup_max is None else max(self.subgroup_max, deviation)
+        if self.subgroup_count < subgroup_size:
+            return None
+
+        closed = (self.subgroup_sum / self.subgroup_count, self.subgroup_max - self.subgroup_min)
+        self.subgroups = (self.subgroups or 0) + 1
+        self.xbar_sum = (self.xbar_sum or 0.0) + closed[0]
+        self.range_sum = (self.range_sum or 0.0) + closed[1]
+        self.subgroup_count = 0
+        self.subgroup_sum = 0.0
+        self.subgroup_min = None
+        self.subgroup_max = None
+        return closed
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count and self.count > 1 else None
+
+    def to_dict(self):
+        variance = self.variance
+        return {
+            "scope": self.scope,
+            "ref_id": self.ref_id,
+            "count": self.count,
+            "mean_g": round(self.mean, 3) if self.count else None,
+            "std_g": round(math.sqrt(variance), 3) if variance is not None else None,
+            "min_g": self.min_deviation,
+            "max_g": self.max_deviation,
+            "ewma_g": round(self.ewma, 3) if self.ewma is not None else None,
+            "subgroups": self.subgroups,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class DoseSubgroup(db.Model):
+    """Closed X-bar/R subgroup (consecutive doses) of a DoseStatistic."""
+
+    __tablename__ = "dose_subgroup"
+    __table_args__ = (Index("idx_dose_subgroup_scope_ref", "scope", "ref_id", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.Enum("material", "recipe", name="dose_stat_scope"), nullable=False)
+    ref_id = db.Column(db.Integer, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    mean = db.Column(db.Float, nullable=False)
+    range = db.Column(db.Float, nullable=False)
+    closed_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
@@ -1,60 +1,109 @@
-from extensions import db, ma  # ✅ Import from extensions
-
-
-class Material(db.Model):
-    material_id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(100), nullable=False)
-    description = db.Column(db.Text, nullable=True)
-    unit_of_measure = db.Column(
-        db.Enum("Kilogram (kg)", "Gram (g)", "Milligram (mg)", name="unit_enum"),
-        nullable=False,
-    )
-    current_quantity = db.Column(db.Numeric(10, 2), nullable=False)
-    minimum_quantity = db.Column(db.Numeric(10, 2), nullable=False)
-    maximum_quantity = db.Column(db.Numeric(10, 2), nullable=False)
-    plant_area_location = db.Column(db.String(50), nullable=True)
-    barcode_id = db.Column(
-        db.String(50), unique=True, nullable=True, index=True
-    )  # <-- add index
-    status = db.Column(
-        db.Enum("Released", "Unreleased", name="status_enum"),
-        nullable=False,
-        default="Unreleased",
-        index=True,  # <-- add index
-    )
-    supplier = db.Column(db.String(100), nullable=True)
-    supplier_contact_info = db.Column(db.String(255), nullable=True)
-    notes = db.Column(db.Text, nullable=True)
-    transactions = db.relationship(
-        "MaterialTransaction", backref="material", cascade="all, delete", lazy=True
-    )
-    margin = db.Column(db.Numeric(5, 2), nullable=True)
-    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
-    updated_at = db.Column(
-        db.TIMESTAMP,
-        server_default=db.func.current_timestamp(),
-        onupdate=db.func.current_timestamp(),
-    )
-
-
-class MaterialTransaction(db.Model):
-    transaction_id = db.Column(db.Integer, primary_key=True)
-    material_id = db.Column(
-        db.Integer, db.ForeignKey("material.material_id"), nullable=False, index=True
-    )  # <-- add index
-    transaction_type = db.Column(db.Enum("addition", "removal"), nullable=False)
-    quantity = db.Column(db.Numeric(10, 2), nullable=False)
-    transaction_date = db.Column(
-        db.TIMESTAMP, server_default=db.func.current_timestamp()
-    )
-    description = db.Column(db.Text, nullable=True)
-
-
-class MaterialSchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = Material
-
-
-class MaterialTransactionSchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = MaterialTransaction
+from extensions import db, ma  # ✅ Import from extensions
+
+
+class Material(db.Model):
+    material_id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=True)
+    unit_of_measure = db.Column(
+        db.Enum("Kilogram (kg)", "Gram (g)", "Milligram (mg)", name="unit_enum"),
+        nullable=False,
+    )
+    current_quantity = db.Column(db.Numeric(10, 2), nullable=False)
+    minimum_quantity = db.Column(db.Numeric(10, 2), nullable=False)
+    maximum_quantity = db.Column(db.Numeric(10, 2), nullable=False)
+    plant_area_location = db.Column(db.String(50), nullable=True)
+    barcode_id = db.Column(
+        db.String(50), unique=True, nullable=True, index=True
+    )  # <-- add index
+    status = db.Column(
+        db.Enum("Released", "Unreleased", name="status_enum"),
+        nullable=False,
+        default="Unreleased",
+        index=True,  # <-- add index
+    )
+    supplier = db.Column(db.String(100), nullable=True)
+    supplier_contact_info = db.Column(db.String(255), nullable=True)
+    notes = db.Column(db.Text, nullable=True)
+    transactions = db.relationship(
+        "MaterialTransaction", backref="material", cascade="all, delete", lazy=True
+    )
+    margin = db.Column(db.Numeric(5, 2), nullable=True)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+
+class MaterialTransaction(db.Model):
+    transaction_id = db.Column(db.Integer, primary_key=True)
+    material_id = db.Column(
+        db.Integer, db.ForeignKey("material.material_id"), nullable=False, index=True
+    )  # <-- add index
+    transaction_type = db.Column(db.Enum("addition", "removal"), nullable=False)
+    quantity = db.Column(db.Numeric(10, 2), nullable=False)
+    transaction_date = db.Column(
+        db.TIMESTAMP, server_default=db.func.current_timestamp()
+    )
+    description = db.Column(db.Text, nullable=True)
+
+
+class MaterialInflight(db.Model):
+    """
+    Learned in-flight (pre-act) estimate per material: how much still lands
+    on the scale after the feeder is cut off. Updated incrementally after
+    every dose, see MaterialInflight.observe().
+    """
+
+    __tablename__ = "material_inflight"
+
+    material_id = db.Column(
+        db.Integer,
+        db.ForeignKey("material.material_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    inflight_kg = db.Column(db.Float, nullable=False, default=0.0)
+    samples = db.Column(db.Integer, nullable=False, default=0)
+    mean_overshoot_kg = db.Column(db.Float, nullable=True)  # EWMA of actual - set_point
+    mean_cycle_s = db.Column(db.Float, nullable=True)  # EWMA of dose duration
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+    def observe(self, overshoot_kg, inflight_kg=None, cycle_s=None, alpha=0.3):
+        """Fold one dose into the running estimates (EWMA, O(1))."""
+
+        def ewma(old, new):
+            return new if old is None else old + alpha * (new - old)
+
+        self.samples = (self.samples or 0) + 1
+        self.mean_overshoot_kg = ewma(self.mean_overshoot_kg, overshoot_kg)
+        if inflight_kg is not None:
+            self.inflight_kg = max(ewma(self.inflight_kg, inflight_kg), 0.0)
+        if cycle_s is not None:
+            self.mean_cycle_s = ewma(self.mean_cycle_s, cycle_s)
+
+    def to_dict(self):
+        return {
+            "material_id": self.material_id,
+            "inflight_kg": round(self.inflight_kg or 0, 4),
+            "samples": self.samples,
+            "mean_overshoot_g": round(self.mean_overshoot_kg * 1000, 2)
+            if self.mean_overshoot_kg is not None
+            else None,
+            "mean_cycle_s": round(self.mean_cycle_s, 2) if self.mean_cycle_s is not None else None,
+        }
+
+
+class MaterialSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Material
+
+
+class MaterialTransactionSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = MaterialTransaction
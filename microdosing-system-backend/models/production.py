@@ -1,96 +1,200 @@
-from extensions import db, ma  # ✅ Import from extensions
-from models.user import User  # ✅ Import the User model for relationship
-
-
-class ProductionOrder(db.Model):
-    __tablename__ = "production_order"
-
-    order_id = db.Column(db.Integer, primary_key=True)
-    order_number = db.Column(db.String(50), unique=True, nullable=False)
-
-    # ForeignKey to Recipe table
-    recipe_id = db.Column(
-        db.Integer,
-        db.ForeignKey("recipe.recipe_id", ondelete="CASCADE"),
-        nullable=False,
-    )
-    recipe = db.relationship(
-        "Recipe", backref="production_orders"
-    )  # Relationship to Recipe table
-
-    batch_size = db.Column(db.Numeric(10, 2), nullable=False)
-    scheduled_date = db.Column(db.Date, nullable=False)
-    status = db.Column(db.String(20), default="planned")
-
-    # ForeignKey to User table (for the creator of the order)
-    created_by = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
-
-    # ✅ Add this relationship to access user info
-    creator = db.relationship("User", backref="production_orders_created")
-
-    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
-    updated_at = db.Column(
-        db.TIMESTAMP,
-        server_default=db.func.current_timestamp(),
-        onupdate=db.func.current_timestamp(),
-    )
-
-    notes = db.Column(db.Text, nullable=True)
-    barcode_id = db.Column(db.String(100), unique=True, nullable=True)
-    dosing = db.Column(db.Float, nullable=True)
-
-
-class Batch(db.Model):
-    __tablename__ = "batch"
-
-    batch_id = db.Column(db.Integer, primary_key=True)
-    batch_number = db.Column(db.String(50), unique=True, nullable=False)
-    order_id = db.Column(
-        db.Integer, db.ForeignKey("production_order.order_id"), nullable=False
-    )
-    start_time = db.Column(db.TIMESTAMP, nullable=True)
-    end_time = db.Column(db.TIMESTAMP, nullable=True)
-
-    status = db.Column(
-        db.Enum("Released", "Unreleased", name="batch_status_enum"),
-        nullable=False,
-        default="unreleased",
-    )
-
-    operator_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
-    notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
-    updated_at = db.Column(
-        db.TIMESTAMP,
-        server_default=db.func.current_timestamp(),
-        onupdate=db.func.current_timestamp(),
-    )
-
-
-class BatchMaterialDispensing(db.Model):
-    __tablename__ = "batch_material_dispensing"
-
-    dispensing_id = db.Column(db.Integer, primary_key=True)
-    batch_id = db.Column(db.Integer, db.ForeignKey("batch.batch_id"), nullable=False)
-    material_id = db.Column(
-        db.Integer, db.ForeignKey("material.material_id"), nullable=False
-    )
-    planned_quantity = db.Column(db.Numeric(10, 2), nullable=False)
-    actual_quantity = db.Column(db.Numeric(10, 2), nullable=True)
-    dispensed_by = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
-    dispensed_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
-    status = db.Column(
-        db.Enum("pending", "dispensed", "verified"), nullable=False, default="pending"
-    )
-    batch = db.relationship(
-        "Batch", backref="batch_material_dispensings", passive_deletes=True
-    )
-
-
-# Ensure MaterialTransaction is defined or imported correctly
-try:
-    from models.material import MaterialTransaction
-
-    print("MaterialTransaction imported successfully.")
-except ImportError:
-    print("Error: Could not import MaterialTransaction.")
+from extensions import db, ma  # ✅ Import from extensions
+from models.user import User  # ✅ Import the User model for relationship
+from sqlalchemy import Index
+
+
+class ProductionOrder(db.Model):
+    __tablename__ = "production_order"
+    __table_args__ = (
+        Index("idx_production_order_scale_status", "scale_id", "status"),
+        Index("idx_production_order_status", "status"),
+        Index("idx_production_order_scheduled_date", "scheduled_date"),
+        Index("idx_production_order_created_at", "created_at"),
+    )
+
+    order_id = db.Column(db.Integer, primary_key=True)
+    order_number = db.Column(db.String(50), unique=True, nullable=False)
+
+    # ForeignKey to Recipe table
+    recipe_id = db.Column(
+        db.Integer,
+        db.ForeignKey("recipe.recipe_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    recipe = db.relationship(
+        "Recipe", backref="production_orders"
+    )  # Relationship to Recipe table
+
+    batch_size = db.Column(db.Numeric(10, 2), nullable=False)
+    scheduled_date = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), default="planned")
+
+    # ForeignKey to User table (for the creator of the order)
+    created_by = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
+
+    # ✅ Add this relationship to access user info
+    creator = db.relationship("User", backref="production_orders_created")
+
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+    notes = db.Column(db.Text, nullable=True)
+    barcode_id = db.Column(db.String(100), unique=True, nullable=True)
+    dosing = db.Column(db.Float, nullable=True)
+
+    # Station the order is dosed on; NULL is the default (configured) scale
+    scale_id = db.Column(
+        db.Integer, db.ForeignKey("scale.scale_id", ondelete="SET NULL"), nullable=True
+    )
+    scale = db.relationship("Scale", lazy=True)
+
+
+class ProductionOrderMaterial(db.Model):
+    """
+    Dosing target for one material of one production order, materialized
+    from the recipe when the order is created (set_point already multiplied
+    by batch_size). Dosing reads and updates these rows; RecipeMaterial
+    stays untouched during production.
+    """
+
+    __tablename__ = "production_order_material"
+    __table_args__ = (
+        Index("idx_order_material_order_sequence", "order_id", "sequence"),
+        Index("idx_order_material_status", "status"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(
+        db.Integer,
+        db.ForeignKey("production_order.order_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    recipe_material_id = db.Column(
+        db.Integer,
+        db.ForeignKey("recipe_material.recipe_material_id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    material_id = db.Column(
+        db.Integer, db.ForeignKey("material.material_id"), nullable=False
+    )
+    sequence = db.Column(db.Integer, nullable=False)
+    set_point = db.Column(db.Float, nullable=False)  # kg, for the whole order
+    margin = db.Column(db.Float, nullable=True)  # tolerance below set_point (g)
+    actual = db.Column(db.Float, nullable=True)
+    deviation = db.Column(db.Float, nullable=True)  # actual - set_point (g)
+    status = db.Column(
+        db.Enum("pending", "Dosed", "Rejected", name="order_material_status"),
+        nullable=False,
+        default="pending",
+        server_default="pending",
+    )
+    dosed_at = db.Column(db.TIMESTAMP, nullable=True)
+
+    order = db.relationship(
+        "ProductionOrder",
+        backref=db.backref(
+            "materials",
+            order_by="ProductionOrderMaterial.sequence",
+            cascade="all, delete-orphan",
+            passive_deletes=True,
+        ),
+    )
+    material = db.relationship("Material", lazy=True)
+    recipe_material = db.relationship("RecipeMaterial", lazy=True)
+
+    @classmethod
+    def for_order(cls, order, recipe_materials):
+        """Targets for `order` from its recipe's materials (in dosing order)."""
+        batch_size = float(order.batch_size or 1)
+        return [
+            cls(
+                order=order,
+                recipe_material_id=rm.recipe_material_id,
+                material_id=rm.material_id,
+                sequence=sequence,
+                set_point=float(rm.set_point or 0) * batch_size,
+                margin=rm.margin,
+            )
+            for sequence, rm in enumerate(recipe_materials, start=1)
+        ]
+
+    @staticmethod
+    def rows_for(order_id, batch_size, recipe_materials):
+        """Same targets as for_order, as plain rows for a bulk (executemany) insert."""
+        batch_size = float(batch_size or 1)
+        return [
+            {
+                "order_id": order_id,
+                "recipe_material_id": rm.recipe_material_id,
+                "material_id": rm.material_id,
+                "sequence": sequence,
+                "set_point": float(rm.set_point or 0) * batch_size,
+                "margin": rm.margin,
+                "status": "pending",
+            }
+            for sequence, rm in enumerate(recipe_materials, start=1)
+        ]
+
+
+class Batch(db.Model):
+    __tablename__ = "batch"
+
+    batch_id = db.Column(db.Integer, primary_key=True)
+    batch_number = db.Column(db.String(50), unique=True, nullable=False)
+    order_id = db.Column(
+        db.Integer, db.ForeignKey("production_order.order_id"), nullable=False
+    )
+    start_time = db.Column(db.TIMESTAMP, nullable=True)
+    end_time = db.Column(db.TIMESTAMP, nullable=True)
+
+    status = db.Column(
+        db.Enum("Released", "Unreleased", name="batch_status_enum"),
+        nullable=False,
+        default="unreleased",
+    )
+
+    operator_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
+    notes = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+    order = db.relationship(
+        "ProductionOrder", backref=db.backref("batches", order_by="Batch.batch_id", lazy=True)
+    )
+
+
+class BatchMaterialDispensing(db.Model):
+    __tablename__ = "batch_material_dispensing"
+
+    dispensing_id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.Integer, db.ForeignKey("batch.batch_id"), nullable=False)
+    material_id = db.Column(
+        db.Integer, db.ForeignKey("material.material_id"), nullable=False
+    )
+    planned_quantity = db.Column(db.Numeric(10, 2), nullable=False)
+    actual_quantity = db.Column(db.Numeric(10, 2), nullable=True)
+    dispensed_by = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
+    dispensed_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    status = db.Column(
+        db.Enum("pending", "dispensed", "verified"), nullable=False, default="pending"
+    )
+    batch = db.relationship(
+        "Batch", backref="batch_material_dispensings", passive_deletes=True
+    )
+
+
+# Ensure MaterialTransaction is defined or imported correctly
+try:
+    from models.material import MaterialTransaction
+
+    print("MaterialTransaction imported successfully.")
+except ImportError:
+    print("Error: Could not import MaterialTransaction.")
@@ -1,85 +1,91 @@
-from pymodbus.client import ModbusTcpClient
-from pymodbus.payload import BinaryPayloadDecoder
-from pymodbus.constants import Endian
-
-
-class ScaleClient:
-    def __init__(self, host="localhost", port=502):
-        self.host = host
-        self.port = port
-
-    def get_net_weight(self):
-        """Get the net weight from register 40003 (address 2)"""
-        client = ModbusTcpClient(self.host, port=self.port)
-        try:
-            result = client.read_holding_registers(address=2, count=2, slave=1)
-            if not result.isError():
-                decoder = BinaryPayloadDecoder.fromRegisters(
-                    result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
-                )
-                return round(decoder.decode_32bit_float(), 2)
-            return None
-        except Exception as e:
-            print(f"Error reading net weight: {str(e)}")
-            return None
-        finally:
-            client.close()
-
-    def get_scale_values(self):
-        client = ModbusTcpClient(self.host, port=self.port)
-        try:
-            # Read weights in separate calls to avoid alignment issues
-            # Gross (40001-40002) - address 0
-            gross_result = client.read_holding_registers(address=0, count=2, slave=1)
-            # Tare (40003-40004) - address 2
-            tare_result = client.read_holding_registers(address=2, count=2, slave=1)
-            # Net (40003-40004) - same as tare (calculated as gross - tare)
-            net_result = client.read_holding_registers(address=2, count=2, slave=1)
-
-            if not gross_result.isError() and not tare_result.isError():
-                # Decode weights
-                gross_decoder = BinaryPayloadDecoder.fromRegisters(
-                    gross_result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
-                )
-                tare_decoder = BinaryPayloadDecoder.fromRegisters(
-                    tare_result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
-                )
-                net_decoder = BinaryPayloadDecoder.fromRegisters(
-                    net_result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
-                )
-
-                gross = round(gross_decoder.decode_32bit_float(), 2)
-                tare = round(tare_decoder.decode_32bit_float(), 2)
-                net = round(net_decoder.decode_32bit_float(), 2)
-
-                # Read alarms (addresses 3-6 for 40004-40007)
-                alarm_result = client.read_holding_registers(
-                    address=3, count=4, slave=1
-                )
-                alarms = {
-                    "overrange": bool(alarm_result.registers[0])
-                    if not alarm_result.isError()
-                    else False,
-                    "underrange": bool(alarm_result.registers[1])
-                    if not alarm_result.isError()
-                    else False,
-                    "motion": bool(alarm_result.registers[2])
-                    if not alarm_result.isError()
-                    else False,
-                    "negative": bool(alarm_result.registers[3])
-                    if not alarm_result.isError()
-                    else False,
-                }
-
-                return {
-                    "gross_weight": gross,
-                    "tare_weight": tare,
-                    "net_weight": net,
-                    "alarms": alarms,
-                }
-            return None
-        except Exception as e:
-            print(f"Error reading scale values: {str(e)}")
-            return None
-        finally:
-            client.close()
+from extensions import db
+from utils.modbus_pool import modbus_pool
+from utils.register_map import get_register_map, read_register_map
+
+
+class Scale(db.Model):
+    """Connection and polling settings for one weighing indicator."""
+
+    __tablename__ = "scale"
+
+    scale_id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    host = db.Column(db.String(100), nullable=False)
+    port = db.Column(db.Integer, nullable=False, default=502, server_default="502")
+    unit_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    register_map = db.Column(
+        db.String(50), nullable=False, default="weight_error", server_default="weight_error"
+    )
+    # raw register value * scaling_factor = kg
+    scaling_factor = db.Column(db.Float, nullable=False, default=0.1, server_default="0.1")
+    # seconds between polls
+    poll_interval = db.Column(db.Float, nullable=False, default=1.0, server_default="1.0")
+    active = db.Column(db.Boolean, nullable=False, default=True, server_default="1")
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
+
+    def to_config(self):
+        return {
+            "scale_id": self.scale_id,
+            "name": self.name,
+            "host": self.host,
+            "port": self.port,
+            "unit_id": self.unit_id,
+            "register_map": self.register_map,
+            "scaling_factor": self.scaling_factor,
+            "poll_interval": self.poll_interval,
+            "active": self.active,
+        }
+
+
+class ScaleClient:
+    def __init__(self, host="localhost", port=502, unit_id=1, register_map="float_status"):
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.register_map = get_register_map(register_map)
+
+    def _read_fields(self, fields=None):
+        return modbus_pool.transaction(
+            self.host,
+            self.port,
+            self.unit_id,
+            lambda client, unit_id: read_register_map(
+                client, unit_id, self.register_map, fields
+            ),
+        )
+
+    def get_net_weight(self):
+        """Get the net weight from register 40003 (address 2)"""
+        try:
+            values = self._read_fields(["net_weight"])
+            return round(values["net_weight"], 2)
+        except Exception as e:
+            print(f"Error reading net weight: {str(e)}")
+            return None
+
+    def get_scale_values(self):
+        """
+        Full status snapshot decoded from a single block read of the
+        register map (gross, tare, net and alarm flags).
+        """
+        try:
+            values = self._read_fields()
+            return {
+                "gross_weight": round(values["gross_weight"], 2),
+                "tare_weight": round(values["tare_weight"], 2),
+                "net_weight": round(values["net_weight"], 2),
+                "alarms": {
+                    "overrange": values["overrange"],
+                    "underrange": values["underrange"],
+                    "motion": values["motion"],
+                    "negative": values["negative"],
+                },
+            }
+        except Exception as e:
+            print(f"Error reading scale values: {str(e)}")
+            return None
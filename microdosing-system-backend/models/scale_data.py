@@ -1,13 +1,41 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from datetime import datetime
-from extensions import db  # Adjust this import if needed
-
-
-class ScaleData(db.Model):
-    __tablename__ = "scale_data"
-
-    id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    weight = Column(Integer, nullable=False)
-    error_code = Column(Integer, nullable=False)
-    error_message = Column(String(255), nullable=True)
+from sqlalchemy import Column, Integer, String, DateTime, Float
+from datetime import datetime
+from extensions import db  # Adjust this import if needed
+
+
+class ScaleData(db.Model):
+    __tablename__ = "scale_data"
+
+    id = Column(Integer, primary_key=True, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    weight = Column(Integer, nullable=False)
+    error_code = Column(Integer, nullable=False)
+    error_message = Column(String(255), nullable=True)
+
+
+class ScaleDataRollupMixin:
+    """
+    Aggregate of the scale_data rows whose timestamp falls in
+    [bucket, bucket + resolution). Maintained incrementally on insert.
+    """
+
+    bucket = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    sum_weight = Column(Float, nullable=False, default=0)
+    min_weight = Column(Integer, nullable=False)
+    max_weight = Column(Integer, nullable=False)
+    last_weight = Column(Integer, nullable=False)
+    last_timestamp = Column(DateTime, nullable=False)
+    error_count = Column(Integer, nullable=False, default=0)
+
+    @property
+    def mean_weight(self):
+        return self.sum_weight / self.count if self.count else None
+
+
+class ScaleDataMinute(ScaleDataRollupMixin, db.Model):
+    __tablename__ = "scale_data_minute"
+
+
+class ScaleDataHour(ScaleDataRollupMixin, db.Model):
+    __tablename__ = "scale_data_hour"
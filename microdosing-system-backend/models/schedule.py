@@ -0,0 +1,30 @@
+from extensions import db
+from sqlalchemy import Index
+
+
+class ProductionSchedule(db.Model):
+    """
+    Planned slot of one open production order on a station (scale; NULL is
+    the default scale), maintained incrementally by helpers/scheduler.py.
+    """
+
+    __tablename__ = "production_schedule"
+    __table_args__ = (Index("idx_schedule_station_position", "scale_id", "position"),)
+
+    order_id = db.Column(
+        db.Integer,
+        db.ForeignKey("production_order.order_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scale_id = db.Column(
+        db.Integer, db.ForeignKey("scale.scale_id", ondelete="CASCADE"), nullable=True
+    )
+    position = db.Column(db.Integer, nullable=False)
+    planned_start = db.Column(db.DateTime, nullable=False)
+    planned_end = db.Column(db.DateTime, nullable=False)
+    estimated_s = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(
+        db.TIMESTAMP,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
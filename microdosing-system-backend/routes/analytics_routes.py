@@ -0,0 +1,69 @@
+import math
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify
+from extensions import db
+from helpers.dose_analytics import METRICS, DEFAULT_STATION, analyze_doses, group_means
+from models.material import Material
+from models.scale import Scale
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+def _rows(keys, counts, means, key_name, names):
+    rows = []
+    for i, key in enumerate(keys.tolist()):
+        row = {key_name: key, "name": names.get(key), "doses": int(counts[i])}
+        for metric in METRICS:
+            value = float(means[metric][i])
+            row[metric] = round(value, 4) if math.isfinite(value) else None
+        rows.append(row)
+    return rows
+
+
+@analytics_bp.route("/analytics/dose-curves", methods=["GET"])
+def get_dose_curve_analytics():
+    """
+    Feed rate, time to 90%, settle time, overshoot and noise of the captured
+    dose curves in a period (default: the last 8 hours), per material and
+    per station.
+    Query params: from, to (optional ISO datetimes)
+    """
+    try:
+        end = datetime.fromisoformat(request.args["to"]) if request.args.get("to") else datetime.now()
+        start = (
+            datetime.fromisoformat(request.args["from"])
+            if request.args.get("from")
+            else end - timedelta(hours=8)
+        )
+    except ValueError:
+        return jsonify({"error": "from/to must be ISO datetimes"}), 400
+
+    material_ids, scale_ids, metrics = analyze_doses(start, end)
+
+    material_keys, material_counts, material_means = group_means(material_ids, metrics)
+    station_keys, station_counts, station_means = group_means(scale_ids, metrics)
+
+    material_names = dict(
+        db.session.query(Material.material_id, Material.title)
+        .filter(Material.material_id.in_(material_keys.tolist()))
+        .all()
+    )
+    station_names = dict(
+        db.session.query(Scale.scale_id, Scale.name)
+        .filter(Scale.scale_id.in_(station_keys.tolist()))
+        .all()
+    )
+    station_names[DEFAULT_STATION] = "default"
+
+    by_station = _rows(station_keys, station_counts, station_means, "scale_id", station_names)
+    for row in by_station:
+        if row["scale_id"] == DEFAULT_STATION:
+            row["scale_id"] = None
+
+    return jsonify({
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "doses": int(len(material_ids)),
+        "by_material": _rows(material_keys, material_counts, material_means, "material_id", material_names),
+        "by_station": by_station,
+    }), 200
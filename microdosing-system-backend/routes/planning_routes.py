@@ -0,0 +1,71 @@
+import logging
+from datetime import date, timedelta
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required  # type: ignore
+from extensions import db
+from routes.user_routes import role_required
+from helpers.mrp import material_requirements
+from helpers.scheduler import get_schedule, replan
+
+planning_bp = Blueprint("planning", __name__)
+
+
+@planning_bp.route("/planning/mrp", methods=["GET"])
+def get_material_requirements():
+    """
+    Material requirements of planned/verified orders against stock.
+    Query params:
+      - from (YYYY-MM-DD, default today), days (horizon, default 30)
+      - shortages_only=true: only materials that run short or below minimum
+    """
+    try:
+        start = date.fromisoformat(request.args["from"]) if request.args.get("from") else date.today()
+        days = min(max(request.args.get("days", 30, type=int), 1), 366)
+    except ValueError:
+        return jsonify({"error": "from must be YYYY-MM-DD"}), 400
+    end = start + timedelta(days=days - 1)
+
+    materials = material_requirements(start, end)
+    if request.args.get("shortages_only", "false").lower() == "true":
+        materials = [m for m in materials if m["below_minimum_on"]]
+
+    return jsonify({
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "shortages": sum(1 for m in materials if m["short_on"]),
+        "below_minimum": sum(1 for m in materials if m["below_minimum_on"]),
+        "materials": materials,
+    }), 200
+
+
+@planning_bp.route("/planning/schedule", methods=["GET"])
+def get_production_schedule():
+    """
+    Station queues with planned start/end per open order and utilisation,
+    as stored. Read-only: the write paths re-plan when orders change, and
+    POST /planning/schedule/replan re-plans on demand.
+    Query params: hours (utilisation horizon, default 24), scale_id ("default" for the default scale)
+    """
+    hours = min(max(request.args.get("hours", 24, type=int), 1), 24 * 31)
+    stations = get_schedule(horizon_hours=hours)
+
+    if request.args.get("scale_id"):
+        wanted = None if request.args["scale_id"] == "default" else request.args.get("scale_id", type=int)
+        stations = [s for s in stations if s["scale_id"] == wanted]
+
+    return jsonify({"hours": hours, "stations": stations}), 200
+
+
+@planning_bp.route("/planning/schedule/replan", methods=["POST"])
+@jwt_required(locations=["headers"])
+@role_required(["admin", "operator"])
+def replan_production_schedule():
+    """Re-plan now; {"full": true} rebuilds every station queue from scratch."""
+    data = request.get_json(silent=True) or {}
+    try:
+        summary = replan(full=bool(data.get("full")))
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"❌ Re-planning failed: {e}", exc_info=True)
+        return jsonify({"error": "Re-planning failed"}), 500
+    return jsonify(summary), 200
@@ -1,492 +1,966 @@
-from flask import Blueprint, request, jsonify, send_file  # type: ignore
-from extensions import db , socketio
-from models.production import ProductionOrder, Batch, BatchMaterialDispensing
-from models.user import User  # ✅ Needed for username and validation
-from flask_jwt_extended import jwt_required, get_jwt_identity  # type: ignore
-from routes.user_routes import role_required
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as ExcelImage
-from barcode import Code128
-from barcode.writer import ImageWriter
-from PIL import Image as PILImage
-import os, io, tempfile
-import traceback
-from models.recipe import RecipeMaterial
-
-production_bp = Blueprint("production", __name__)
-
-
-@production_bp.route("/production_orders/export/barcodes", methods=["GET"])
-def export_production_orders_excel_with_barcodes():
-    try:
-        orders = ProductionOrder.query.all()
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Production Order Barcodes"
-        ws.append(["Order Number", "Barcode ID", "Scannable Barcode"])
-
-        row_number = 2
-
-        for order in orders:
-            if order.barcode_id:
-                barcode_id = order.barcode_id
-                try:
-                    temp_dir = tempfile.gettempdir()
-                    filename = f"{barcode_id}"
-                    filepath = os.path.join(temp_dir, f"{filename}.png")
-
-                    code128 = Code128(barcode_id, writer=ImageWriter())
-                    code128.save(filepath)
-
-                    image = PILImage.open(filepath)
-                    image = image.resize((200, 60))
-                    image.save(filepath)
-
-                    ws.cell(row=row_number, column=1, value=order.order_number)
-                    ws.cell(row=row_number, column=2, value=barcode_id)
-
-                    img = ExcelImage(filepath)
-                    img.width = 150
-                    img.height = 50
-                    ws.add_image(img, f"C{row_number}")
-
-                    os.remove(filepath)
-                    row_number += 1
-
-                except Exception as e:
-                    print(f"Failed to generate barcode for {barcode_id}: {e}")
-                    ws.cell(row=row_number, column=1, value=order.order_number)
-                    ws.cell(row=row_number, column=2, value=barcode_id)
-                    row_number += 1
-
-        stream = io.BytesIO()
-        wb.save(stream)
-        stream.seek(0)
-
-        return send_file(
-            stream,
-            download_name="production_orders_with_barcodes.xlsx",
-            as_attachment=True,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-
-    except Exception as e:
-        import traceback
-
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
-@production_bp.route("/production_orders", methods=["POST"])
-@jwt_required(locations=["headers"])
-@role_required(["admin", "operator"])
-def create_production_order():
-    from models.recipe import RecipeMaterial
-    from extensions import socketio
-    import traceback
-
-    data = request.get_json()
-    print("Received data:", data)
-
-    required_fields = ["order_number", "recipe_id", "batch_size", "scheduled_date"]
-    missing = [field for field in required_fields if field not in data]
-    if missing:
-        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
-
-    current_user_id = get_jwt_identity()
-
-    try:
-        # Step 1: Fetch materials and calculate dosing
-        recipe_materials = RecipeMaterial.query.filter_by(recipe_id=data["recipe_id"]).all()
-        if not recipe_materials:
-            return jsonify({"error": "No materials found for the selected recipe"}), 400
-
-        batch_size = int(data["batch_size"])
-
-        # Total set point per batch
-        total_per_batch = sum(float(m.set_point or 0) for m in recipe_materials)
-
-        # Total set point for all batches
-        total_for_all_batches = total_per_batch * batch_size
-
-        # Dosing value = average per batch
-        dosing_value = round(total_for_all_batches / batch_size, 2)
-
-        # Step 2: Create Production Order with dosing value
-        new_order = ProductionOrder(
-            order_number=data["order_number"],
-            recipe_id=data["recipe_id"],
-            batch_size=batch_size,
-            scheduled_date=data["scheduled_date"],
-            status="planned",
-            created_by=current_user_id,
-            notes=data.get("notes"),
-            barcode_id=data.get("barcode_id"),
-            dosing=dosing_value  # ✅ New field
-        )
-        db.session.add(new_order)
-
-        # Step 3: Update RecipeMaterial set_point *= batch_size
-        for material in recipe_materials:
-            original = material.set_point or 0
-            material.set_point = float(original) * batch_size
-
-        # Step 4: Commit all DB changes
-        db.session.commit()
-
-        # Step 5: Emit SocketIO event to notify frontend to soft-refresh
-        socketio.emit("order_created", {
-            "recipe_id": new_order.recipe_id,
-            "order_number": new_order.order_number
-        })
-
-        return jsonify({"message": "Production order created, materials updated, dosing calculated!"}), 201
-
-    except Exception as e:
-        db.session.rollback()
-        print("Exception:", e)
-        traceback.print_exc()
-        if "Duplicate entry" in str(e):
-            return jsonify({"error": "Duplicate order/barcode"}), 400
-        return jsonify({"error": "Failed to create order", "details": str(e)}), 500
-
-@production_bp.route("/production_orders/<int:order_id>", methods=["PUT"])
-@jwt_required(locations=["headers"])
-@role_required(["admin", "operator"])
-def update_production_order(order_id):
-    from extensions import socketio
-    import traceback
-    from models.recipe import RecipeMaterial
-    from models.recipe import Recipe
-    from models.material import Material
-
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "No data received"}), 400
-
-    order = ProductionOrder.query.get(order_id)
-    if not order:
-        return jsonify({"error": "Production order not found"}), 404
-
-    try:
-        old_status = order.status
-
-        # Update fields
-        if "order_number" in data:
-            order.order_number = data["order_number"]
-        if "recipe_id" in data:
-            order.recipe_id = data["recipe_id"]
-        if "batch_size" in data:
-            try:
-                order.batch_size = float(data["batch_size"])
-            except ValueError:
-                return jsonify({"error": "Invalid batch_size format"}), 400
-        if "scheduled_date" in data:
-            order.scheduled_date = data["scheduled_date"]
-        if "status" in data:
-            new_status = data["status"]
-            order.status = new_status
-
-            # ✅ Ensure only one verified order at a time
-            if new_status == "verified":
-                other_verified_orders = (
-                    ProductionOrder.query
-                    .filter(ProductionOrder.order_id != order_id, ProductionOrder.status == "verified")
-                    .all()
-                )
-                for o in other_verified_orders:
-                    o.status = "pending"
-                db.session.commit()
-
-        if "created_by" in data:
-            order.created_by = data["created_by"]
-        if "notes" in data:
-            order.notes = data["notes"]
-
-        db.session.commit()
-
-        # Emit order update
-        socketio.emit("order_updated", {
-            "recipe_id": order.recipe_id,
-            "order_number": order.order_number
-        })
-
-        # Emit active materials if verified
-        if old_status != "verified" and order.status == "verified":
-            pending = (
-                db.session.query(RecipeMaterial)
-                .filter(
-                    RecipeMaterial.recipe_id == order.recipe_id,
-                    RecipeMaterial.status == "pending"
-                )
-                .all()
-            )
-
-            materials_data = []
-            for mat in pending:
-                materials_data.append({
-                    "material_id": mat.material_id,
-                    "material_name": mat.material.title if mat.material else "—",
-                    "barcode": mat.material.barcode_id if mat.material else "",
-                    "set_point": mat.set_point,
-                    "actual": mat.actual,
-                    "margin": mat.margin,
-                    "status": mat.status
-                })
-
-            recipe = Recipe.query.get(order.recipe_id)
-
-            socketio.emit("active_recipe_materials", {
-                "recipe_id": order.recipe_id,
-                "recipe_name": recipe.name if recipe else "Unknown",
-                "materials": materials_data
-            }, namespace='/')
-
-        return jsonify({"message": "Production order updated successfully!"}), 200
-
-    except Exception as e:
-        db.session.rollback()
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
-
-
-@production_bp.route("/production_orders/<int:order_id>", methods=["DELETE"])
-def delete_production_order(order_id):
-    from extensions import socketio
-    import traceback
-
-    try:
-        # ✅ Step 1: Fetch the production order
-        order = ProductionOrder.query.get(order_id)
-        if not order:
-            return jsonify({"error": "Production order not found"}), 404
-
-        # ✅ Step 2: Prevent deletion if a batch exists
-        existing_batch = Batch.query.filter_by(order_id=order_id).first()
-        if existing_batch:
-            return jsonify({
-                "error": "Cannot delete the order because batch data exists. Please delete the batch first."
-            }), 400
-
-        # ✅ Step 3: Delete the production order
-        db.session.delete(order)
-
-        # ✅ Step 4: Notify frontend via SocketIO
-        socketio.emit("order_deleted", {
-            "order_id": order_id,
-            "recipe_id": order.recipe_id,
-            "order_number": order.order_number
-        })
-
-        # ✅ Step 5: Commit transaction
-        db.session.commit()
-
-        return jsonify({
-            "message": f"Production order {order_id} deleted successfully."
-        }), 200
-
-    except Exception as e:
-        db.session.rollback()
-        traceback.print_exc()
-        return jsonify({"error": "Internal server error", "details": str(e)}), 500
-
-
-
-@production_bp.route("/production_orders", methods=["GET"])
-@jwt_required()
-def get_production_orders():
-    try:
-        orders = ProductionOrder.query.all()
-        result = []
-
-        for order in orders:
-            user = User.query.get(order.created_by)
-            result.append({
-                "order_id": order.order_id,
-                "order_number": order.order_number,
-                "recipe_id": order.recipe_id,
-                "batch_size": str(order.batch_size),
-                "scheduled_date": order.scheduled_date.strftime("%Y-%m-%d") if order.scheduled_date else None,
-                "status": order.status,
-                "created_by": order.created_by,
-                "created_by_username": user.username if user else "—",
-                "barcode_id": order.barcode_id,
-                "dosing": order.dosing  # ✅ Include dosing
-            })
-
-        return jsonify(result), 200
-
-    except Exception as e:
-        import traceback
-        print("❌ Error fetching production orders:", e)
-        traceback.print_exc()
-        return jsonify({"error": "Failed to fetch production orders"}), 500
-
-
-@production_bp.route("/production_orders/<int:order_id>", methods=["GET"])
-def get_production_order(order_id):
-    order = ProductionOrder.query.get(order_id)
-    if not order:
-        return jsonify({"error": "Production order not found"}), 404
-
-    result = {
-        "order_id": order.order_id,
-        "order_number": order.order_number,
-        "recipe_id": order.recipe_id,
-        "batch_size": str(order.batch_size),
-        "scheduled_date": order.scheduled_date.strftime("%Y-%m-%d"),
-        "status": order.status,
-        "created_by": order.created_by,
-        "created_by_username": order.creator.username if order.creator else None,
-    }
-    return jsonify(result), 200
-
-
-@production_bp.route("/production-orders/<int:order_id>/reject", methods=["PUT"])
-@jwt_required()
-@role_required(["admin"])
-def reject_production_order(order_id):
-    order = ProductionOrder.query.get(order_id)
-    if not order:
-        return jsonify({"error": "Production order not found"}), 404
-
-    order.status = "rejected"
-    db.session.commit()
-    return jsonify({"message": "Production order rejected successfully"}), 200
-
-
-### BATCH ROUTES ###
-@production_bp.route("/batches", methods=["POST"])
-def create_batch():
-    data = request.get_json()
-    if not all(key in data for key in ["batch_number", "order_id", "operator_id"]):
-        return (
-            jsonify(
-                {
-                    "error": "Missing required fields (batch_number, order_id, operator_id)"
-                }
-            ),
-            400,
-        )
-
-    order = ProductionOrder.query.get(data["order_id"])
-    if not order:
-        return (
-            jsonify({"error": f"Order with ID {data['order_id']} does not exist"}),
-            400,
-        )
-
-    operator = User.query.get(data["operator_id"])
-    if not operator:
-        return (
-            jsonify(
-                {"error": f"Operator with ID {data['operator_id']} does not exist"}
-            ),
-            400,
-        )
-
-    if Batch.query.filter_by(batch_number=data["batch_number"]).first():
-        return (
-            jsonify({"error": f"Batch number {data['batch_number']} already exists"}),
-            400,
-        )
-
-    try:
-        new_batch = Batch(
-            batch_number=data["batch_number"],
-            order_id=data["order_id"],
-            operator_id=data["operator_id"],
-            status=data.get("status", "pending"),
-            notes=data.get("notes"),
-        )
-        db.session.add(new_batch)
-        db.session.commit()
-        return (
-            jsonify(
-                {
-                    "message": "Batch created successfully!",
-                    "batch_id": new_batch.batch_id,
-                }
-            ),
-            201,
-        )
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
-
-
-@production_bp.route("/batches", methods=["GET"])
-def get_batches():
-    batches = Batch.query.all()
-    result = [
-        {
-            "batch_id": batch.batch_id,
-            "batch_number": batch.batch_number,
-            "order_id": batch.order_id,
-            "status": batch.status,
-            "operator_id": batch.operator_id,
-            "notes": batch.notes,
-            "created_at": batch.created_at,
-        }
-        for batch in batches
-    ]
-    return jsonify(result)
-
-
-@production_bp.route("/batches/<int:batch_id>", methods=["PUT"])
-def update_batch(batch_id):
-    batch = Batch.query.get_or_404(batch_id)
-    data = request.get_json()
-
-    batch.batch_number = data.get("batch_number", batch.batch_number)
-    batch.order_id = data.get("order_id", batch.order_id)
-    batch.status = data.get("status", batch.status)
-    batch.operator_id = data.get("operator_id", batch.operator_id)
-    batch.notes = data.get("notes", batch.notes)
-
-    db.session.commit()
-    return jsonify({"message": "Batch updated successfully!"})
-
-
-@production_bp.route("/batches/<int:batch_id>", methods=["DELETE"])
-def delete_batch(batch_id):
-    batch = Batch.query.get_or_404(batch_id)
-    db.session.delete(batch)
-    db.session.commit()
-    return jsonify({"message": "Batch deleted successfully!"})
-
-
-### BATCH MATERIAL DISPENSING ROUTES ###
-@production_bp.route("/batch_dispensing", methods=["POST"])
-def create_batch_dispensing():
-    data = request.get_json()
-    new_dispensing = BatchMaterialDispensing(
-        batch_id=data["batch_id"],
-        material_id=data["material_id"],
-        planned_quantity=data["planned_quantity"],
-        actual_quantity=data.get("actual_quantity"),
-        dispensed_by=data["dispensed_by"],
-        status=data.get("status", "pending"),
-    )
-    db.session.add(new_dispensing)
-    db.session.commit()
-    return jsonify({"message": "Material dispensing record created successfully!"}), 201
-
-
-@production_bp.route("/batch_dispensing", methods=["GET"])
-def get_batch_dispensing():
-    dispensing_records = BatchMaterialDispensing.query.all()
-    result = [
-        {
-            "dispensing_id": record.dispensing_id,
-            "batch_id": record.batch_id,
-            "material_id": record.material_id,
-            "planned_quantity": str(record.planned_quantity),
-            "actual_quantity": str(record.actual_quantity)
-            if record.actual_quantity
-            else None,
-            "dispensed_by": record.dispensed_by,
-            "status": record.status,
-        }
-        for record in dispensing_records
-    ]
-    return jsonify(result)
+from flask import Blueprint, request, jsonify, send_file  # type: ignore
+from extensions import db , socketio
+from models.production import ProductionOrder, ProductionOrderMaterial, Batch, BatchMaterialDispensing
+from models.user import User  # ✅ Needed for username and validation
+from flask_jwt_extended import jwt_required, get_jwt_identity  # type: ignore
+from routes.user_routes import role_required
+from openpyxl import Workbook
+from openpyxl.drawing.image import Image as ExcelImage
+from barcode import Code128
+from barcode.writer import ImageWriter
+from PIL import Image as PILImage
+import os, io, tempfile
+import traceback
+from datetime import date, datetime
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import joinedload, selectinload
+from models.recipe import Recipe, RecipeMaterial, DosedRecipeMaterial
+from models.material import Material
+from helpers.dosing_controller import bypass_pending, refresh_all
+from helpers.scheduler import replan_orders
+from models.scale import Scale
+
+production_bp = Blueprint("production", __name__)
+
+
+@production_bp.route("/production_orders/export/barcodes", methods=["GET"])
+def export_production_orders_excel_with_barcodes():
+    try:
+        orders = ProductionOrder.query.all()
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Production Order Barcodes"
+        ws.append(["Order Number", "Barcode ID", "Scannable Barcode"])
+
+        row_number = 2
+
+        for order in orders:
+            if order.barcode_id:
+                barcode_id = order.barcode_id
+                try:
+                    temp_dir = tempfile.gettempdir()
+                    filename = f"{barcode_id}"
+                    filepath = os.path.join(temp_dir, f"{filename}.png")
+
+                    code128 = Code128(barcode_id, writer=ImageWriter())
+                    code128.save(filepath)
+
+                    image = PILImage.open(filepath)
+                    image = image.resize((200, 60))
+                    image.save(filepath)
+
+                    ws.cell(row=row_number, column=1, value=order.order_number)
+                    ws.cell(row=row_number, column=2, value=barcode_id)
+
+                    img = ExcelImage(filepath)
+                    img.width = 150
+                    img.height = 50
+                    ws.add_image(img, f"C{row_number}")
+
+                    os.remove(filepath)
+                    row_number += 1
+
+                except Exception as e:
+                    print(f"Failed to generate barcode for {barcode_id}: {e}")
+                    ws.cell(row=row_number, column=1, value=order.order_number)
+                    ws.cell(row=row_number, column=2, value=barcode_id)
+                    row_number += 1
+
+        stream = io.BytesIO()
+        wb.save(stream)
+        stream.seek(0)
+
+        return send_file(
+            stream,
+            download_name="production_orders_with_barcodes.xlsx",
+            as_attachment=True,
+            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+@production_bp.route("/production_orders", methods=["POST"])
+@jwt_required(locations=["headers"])
+@role_required(["admin", "operator"])
+def create_production_order():
+    from models.recipe import RecipeMaterial
+    from extensions import socketio
+    import traceback
+
+    data = request.get_json()
+    print("Received data:", data)
+
+    required_fields = ["order_number", "recipe_id", "batch_size", "scheduled_date"]
+    missing = [field for field in required_fields if field not in data]
+    if missing:
+        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
+
+    current_user_id = get_jwt_identity()
+
+    scale_id = data.get("scale_id")
+    if scale_id is not None and not db.session.get(Scale, scale_id):
+        return jsonify({"error": "Invalid scale_id"}), 400
+
+    try:
+        # Step 1: Fetch materials and calculate dosing
+        recipe_materials = (
+            RecipeMaterial.query.filter_by(recipe_id=data["recipe_id"])
+            .order_by(RecipeMaterial.recipe_material_id)
+            .all()
+        )
+        if not recipe_materials:
+            return jsonify({"error": "No materials found for the selected recipe"}), 400
+
+        batch_size = int(data["batch_size"])
+
+        # Total set point per batch
+        total_per_batch = sum(float(m.set_point or 0) for m in recipe_materials)
+
+        # Total set point for all batches
+        total_for_all_batches = total_per_batch * batch_size
+
+        # Dosing value = average per batch
+        dosing_value = round(total_for_all_batches / batch_size, 2)
+
+        # Step 2: Create Production Order with dosing value
+        new_order = ProductionOrder(
+            order_number=data["order_number"],
+            recipe_id=data["recipe_id"],
+            batch_size=batch_size,
+            scheduled_date=data["scheduled_date"],
+            status="planned",
+            created_by=current_user_id,
+            notes=data.get("notes"),
+            barcode_id=data.get("barcode_id"),
+            dosing=dosing_value,  # ✅ New field
+            scale_id=scale_id
+        )
+        db.session.add(new_order)
+
+        # Step 3: Materialize this order's dosing targets (set_point * batch_size);
+        # the recipe itself is left untouched
+        db.session.add_all(ProductionOrderMaterial.for_order(new_order, recipe_materials))
+
+        # Step 4: Commit all DB changes
+        db.session.commit()
+
+        # Step 5: Emit SocketIO event to notify frontend to soft-refresh
+        socketio.emit("order_created", {
+            "recipe_id": new_order.recipe_id,
+            "order_number": new_order.order_number
+        })
+        replan_orders([new_order.order_id])
+
+        return jsonify({"message": "Production order created, dosing targets calculated!"}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        print("Exception:", e)
+        traceback.print_exc()
+        if "Duplicate entry" in str(e):
+            return jsonify({"error": "Duplicate order/barcode"}), 400
+        return jsonify({"error": "Failed to create order", "details": str(e)}), 500
+
+def _bulk_items(data, key):
+    """Items of a bulk request: a bare list or {key: [...]}."""
+    items = data.get(key) if isinstance(data, dict) else data
+    return items if isinstance(items, list) and items else None
+
+
+@production_bp.route("/production_orders/bulk", methods=["POST"])
+@jwt_required(locations=["headers"])
+@role_required(["admin", "operator"])
+def create_production_orders_bulk():
+    """
+    Create many orders in one transaction: references and unique numbers
+    are validated with one IN query each, orders and their dosing targets
+    are inserted with executemany and one `orders_created` event is emitted.
+    Nothing is created if any order is invalid.
+    """
+    orders = _bulk_items(request.get_json(silent=True), "orders")
+    if orders is None:
+        return jsonify({"error": "Expected a non-empty list of orders"}), 400
+
+    current_user_id = get_jwt_identity()
+    required_fields = ["order_number", "recipe_id", "batch_size", "scheduled_date"]
+    errors = []
+    rows = []
+
+    # ✅ Per-item checks (no queries)
+    for index, item in enumerate(orders):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Order must be an object"})
+            continue
+        missing = [field for field in required_fields if item.get(field) in (None, "")]
+        if missing:
+            errors.append({"index": index, "error": f"Missing fields: {', '.join(missing)}"})
+            continue
+        try:
+            recipe_id = int(item["recipe_id"])
+            batch_size = int(item["batch_size"])
+            scheduled_date = date.fromisoformat(str(item["scheduled_date"])[:10])
+            scale_id = int(item["scale_id"]) if item.get("scale_id") is not None else None
+        except (TypeError, ValueError):
+            errors.append({"index": index, "error": "Invalid recipe_id, batch_size, scheduled_date or scale_id"})
+            continue
+        if batch_size <= 0:
+            errors.append({"index": index, "error": "batch_size must be positive"})
+            continue
+        rows.append({
+            "index": index,
+            "order_number": str(item["order_number"]),
+            "recipe_id": recipe_id,
+            "batch_size": batch_size,
+            "scheduled_date": scheduled_date,
+            "status": "planned",
+            "created_by": current_user_id,
+            "notes": item.get("notes"),
+            "barcode_id": item.get("barcode_id") or None,
+            "scale_id": scale_id,
+        })
+
+    # ✅ Set-based checks: one query per referenced table
+    order_numbers = [r["order_number"] for r in rows]
+    barcodes = [r["barcode_id"] for r in rows if r["barcode_id"]]
+    taken_numbers = {
+        n for (n,) in db.session.query(ProductionOrder.order_number)
+        .filter(ProductionOrder.order_number.in_(order_numbers)).all()
+    } if order_numbers else set()
+    taken_barcodes = {
+        b for (b,) in db.session.query(ProductionOrder.barcode_id)
+        .filter(ProductionOrder.barcode_id.in_(barcodes)).all()
+    } if barcodes else set()
+
+    recipe_materials = {}
+    recipe_ids = {r["recipe_id"] for r in rows}
+    if recipe_ids:
+        for rm in (
+            RecipeMaterial.query.filter(RecipeMaterial.recipe_id.in_(recipe_ids))
+            .order_by(RecipeMaterial.recipe_id, RecipeMaterial.recipe_material_id)
+            .all()
+        ):
+            recipe_materials.setdefault(rm.recipe_id, []).append(rm)
+
+    scale_ids = {r["scale_id"] for r in rows if r["scale_id"] is not None}
+    known_scales = {
+        sid for (sid,) in db.session.query(Scale.scale_id).filter(Scale.scale_id.in_(scale_ids)).all()
+    } if scale_ids else set()
+
+    seen_numbers = set()
+    seen_barcodes = set()
+    for r in rows:
+        if r["order_number"] in taken_numbers or r["order_number"] in seen_numbers:
+            errors.append({"index": r["index"], "error": f"Duplicate order number {r['order_number']}"})
+        elif r["barcode_id"] and (r["barcode_id"] in taken_barcodes or r["barcode_id"] in seen_barcodes):
+            errors.append({"index": r["index"], "error": f"Duplicate barcode {r['barcode_id']}"})
+        elif r["recipe_id"] not in recipe_materials:
+            errors.append({"index": r["index"], "error": "No materials found for the selected recipe"})
+        elif r["scale_id"] is not None and r["scale_id"] not in known_scales:
+            errors.append({"index": r["index"], "error": "Invalid scale_id"})
+        seen_numbers.add(r["order_number"])
+        if r["barcode_id"]:
+            seen_barcodes.add(r["barcode_id"])
+
+    if errors:
+        return jsonify({"error": "Validation failed", "errors": sorted(errors, key=lambda e: e["index"])}), 400
+
+    try:
+        # ✅ Dosing value = sum of the recipe's per-batch set points
+        for r in rows:
+            r["dosing"] = round(sum(float(m.set_point or 0) for m in recipe_materials[r["recipe_id"]]), 2)
+
+        db.session.execute(
+            insert(ProductionOrder),
+            [{k: v for k, v in r.items() if k != "index"} for r in rows],
+        )
+        order_ids = dict(
+            db.session.query(ProductionOrder.order_number, ProductionOrder.order_id)
+            .filter(ProductionOrder.order_number.in_(order_numbers))
+            .all()
+        )
+
+        targets = []
+        for r in rows:
+            targets.extend(
+                ProductionOrderMaterial.rows_for(
+                    order_ids[r["order_number"]], r["batch_size"], recipe_materials[r["recipe_id"]]
+                )
+            )
+        db.session.execute(insert(ProductionOrderMaterial), targets)
+
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        if "Duplicate entry" in str(e):
+            return jsonify({"error": "Duplicate order/barcode"}), 400
+        return jsonify({"error": "Failed to create orders", "details": str(e)}), 500
+
+    created = [
+        {
+            "order_id": order_ids[r["order_number"]],
+            "order_number": r["order_number"],
+            "recipe_id": r["recipe_id"],
+            "scale_id": r["scale_id"],
+        }
+        for r in rows
+    ]
+
+    # ✅ One event for the whole import
+    socketio.emit("orders_created", {"count": len(created), "orders": created})
+    replan_orders([o["order_id"] for o in created])
+
+    return jsonify({"message": f"{len(created)} production orders created", "orders": created}), 201
+
+
+@production_bp.route("/production_orders/<int:order_id>", methods=["PUT"])
+@jwt_required(locations=["headers"])
+@role_required(["admin", "operator"])
+def update_production_order(order_id):
+    from extensions import socketio
+    import traceback
+    from models.recipe import RecipeMaterial
+    from models.recipe import Recipe
+    from models.material import Material
+
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No data received"}), 400
+
+    order = ProductionOrder.query.get(order_id)
+    if not order:
+        return jsonify({"error": "Production order not found"}), 404
+
+    try:
+        old_status = order.status
+
+        # Update fields
+        if "order_number" in data:
+            order.order_number = data["order_number"]
+        if "recipe_id" in data:
+            order.recipe_id = data["recipe_id"]
+        if "batch_size" in data:
+            try:
+                order.batch_size = float(data["batch_size"])
+            except ValueError:
+                return jsonify({"error": "Invalid batch_size format"}), 400
+        if "scheduled_date" in data:
+            order.scheduled_date = data["scheduled_date"]
+        if "scale_id" in data:
+            if data["scale_id"] is not None and not db.session.get(Scale, data["scale_id"]):
+                return jsonify({"error": "Invalid scale_id"}), 400
+            order.scale_id = data["scale_id"]
+        if "status" in data:
+            order.status = data["status"]
+
+        # ✅ Ensure only one verified order per station, also when a verified
+        # order is moved to another station
+        if order.status == "verified" and ("status" in data or "scale_id" in data):
+            same_station = (
+                ProductionOrder.scale_id.is_(None)
+                if order.scale_id is None
+                else ProductionOrder.scale_id == order.scale_id
+            )
+            ProductionOrder.query.filter(
+                ProductionOrder.order_id != order_id,
+                ProductionOrder.status == "verified",
+                same_station,
+            ).update({"status": "pending"}, synchronize_session=False)
+
+        if "created_by" in data:
+            order.created_by = data["created_by"]
+        if "notes" in data:
+            order.notes = data["notes"]
+
+        db.session.commit()
+
+        # Emit order update
+        socketio.emit("order_updated", {
+            "recipe_id": order.recipe_id,
+            "order_number": order.order_number,
+            "scale_id": order.scale_id
+        })
+
+        # ✅ Stations reload; active materials are pushed only if they changed
+        refresh_all(order.scale_id)
+        replan_orders([order_id])
+
+        return jsonify({"message": "Production order updated successfully!"}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@production_bp.route("/production_orders/<int:order_id>", methods=["DELETE"])
+def delete_production_order(order_id):
+    from extensions import socketio
+    import traceback
+
+    try:
+        # ✅ Step 1: Fetch the production order
+        order = ProductionOrder.query.get(order_id)
+        if not order:
+            return jsonify({"error": "Production order not found"}), 404
+
+        # ✅ Step 2: Prevent deletion if a batch exists
+        existing_batch = Batch.query.filter_by(order_id=order_id).first()
+        if existing_batch:
+            return jsonify({
+                "error": "Cannot delete the order because batch data exists. Please delete the batch first."
+            }), 400
+
+        # ✅ Step 3: Delete the production order
+        db.session.delete(order)
+
+        # ✅ Step 4: Notify frontend via SocketIO
+        socketio.emit("order_deleted", {
+            "order_id": order_id,
+            "recipe_id": order.recipe_id,
+            "order_number": order.order_number
+        })
+
+        # ✅ Step 5: Commit transaction
+        db.session.commit()
+        refresh_all()
+        replan_orders([order_id])
+
+        return jsonify({
+            "message": f"Production order {order_id} deleted successfully."
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify({"error": "Internal server error", "details": str(e)}), 500
+
+
+
+@production_bp.route("/production_orders", methods=["GET"])
+@jwt_required()
+def get_production_orders():
+    """
+    Production orders with creator, recipe name and dosing progress.
+    Query params (all optional):
+      - status (comma-separated), recipe_id, scale_id ("default" for the default scale)
+      - from, to: scheduled_date range (YYYY-MM-DD, inclusive)
+      - created_from, created_to: created_at range (ISO datetimes)
+      - page, per_page: returns {"orders": [...], "total", "page", "pages", "per_page"};
+        without page the full (filtered) list is returned as before
+    """
+    try:
+        query = (
+            db.session.query(
+                ProductionOrder.order_id,
+                ProductionOrder.order_number,
+                ProductionOrder.recipe_id,
+                ProductionOrder.batch_size,
+                ProductionOrder.scheduled_date,
+                ProductionOrder.status,
+                ProductionOrder.created_by,
+                ProductionOrder.created_at,
+                ProductionOrder.barcode_id,
+                ProductionOrder.dosing,
+                ProductionOrder.scale_id,
+                User.username,
+                Recipe.name.label("recipe_name"),
+            )
+            .outerjoin(User, User.user_id == ProductionOrder.created_by)
+            .outerjoin(Recipe, Recipe.recipe_id == ProductionOrder.recipe_id)
+        )
+
+        # ✅ Filters (backed by the status / scheduled_date / created_at indexes)
+        if request.args.get("status"):
+            query = query.filter(ProductionOrder.status.in_(request.args["status"].split(",")))
+        if request.args.get("recipe_id"):
+            query = query.filter(ProductionOrder.recipe_id == request.args.get("recipe_id", type=int))
+        if request.args.get("scale_id"):
+            if request.args["scale_id"] == "default":
+                query = query.filter(ProductionOrder.scale_id.is_(None))
+            else:
+                query = query.filter(ProductionOrder.scale_id == request.args.get("scale_id", type=int))
+        try:
+            if request.args.get("from"):
+                query = query.filter(ProductionOrder.scheduled_date >= date.fromisoformat(request.args["from"]))
+            if request.args.get("to"):
+                query = query.filter(ProductionOrder.scheduled_date <= date.fromisoformat(request.args["to"]))
+            if request.args.get("created_from"):
+                query = query.filter(ProductionOrder.created_at >= datetime.fromisoformat(request.args["created_from"]))
+            if request.args.get("created_to"):
+                query = query.filter(ProductionOrder.created_at < datetime.fromisoformat(request.args["created_to"]))
+        except ValueError:
+            return jsonify({"error": "Invalid date filter"}), 400
+
+        query = query.order_by(ProductionOrder.created_at.desc(), ProductionOrder.order_id.desc())
+
+        paginated = "page" in request.args
+        if paginated:
+            page = max(request.args.get("page", 1, type=int), 1)
+            per_page = min(max(request.args.get("per_page", 50, type=int), 1), 500)
+            total = query.order_by(None).count()
+            rows = query.limit(per_page).offset((page - 1) * per_page).all()
+        else:
+            rows = query.all()
+
+        # ✅ Dosing progress of the listed orders, one grouped query
+        progress = {}
+        if rows:
+            progress = {
+                p.order_id: p
+                for p in db.session.query(
+                    ProductionOrderMaterial.order_id,
+                    func.count(ProductionOrderMaterial.id).label("total"),
+                    func.sum(case((ProductionOrderMaterial.status == "Dosed", 1), else_=0)).label("dosed"),
+                    func.sum(case((ProductionOrderMaterial.status == "pending", 1), else_=0)).label("pending"),
+                    func.sum(case((ProductionOrderMaterial.status == "Rejected", 1), else_=0)).label("rejected"),
+                )
+                .filter(ProductionOrderMaterial.order_id.in_([r.order_id for r in rows]))
+                .group_by(ProductionOrderMaterial.order_id)
+                .all()
+            }
+
+        result = []
+        for row in rows:
+            counts = progress.get(row.order_id)
+            result.append({
+                "order_id": row.order_id,
+                "order_number": row.order_number,
+                "recipe_id": row.recipe_id,
+                "recipe_name": row.recipe_name,
+                "batch_size": str(row.batch_size),
+                "scheduled_date": row.scheduled_date.strftime("%Y-%m-%d") if row.scheduled_date else None,
+                "status": row.status,
+                "created_by": row.created_by,
+                "created_by_username": row.username or "—",
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "barcode_id": row.barcode_id,
+                "dosing": row.dosing,  # ✅ Include dosing
+                "scale_id": row.scale_id,
+                "materials_total": int(counts.total) if counts else 0,
+                "materials_dosed": int(counts.dosed or 0) if counts else 0,
+                "materials_pending": int(counts.pending or 0) if counts else 0,
+                "materials_rejected": int(counts.rejected or 0) if counts else 0,
+            })
+
+        if paginated:
+            return jsonify({
+                "orders": result,
+                "total": total,
+                "page": page,
+                "pages": (total + per_page - 1) // per_page,
+                "per_page": per_page
+            }), 200
+        return jsonify(result), 200
+
+    except Exception as e:
+        import traceback
+        print("❌ Error fetching production orders:", e)
+        traceback.print_exc()
+        return jsonify({"error": "Failed to fetch production orders"}), 500
+
+
+@production_bp.route("/production_orders/<int:order_id>", methods=["GET"])
+def get_production_order(order_id):
+    order = ProductionOrder.query.get(order_id)
+    if not order:
+        return jsonify({"error": "Production order not found"}), 404
+
+    result = {
+        "order_id": order.order_id,
+        "order_number": order.order_number,
+        "recipe_id": order.recipe_id,
+        "batch_size": str(order.batch_size),
+        "scheduled_date": order.scheduled_date.strftime("%Y-%m-%d"),
+        "status": order.status,
+        "created_by": order.created_by,
+        "created_by_username": order.creator.username if order.creator else None,
+    }
+    return jsonify(result), 200
+
+
+@production_bp.route("/production_orders/<int:order_id>/full", methods=["GET"])
+@jwt_required()
+def get_production_order_full(order_id):
+    """
+    One order with its dosing targets, batches, each batch's dispensing rows
+    and the dose records of its targets, in a fixed number of queries.
+    """
+    order = (
+        db.session.query(ProductionOrder)
+        .options(
+            joinedload(ProductionOrder.creator).load_only(User.username),
+            joinedload(ProductionOrder.recipe).load_only(Recipe.name, Recipe.code),
+            selectinload(ProductionOrder.materials).options(
+                joinedload(ProductionOrderMaterial.material).load_only(Material.title, Material.barcode_id)
+            ),
+            selectinload(ProductionOrder.batches).selectinload(Batch.batch_material_dispensings),
+        )
+        .filter(ProductionOrder.order_id == order_id)
+        .first()
+    )
+    if not order:
+        return jsonify({"error": "Production order not found"}), 404
+
+    dosed = (
+        db.session.query(
+            DosedRecipeMaterial.id,
+            DosedRecipeMaterial.order_material_id,
+            DosedRecipeMaterial.material_id,
+            DosedRecipeMaterial.set_point,
+            DosedRecipeMaterial.actual,
+            DosedRecipeMaterial.margin,
+            DosedRecipeMaterial.status,
+            DosedRecipeMaterial.dosed_at,
+        )
+        .join(ProductionOrderMaterial, ProductionOrderMaterial.id == DosedRecipeMaterial.order_material_id)
+        .filter(ProductionOrderMaterial.order_id == order_id)
+        .order_by(DosedRecipeMaterial.dosed_at)
+        .all()
+    )
+
+    return jsonify({
+        "order_id": order.order_id,
+        "order_number": order.order_number,
+        "recipe_id": order.recipe_id,
+        "recipe_name": order.recipe.name if order.recipe else None,
+        "recipe_code": order.recipe.code if order.recipe else None,
+        "batch_size": str(order.batch_size),
+        "scheduled_date": order.scheduled_date.strftime("%Y-%m-%d") if order.scheduled_date else None,
+        "status": order.status,
+        "created_by": order.created_by,
+        "created_by_username": order.creator.username if order.creator else None,
+        "barcode_id": order.barcode_id,
+        "dosing": order.dosing,
+        "scale_id": order.scale_id,
+        "notes": order.notes,
+        "materials": [
+            {
+                "order_material_id": m.id,
+                "sequence": m.sequence,
+                "material_id": m.material_id,
+                "material_name": m.material.title if m.material else None,
+                "barcode": m.material.barcode_id if m.material else None,
+                "set_point": m.set_point,
+                "margin": m.margin,
+                "actual": m.actual,
+                "deviation": m.deviation,
+                "status": m.status,
+                "dosed_at": m.dosed_at.isoformat() if m.dosed_at else None,
+            }
+            for m in order.materials
+        ],
+        "batches": [
+            {
+                "batch_id": batch.batch_id,
+                "batch_number": batch.batch_number,
+                "status": batch.status,
+                "operator_id": batch.operator_id,
+                "start_time": batch.start_time.isoformat() if batch.start_time else None,
+                "end_time": batch.end_time.isoformat() if batch.end_time else None,
+                "notes": batch.notes,
+                "created_at": batch.created_at.isoformat() if batch.created_at else None,
+                "dispensing": [
+                    {
+                        "dispensing_id": d.dispensing_id,
+                        "material_id": d.material_id,
+                        "planned_quantity": str(d.planned_quantity),
+                        "actual_quantity": str(d.actual_quantity) if d.actual_quantity else None,
+                        "dispensed_by": d.dispensed_by,
+                        "dispensed_at": d.dispensed_at.isoformat() if d.dispensed_at else None,
+                        "status": d.status,
+                    }
+                    for d in batch.batch_material_dispensings
+                ],
+            }
+            for batch in order.batches
+        ],
+        "dosed_materials": [
+            {
+                "id": d.id,
+                "order_material_id": d.order_material_id,
+                "material_id": d.material_id,
+                "set_point": d.set_point,
+                "actual": d.actual,
+                "margin": d.margin,
+                "status": d.status,
+                "dosed_at": d.dosed_at.strftime("%Y-%m-%d %H:%M:%S") if d.dosed_at else None,
+            }
+            for d in dosed
+        ],
+    }), 200
+
+
+@production_bp.route("/production-orders/<int:order_id>/reject", methods=["PUT"])
+@jwt_required()
+@role_required(["admin"])
+def reject_production_order(order_id):
+    order = ProductionOrder.query.get(order_id)
+    if not order:
+        return jsonify({"error": "Production order not found"}), 404
+
+    order.status = "rejected"
+    db.session.commit()
+    replan_orders([order_id])
+    return jsonify({"message": "Production order rejected successfully"}), 200
+
+
+@production_bp.route("/production_orders/bypass", methods=["POST"])
+@jwt_required(locations=["headers"])
+@role_required(["admin", "operator"])
+def bypass_production_orders():
+    """Reject every pending material of the given orders (or of a recipe's verified orders) at once."""
+    data = request.get_json() or {}
+    order_ids = data.get("order_ids")
+    recipe_id = data.get("recipe_id")
+
+    if order_ids:
+        if not isinstance(order_ids, list):
+            return jsonify({"error": "order_ids must be a list"}), 400
+        condition = ProductionOrder.order_id.in_(order_ids)
+    elif recipe_id:
+        condition = (ProductionOrder.recipe_id == recipe_id) & (ProductionOrder.status == "verified")
+    else:
+        return jsonify({"error": "order_ids or recipe_id is required"}), 400
+
+    try:
+        bypassed = bypass_pending(condition)
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+    if bypassed:
+        # ✅ One coalesced event for the whole batch, after commit
+        socketio.emit("materials_bypassed", {
+            "order_ids": sorted({m["order_id"] for m in bypassed}),
+            "count": len(bypassed),
+            "materials": bypassed
+        })
+        replan_orders(sorted({m["order_id"] for m in bypassed}))
+
+    return jsonify({
+        "message": f"{len(bypassed)} materials bypassed.",
+        "bypassed": bypassed
+    }), 200
+
+
+### BATCH ROUTES ###
+@production_bp.route("/batches", methods=["POST"])
+def create_batch():
+    data = request.get_json()
+    if not all(key in data for key in ["batch_number", "order_id", "operator_id"]):
+        return (
+            jsonify(
+                {
+                    "error": "Missing required fields (batch_number, order_id, operator_id)"
+                }
+            ),
+            400,
+        )
+
+    order = ProductionOrder.query.get(data["order_id"])
+    if not order:
+        return (
+            jsonify({"error": f"Order with ID {data['order_id']} does not exist"}),
+            400,
+        )
+
+    operator = User.query.get(data["operator_id"])
+    if not operator:
+        return (
+            jsonify(
+                {"error": f"Operator with ID {data['operator_id']} does not exist"}
+            ),
+            400,
+        )
+
+    if Batch.query.filter_by(batch_number=data["batch_number"]).first():
+        return (
+            jsonify({"error": f"Batch number {data['batch_number']} already exists"}),
+            400,
+        )
+
+    try:
+        new_batch = Batch(
+            batch_number=data["batch_number"],
+            order_id=data["order_id"],
+            operator_id=data["operator_id"],
+            status=data.get("status", "pending"),
+            notes=data.get("notes"),
+        )
+        db.session.add(new_batch)
+        db.session.commit()
+        return (
+            jsonify(
+                {
+                    "message": "Batch created successfully!",
+                    "batch_id": new_batch.batch_id,
+                }
+            ),
+            201,
+        )
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@production_bp.route("/batches/bulk", methods=["POST"])
+def create_batches_bulk():
+    """
+    Create many batches in one transaction, validating orders, operators
+    and batch numbers with one IN query each. Nothing is created if any
+    batch is invalid.
+    """
+    batches = _bulk_items(request.get_json(silent=True), "batches")
+    if batches is None:
+        return jsonify({"error": "Expected a non-empty list of batches"}), 400
+
+    errors = []
+    rows = []
+    for index, item in enumerate(batches):
+        if not isinstance(item, dict) or not all(
+            item.get(key) not in (None, "") for key in ["batch_number", "order_id", "operator_id"]
+        ):
+            errors.append({
+                "index": index,
+                "error": "Missing required fields (batch_number, order_id, operator_id)"
+            })
+            continue
+        try:
+            order_id = int(item["order_id"])
+            operator_id = int(item["operator_id"])
+        except (TypeError, ValueError):
+            errors.append({"index": index, "error": "Invalid order_id or operator_id"})
+            continue
+        status = item.get("status", "Unreleased")
+        if status not in ("Released", "Unreleased"):
+            errors.append({"index": index, "error": f"Invalid status value: {status}"})
+            continue
+        rows.append({
+            "index": index,
+            "batch_number": str(item["batch_number"]),
+            "order_id": order_id,
+            "operator_id": operator_id,
+            "status": status,
+            "notes": item.get("notes"),
+        })
+
+    batch_numbers = [r["batch_number"] for r in rows]
+    order_ids = {r["order_id"] for r in rows}
+    operator_ids = {r["operator_id"] for r in rows}
+    known_orders = {
+        oid for (oid,) in db.session.query(ProductionOrder.order_id)
+        .filter(ProductionOrder.order_id.in_(order_ids)).all()
+    } if order_ids else set()
+    known_operators = {
+        uid for (uid,) in db.session.query(User.user_id).filter(User.user_id.in_(operator_ids)).all()
+    } if operator_ids else set()
+    taken = {
+        n for (n,) in db.session.query(Batch.batch_number)
+        .filter(Batch.batch_number.in_(batch_numbers)).all()
+    } if batch_numbers else set()
+
+    seen = set()
+    for r in rows:
+        if r["order_id"] not in known_orders:
+            errors.append({"index": r["index"], "error": f"Order with ID {r['order_id']} does not exist"})
+        elif r["operator_id"] not in known_operators:
+            errors.append({"index": r["index"], "error": f"Operator with ID {r['operator_id']} does not exist"})
+        elif r["batch_number"] in taken or r["batch_number"] in seen:
+            errors.append({"index": r["index"], "error": f"Batch number {r['batch_number']} already exists"})
+        seen.add(r["batch_number"])
+
+    if errors:
+        return jsonify({"error": "Validation failed", "errors": sorted(errors, key=lambda e: e["index"])}), 400
+
+    try:
+        db.session.execute(insert(Batch), [{k: v for k, v in r.items() if k != "index"} for r in rows])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({"message": f"{len(rows)} batches created successfully!", "created": len(rows)}), 201
+
+
+@production_bp.route("/batches", methods=["GET"])
+def get_batches():
+    batches = Batch.query.all()
+    result = [
+        {
+            "batch_id": batch.batch_id,
+            "batch_number": batch.batch_number,
+            "order_id": batch.order_id,
+            "status": batch.status,
+            "operator_id": batch.operator_id,
+            "notes": batch.notes,
+            "created_at": batch.created_at,
+        }
+        for batch in batches
+    ]
+    return jsonify(result)
+
+
+@production_bp.route("/batches/<int:batch_id>", methods=["PUT"])
+def update_batch(batch_id):
+    batch = Batch.query.get_or_404(batch_id)
+    data = request.get_json()
+
+    batch.batch_number = data.get("batch_number", batch.batch_number)
+    batch.order_id = data.get("order_id", batch.order_id)
+    batch.status = data.get("status", batch.status)
+    batch.operator_id = data.get("operator_id", batch.operator_id)
+    batch.notes = data.get("notes", batch.notes)
+
+    db.session.commit()
+    return jsonify({"message": "Batch updated successfully!"})
+
+
+@production_bp.route("/batches/<int:batch_id>", methods=["DELETE"])
+def delete_batch(batch_id):
+    batch = Batch.query.get_or_404(batch_id)
+    db.session.delete(batch)
+    db.session.commit()
+    return jsonify({"message": "Batch deleted successfully!"})
+
+
+### BATCH MATERIAL DISPENSING ROUTES ###
+@production_bp.route("/batch_dispensing", methods=["POST"])
+def create_batch_dispensing():
+    data = request.get_json()
+    new_dispensing = BatchMaterialDispensing(
+        batch_id=data["batch_id"],
+        material_id=data["material_id"],
+        planned_quantity=data["planned_quantity"],
+        actual_quantity=data.get("actual_quantity"),
+        dispensed_by=data["dispensed_by"],
+        status=data.get("status", "pending"),
+    )
+    db.session.add(new_dispensing)
+    db.session.commit()
+    return jsonify({"message": "Material dispensing record created successfully!"}), 201
+
+
+@production_bp.route("/batch_dispensing", methods=["GET"])
+def get_batch_dispensing():
+    dispensing_records = BatchMaterialDispensing.query.all()
+    result = [
+        {
+            "dispensing_id": record.dispensing_id,
+            "batch_id": record.batch_id,
+            "material_id": record.material_id,
+            "planned_quantity": str(record.planned_quantity),
+            "actual_quantity": str(record.actual_quantity)
+            if record.actual_quantity
+            else None,
+            "dispensed_by": record.dispensed_by,
+            "status": record.status,
+        }
+        for record in dispensing_records
+    ]
+    return jsonify(result)
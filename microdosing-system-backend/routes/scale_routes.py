@@ -1,159 +1,447 @@
-import time
-from flask import Blueprint, jsonify, request, Response, stream_with_context
-from models.scale_data import ScaleData
-from extensions import db
-from utils.scale_connection import read_scale_data
-import time
-import random
-
-scale_bp = Blueprint("scale", __name__)
-
-
-streaming_active = True  # Global variable at top of file
-
-
-@scale_bp.route("/live-weight", methods=["GET"])
-def live_scale_weight():
-    def generate():
-        # Yield immediately small dummy message
-        yield f"data: Connecting to scale...\n\n"
-
-        # Random delay before first real reading
-        initial_delay = random.uniform(1, 3)
-        time.sleep(initial_delay)
-
-        while True:
-            try:
-                data = read_scale_data()
-                if "error" not in data:
-                    raw_weight = data["weight"]
-                    real_weight_kg = (raw_weight * 100) / 1000
-                    yield f"data: {real_weight_kg:.3f} kg\n\n"
-                else:
-                    yield f"data: Error - {data['error']}\n\n"
-
-                time.sleep(1)
-            except GeneratorExit:
-                # Client disconnected cleanly (no crash)
-                print("Client disconnected cleanly")
-                break
-            except Exception as e:
-                # Handle unexpected errors inside generator
-                print(f"Unexpected error inside generate: {e}")
-                yield f"data: Error - Internal Server Error\n\n"
-                time.sleep(1)
-
-    return Response(stream_with_context(generate()), mimetype="text/event-stream")
-
-
-@scale_bp.route("/read-weight", methods=["GET"])
-def read_scale_weight():
-    data = read_scale_data()
-    if "error" not in data:
-        raw_weight = data["weight"]
-
-        # Adjust the scaling factor properly here:
-        real_weight_kg = (raw_weight * 100) / 1000
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "data": {
-                        "timestamp": data["timestamp"],
-                        "weight_raw": raw_weight,
-                        "weight_kg": real_weight_kg,
-                        "error_code": data["error_code"],
-                        "error_message": data["error_message"],
-                    },
-                }
-            ),
-            200,
-        )
-    else:
-        return jsonify({"success": False, "message": data["error"]}), 500
-
-
-@scale_bp.route("/stop-live-weight", methods=["POST"])
-def stop_live_scale_weight():
-    """
-    Stop the live weight streaming.
-    """
-    global streaming_active
-    streaming_active = False
-    return jsonify({"success": True, "message": "Live weight streaming stopped"}), 200
-
-
-@scale_bp.route("/save-weight", methods=["POST"])
-def save_scale_weight():
-    """
-    Save a specific reading manually into database.
-    """
-    data = request.get_json()
-
-    weight = data.get("weight")
-    error_code = data.get("error_code")
-    error_message = data.get("error_message", "")
-
-    if weight is None or error_code is None:
-        return jsonify({"success": False, "message": "Missing required fields"}), 400
-
-    new_record = ScaleData(
-        weight=weight, error_code=error_code, error_message=error_message
-    )
-    db.session.add(new_record)
-    db.session.commit()
-
-    return jsonify({"success": True, "message": "Weight saved successfully"}), 201
-
-
-@scale_bp.route("/weights", methods=["GET"])
-def get_saved_weights():
-    """
-    Get paginated saved weight readings from the database.
-    Query params:
-      - page (default 1)
-      - per_page (default 20)
-    """
-    try:
-        page = request.args.get("page", default=1, type=int)
-        per_page = request.args.get("per_page", default=20, type=int)
-
-        pagination = (
-            db.session.query(ScaleData)
-            .order_by(ScaleData.timestamp.desc())
-            .paginate(page=page, per_page=per_page, error_out=False)
-        )
-
-        result = []
-        for record in pagination.items:
-            result.append(
-                {
-                    "id": record.id,
-                    "timestamp": record.timestamp.isoformat(),
-                    "weight": record.weight,
-                    "error_code": record.error_code,
-                    "error_message": record.error_message,
-                }
-            )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "page": page,
-                    "per_page": per_page,
-                    "total": pagination.total,
-                    "pages": pagination.pages,
-                    "weights": result,
-                }
-            ),
-            200,
-        )
-
-    except Exception as e:
-        print(f"Error fetching paginated weights: {e}")
-        return (
-            jsonify({"success": False, "message": "Failed to fetch weight records"}),
-            500,
-        )
+import time
+from datetime import datetime
+from flask import Blueprint, jsonify, request, Response, stream_with_context, current_app
+from sqlalchemy.exc import IntegrityError
+from models.scale_data import ScaleData
+from models.scale import Scale
+from extensions import db
+from extensions import socketio
+from flask_socketio import emit, join_room, leave_room
+from utils.modbus_pool import modbus_pool
+from helpers.scale_broadcaster import get_broadcaster
+from helpers.scale_service import scale_service, get_scale_service, live_weight_broadcaster, weight_relay
+from helpers.scale_poller import scale_engine
+from helpers.dosing_controller import start_station_controllers, station_room
+from helpers.scale_helper import scale_data_writer
+from utils.circuit_breaker import all_breakers
+from helpers.scale_rollup import apply_rollups, choose_resolution, query_series, parse_datetime, parse_range
+from utils.register_map import get_register_map
+
+scale_bp = Blueprint("scale", __name__)
+
+
+streaming_active = True  # Global variable at top of file
+
+
+def stream_weight(broadcaster):
+    subscription = broadcaster.subscribe()
+
+    def generate():
+        # Yield immediately small dummy message
+        yield f"data: Connecting to scale...\n\n"
+
+        try:
+            while True:
+                data = subscription.get(timeout=broadcaster.interval * 5)
+                if data is None:
+                    continue
+                if "error" not in data:
+                    yield f"data: {data['weight_kg']:.3f} kg\n\n"
+                else:
+                    yield f"data: Error - {data['error']}\n\n"
+        except GeneratorExit:
+            # Client disconnected cleanly (no crash)
+            print("Client disconnected cleanly")
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
+
+
+@scale_bp.route("/live-weight", methods=["GET"])
+def live_scale_weight():
+    return stream_weight(live_weight_broadcaster)
+
+
+@socketio.on("subscribe_weight")
+def handle_subscribe_weight():
+    """
+    Join the `weight` room; readings are relayed from the shared poller
+    while the room has clients (see weight_relay).
+    """
+    join_room("weight")
+    weight_relay.join(request.sid)
+
+
+@socketio.on("unsubscribe_weight")
+def handle_unsubscribe_weight():
+    leave_room("weight")
+    weight_relay.leave(request.sid)
+
+
+@scale_bp.route("/live-weight/stats", methods=["GET"])
+def live_scale_weight_stats():
+    return jsonify({
+        "success": True,
+        "broadcaster": live_weight_broadcaster.get_stats(),
+        "socket_relay": weight_relay.get_stats(),
+    }), 200
+
+
+def weight_response(data):
+    if "error" not in data:
+        payload = {
+            "timestamp": data["timestamp"],
+            "weight_raw": data["weight"],
+            "weight_kg": data["weight_kg"],
+            "error_code": data["error_code"],
+            "error_message": data["error_message"],
+        }
+        if "scale_id" in data:
+            payload["scale_id"] = data["scale_id"]
+        return jsonify({"success": True, "data": payload}), 200
+    elif "weight" in data:
+        # Scale unavailable: answer fast with the last-known-good reading
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": data["error"],
+                    "stale": True,
+                    "stale_ms": data["stale_ms"],
+                    "data": {
+                        "timestamp": data["timestamp"],
+                        "weight_raw": data["weight"],
+                        "weight_kg": data["weight_kg"],
+                        "error_code": data["error_code"],
+                        "error_message": data["error_message"],
+                    },
+                }
+            ),
+            503,
+        )
+    else:
+        return jsonify({"success": False, "message": data["error"]}), 500
+
+
+@socketio.on("join_station")
+def handle_join_station(data):
+    """
+    Join a station's room for its dosing events (`dose_completed`,
+    `material_updated`, `weight_stable`, `target_reached`, ...).
+    """
+    scale_id = (data or {}).get("scale_id") if isinstance(data, dict) else None
+    if scale_id is None:
+        return
+    try:
+        scale_id = int(scale_id)
+    except (TypeError, ValueError):
+        # ✅ Tell the client instead of raising inside the socket handler
+        emit("join_station_error", {"error": "scale_id must be an integer", "scale_id": str(scale_id)})
+        return
+    join_room(station_room(scale_id))
+
+
+@scale_bp.route("/read-weight", methods=["GET"])
+def read_scale_weight():
+    return weight_response(scale_service.get_reading())
+
+
+### CONFIGURED SCALES ###
+def get_scale_config(scale_id):
+    """Engine copy of an active scale's config, else the DB row (or None)."""
+    config = scale_engine.get_config(scale_id)
+    if config is None:
+        scale = db.session.get(Scale, scale_id)
+        config = scale.to_config() if scale else None
+    return config
+
+
+@scale_bp.route("/<int:scale_id>/read-weight", methods=["GET"])
+def read_configured_scale_weight(scale_id):
+    config = get_scale_config(scale_id)
+    if not config:
+        return jsonify({"success": False, "message": "Scale not found"}), 404
+    return weight_response(get_scale_service(config).get_reading())
+
+
+@scale_bp.route("/<int:scale_id>/live-weight", methods=["GET"])
+def live_configured_scale_weight(scale_id):
+    config = get_scale_config(scale_id)
+    if not config:
+        return jsonify({"success": False, "message": "Scale not found"}), 404
+    broadcaster = get_broadcaster(
+        f"scale-{scale_id}", interval=config["poll_interval"]
+    )
+    return stream_weight(broadcaster)
+
+
+def reload_scales(scale=None):
+    """Apply Scale table changes to the poller and start the station's dosing."""
+    app = current_app._get_current_object()
+    scale_engine.reload(app)
+    if scale is not None and scale.active and app.config["SCALE_POLLING_ENABLED"]:
+        start_station_controllers([scale.scale_id])
+
+
+@scale_bp.route("/scales", methods=["GET"])
+def get_scales():
+    scales = Scale.query.order_by(Scale.scale_id).all()
+    return jsonify([s.to_config() for s in scales]), 200
+
+
+@scale_bp.route("/scales", methods=["POST"])
+def create_scale():
+    data = request.get_json() or {}
+    if not data.get("name") or not data.get("host"):
+        return jsonify({"error": "'name' and 'host' are required."}), 400
+
+    try:
+        get_register_map(data.get("register_map", "weight_error"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    scale = Scale(
+        name=data["name"],
+        host=data["host"],
+        port=data.get("port", 502),
+        unit_id=data.get("unit_id", 1),
+        register_map=data.get("register_map", "weight_error"),
+        scaling_factor=data.get("scaling_factor", 0.1),
+        poll_interval=data.get("poll_interval", 1.0),
+        active=data.get("active", True),
+    )
+    db.session.add(scale)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Duplicate entry: scale name already exists."}), 400
+
+    reload_scales(scale)
+    return jsonify({"message": "Scale created successfully!", "scale": scale.to_config()}), 201
+
+
+@scale_bp.route("/scales/<int:scale_id>", methods=["PUT"])
+def update_scale(scale_id):
+    scale = db.session.get(Scale, scale_id)
+    if not scale:
+        return jsonify({"error": "Scale not found"}), 404
+
+    data = request.get_json() or {}
+    if "register_map" in data:
+        try:
+            get_register_map(data["register_map"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    for field in (
+        "name",
+        "host",
+        "port",
+        "unit_id",
+        "register_map",
+        "scaling_factor",
+        "poll_interval",
+        "active",
+    ):
+        if field in data:
+            setattr(scale, field, data[field])
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Duplicate entry: scale name already exists."}), 400
+
+    reload_scales(scale)
+    return jsonify({"message": "Scale updated successfully!", "scale": scale.to_config()}), 200
+
+
+@scale_bp.route("/scales/<int:scale_id>", methods=["DELETE"])
+def delete_scale(scale_id):
+    scale = db.session.get(Scale, scale_id)
+    if not scale:
+        return jsonify({"error": "Scale not found"}), 404
+
+    db.session.delete(scale)
+    db.session.commit()
+
+    reload_scales()
+    return jsonify({"message": "Scale deleted successfully!"}), 200
+
+
+@scale_bp.route("/health", methods=["GET"])
+def get_scale_health():
+    """
+    Circuit breaker state and failure counts for every scale we talk to.
+    """
+    breakers = all_breakers()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "healthy": all(b["state"] == "closed" for b in breakers),
+                "breakers": breakers,
+            }
+        ),
+        200,
+    )
+
+
+@scale_bp.route("/engine", methods=["GET"])
+def get_scale_engine_stats():
+    return jsonify({"success": True, "engine": scale_engine.get_stats()}), 200
+
+
+@scale_bp.route("/connections", methods=["GET"])
+def get_scale_connections():
+    """
+    Connect/transaction latency counters for every pooled Modbus connection.
+    """
+    return (
+        jsonify(
+            {
+                "success": True,
+                "connections": modbus_pool.stats(),
+                "cache": scale_service.get_stats(),
+                "writer": scale_data_writer.get_stats(),
+            }
+        ),
+        200,
+    )
+
+
+@scale_bp.route("/stop-live-weight", methods=["POST"])
+def stop_live_scale_weight():
+    """
+    Stop the live weight streaming.
+    """
+    global streaming_active
+    streaming_active = False
+    return jsonify({"success": True, "message": "Live weight streaming stopped"}), 200
+
+
+@scale_bp.route("/save-weight", methods=["POST"])
+def save_scale_weight():
+    """
+    Save a specific reading manually into database.
+    """
+    data = request.get_json()
+
+    weight = data.get("weight")
+    error_code = data.get("error_code")
+    error_message = data.get("error_message", "")
+
+    if weight is None or error_code is None:
+        return jsonify({"success": False, "message": "Missing required fields"}), 400
+
+    new_record = ScaleData(
+        weight=weight,
+        error_code=error_code,
+        error_message=error_message,
+        timestamp=datetime.utcnow(),
+    )
+    db.session.add(new_record)
+    apply_rollups(
+        [{"timestamp": new_record.timestamp, "weight": weight, "error_code": error_code}]
+    )
+    db.session.commit()
+
+    return jsonify({"success": True, "message": "Weight saved successfully"}), 201
+
+
+@scale_bp.route("/weights", methods=["GET"])
+def get_saved_weights():
+    """
+    Get paginated saved weight readings from the database.
+    Query params:
+      - page (default 1)
+      - per_page (default 20)
+      - from, to (optional ISO datetimes, UTC)
+    """
+    try:
+        start = parse_datetime(request.args["from"], "from") if request.args.get("from") else None
+        end = parse_datetime(request.args["to"], "to") if request.args.get("to") else None
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    try:
+        page = request.args.get("page", default=1, type=int)
+        per_page = request.args.get("per_page", default=20, type=int)
+
+        query = db.session.query(ScaleData)
+        if start is not None:
+            query = query.filter(ScaleData.timestamp >= start)
+        if end is not None:
+            query = query.filter(ScaleData.timestamp < end)
+
+        pagination = query.order_by(ScaleData.timestamp.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+
+        result = []
+        for record in pagination.items:
+            result.append(
+                {
+                    "id": record.id,
+                    "timestamp": record.timestamp.isoformat(),
+                    "weight": record.weight,
+                    "error_code": record.error_code,
+                    "error_message": record.error_message,
+                }
+            )
+
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "page": page,
+                    "per_page": per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
+                    "weights": result,
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        print(f"Error fetching paginated weights: {e}")
+        return (
+            jsonify({"success": False, "message": "Failed to fetch weight records"}),
+            500,
+        )
+
+
+@scale_bp.route("/series", methods=["GET"])
+def get_weight_series():
+    """
+    Weight trend for charts, served from the minute/hour rollups.
+    Query params:
+      - from, to (ISO datetimes, UTC; default: the last hour)
+      - resolution: raw | minute | hour | auto (default auto)
+      - points: point budget used by auto (default 500)
+    """
+    try:
+        start, end = parse_range(request.args.get("from"), request.args.get("to"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    resolution = request.args.get("resolution", "auto")
+    max_points = request.args.get("points", default=500, type=int)
+    if resolution == "auto":
+        resolution = choose_resolution(
+            start, end, max_points, current_app.config["SCALE_CAPTURE_INTERVAL"]
+        )
+    elif resolution not in ("raw", "minute", "hour"):
+        return jsonify({"success": False, "message": f"Invalid resolution: {resolution}"}), 400
+
+    try:
+        points = query_series(start, end, resolution)
+    except Exception as e:
+        print(f"Error fetching weight series: {e}")
+        return jsonify({"success": False, "message": "Failed to fetch weight series"}), 500
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "from": start.isoformat(),
+                "to": end.isoformat(),
+                "resolution": resolution,
+                "points": points,
+            }
+        ),
+        200,
+    )
@@ -0,0 +1,50 @@
+from flask import Blueprint, request, jsonify
+from extensions import db
+from models.dose_statistics import DoseStatistic
+from models.material import Material
+from models.recipe import Recipe
+from helpers.spc import control_chart
+
+spc_bp = Blueprint("spc", __name__)
+
+SCOPES = ("material", "recipe")
+
+
+@spc_bp.route("/spc/statistics", methods=["GET"])
+def get_dose_statistics():
+    """Live dosing accuracy per material or recipe (no history scan)."""
+    scope = request.args.get("scope", "material")
+    if scope not in SCOPES:
+        return jsonify({"error": "scope must be 'material' or 'recipe'"}), 400
+
+    if scope == "material":
+        name = Material.title
+        join = Material.material_id == DoseStatistic.ref_id
+        model = Material
+    else:
+        name = Recipe.name
+        join = Recipe.recipe_id == DoseStatistic.ref_id
+        model = Recipe
+
+    rows = (
+        db.session.query(DoseStatistic, name)
+        .outerjoin(model, join)
+        .filter(DoseStatistic.scope == scope)
+        .order_by(DoseStatistic.ref_id)
+        .all()
+    )
+    return jsonify([dict(stat.to_dict(), name=label) for stat, label in rows]), 200
+
+
+@spc_bp.route("/spc/control-chart/<scope>/<int:ref_id>", methods=["GET"])
+def get_control_chart(scope, ref_id):
+    """X-bar/R chart points, limits and out-of-control flags."""
+    if scope not in SCOPES:
+        return jsonify({"error": "scope must be 'material' or 'recipe'"}), 400
+
+    # ✅ A malformed limit falls back to the default instead of a 500
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
+    chart = control_chart(scope, ref_id, limit=limit)
+    if chart is None:
+        return jsonify({"error": "No doses recorded"}), 404
+    return jsonify(chart), 200
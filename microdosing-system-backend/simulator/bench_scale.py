@@ -0,0 +1,109 @@
+# bench_scale.py
+"""
+Read-path benchmark against a scale (normally simulator/scale_simulator.py).
+
+  python simulator/scale_simulator.py --port 5020 &
+  python simulator/bench_scale.py --port 5020 --reads 500 --clients 10
+
+Reports per-read latency for a fresh connection per read (the old code
+path), the pooled connection, the coalesced ScaleClient snapshot, and the
+shared reading service under concurrent callers.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymodbus.client import ModbusTcpClient  # noqa: E402
+from models.scale import ScaleClient  # noqa: E402
+from helpers.scale_service import ScaleReadingService, make_scale_reader  # noqa: E402
+from utils.modbus_pool import modbus_pool  # noqa: E402
+from utils.register_map import get_register_map, read_register_map  # noqa: E402
+
+
+def timed(fn, reads):
+    samples = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<32} n={len(samples):<6} mean={statistics.mean(samples):7.2f} ms  "
+        f"p95={p95:7.2f} ms  max={samples[-1]:7.2f} ms"
+    )
+
+
+def main(args):
+    register_map = get_register_map(args.register_map)
+
+    def fresh_connection_read():
+        client = ModbusTcpClient(args.host, port=args.port, timeout=3)
+        client.connect()
+        try:
+            read_register_map(client, args.unit_id, register_map)
+        finally:
+            client.close()
+
+    def pooled_read():
+        modbus_pool.transaction(
+            args.host,
+            args.port,
+            args.unit_id,
+            lambda client, unit_id: read_register_map(client, unit_id, register_map),
+        )
+
+    report("fresh connection per read", timed(fresh_connection_read, args.reads))
+    report("pooled connection", timed(pooled_read, args.reads))
+
+    if args.register_map == "float_status":
+        client = ScaleClient(args.host, args.port, args.unit_id)
+        report("ScaleClient.get_scale_values", timed(client.get_scale_values, args.reads))
+
+    config = {
+        "scale_id": 0,
+        "host": args.host,
+        "port": args.port,
+        "unit_id": args.unit_id,
+        "register_map": args.register_map,
+        "scaling_factor": 0.1,
+    }
+    service = ScaleReadingService(make_scale_reader(config), ttl=args.ttl)
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        local = timed(service.get_reading, args.reads)
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report(f"reading service x{args.clients} clients", samples)
+    print(f"device transactions: {modbus_pool.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scale read-path benchmark")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--unit-id", type=int, default=1)
+    parser.add_argument(
+        "--register-map", default="weight_error", choices=["weight_error", "float_status"]
+    )
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--ttl", type=float, default=0.05)
+    main(parser.parse_args())
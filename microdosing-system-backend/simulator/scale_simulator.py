@@ -0,0 +1,198 @@
+# scale_simulator.py
+"""
+Local Modbus TCP scale indicator for benchmarking and tests.
+
+Serves the register layouts from utils/register_map.py:
+  weight_error  - integer weight (40001) + error code (40002), as read by
+                  utils/scale_connection.read_scale_data()
+  float_status  - float gross/tare/net + alarm flags, as read by
+                  models/scale.ScaleClient; tare and overrange read back
+                  from net's registers, as on the indicator
+
+Examples (run from microdosing-system-backend/):
+  python simulator/scale_simulator.py --port 5020
+  python simulator/scale_simulator.py --port 5020 --curve fill --target 25 --rate 2 --noise 0.01
+  python simulator/scale_simulator.py --register-map float_status --latency-ms 40
+  python simulator/scale_simulator.py --script simulator/dose_cycle.json
+
+Then point the backend at it, e.g. SCALE_HOST=127.0.0.1 SCALE_PORT=5020,
+or add a row to the `scale` table with host 127.0.0.1 and port 5020.
+
+A script is a JSON list of segments played in a loop:
+  {"duration": 3, "weight": 0}               hold a weight (kg)
+  {"duration": 10, "ramp_to": 25}            linear ramp (sets motion)
+  {"duration": 2, "error_code": 4}           report a fault code
+  {"duration": 1, "latency_ms": 500}         slow responses
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymodbus.datastore import (  # noqa: E402
+    ModbusSequentialDataBlock,
+    ModbusSlaveContext,
+    ModbusServerContext,
+)
+from pymodbus.server import StartAsyncTcpServer  # noqa: E402
+from utils.register_map import get_register_map, register_span, encode_registers  # noqa: E402
+
+
+class SimulatedScale:
+    """Current state of the simulated indicator, advanced by a script."""
+
+    def __init__(self, segments, noise=0.0, latency_ms=0.0, capacity=1000.0):
+        self.segments = segments
+        self.noise = noise
+        self.base_latency_ms = latency_ms
+        self.capacity = capacity
+        self.started = time.monotonic()
+        self.cycle = sum(s["duration"] for s in segments)
+        self.weight = 0.0
+        self.error_code = 0
+        self.motion = False
+        self.latency_ms = latency_ms
+
+    def advance(self):
+        elapsed = (time.monotonic() - self.started) % self.cycle if self.cycle else 0
+        weight = self.weight
+        self.error_code = 0
+        self.motion = False
+        self.latency_ms = self.base_latency_ms
+
+        for segment in self.segments:
+            if elapsed >= segment["duration"]:
+                elapsed -= segment["duration"]
+                weight = segment.get("ramp_to", segment.get("weight", weight))
+                continue
+
+            if "ramp_to" in segment:
+                start = segment.get("ramp_from", weight)
+                fraction = elapsed / segment["duration"]
+                weight = start + (segment["ramp_to"] - start) * fraction
+                self.motion = True
+            elif "weight" in segment:
+                weight = segment["weight"]
+            self.error_code = segment.get("error_code", 0)
+            self.latency_ms = segment.get("latency_ms", self.base_latency_ms)
+            break
+
+        self.weight = weight
+        return weight + (random.gauss(0, self.noise) if self.noise else 0.0)
+
+    def values(self, scaling_factor):
+        weight = self.advance()
+        return {
+            "weight": min(max(round(weight / scaling_factor), 0), 0xFFFF),
+            "error_code": self.error_code,
+            "gross_weight": weight,
+            "tare_weight": 0.0,
+            "net_weight": weight,
+            "overrange": weight > self.capacity,
+            "underrange": False,
+            "motion": self.motion,
+            "negative": weight < 0,
+        }
+
+
+class LatencyDataBlock(ModbusSequentialDataBlock):
+    """
+    Holding registers that delay every read by the scale's current latency
+    (the whole simulator stalls, like a busy indicator would).
+    """
+
+    def __init__(self, address, values, scale):
+        super().__init__(address, values)
+        self.scale = scale
+
+    def getValues(self, address, count=1):
+        if self.scale.latency_ms:
+            time.sleep(self.scale.latency_ms / 1000)
+        return super().getValues(address, count)
+
+
+def build_segments(args):
+    if args.script:
+        with open(args.script) as f:
+            return json.load(f)
+    if args.curve == "fill":
+        fill_time = args.target / args.rate if args.rate else 0
+        return [
+            {"duration": args.idle, "weight": 0},
+            {"duration": fill_time, "ramp_from": 0, "ramp_to": args.target},
+            {"duration": args.hold, "weight": args.target},
+        ]
+    return [{"duration": 1, "weight": args.target}]
+
+
+async def update_registers(block, scale, register_map, scaling_factor, hz):
+    start, count = register_span(register_map)
+    while True:
+        registers = encode_registers(register_map, scale.values(scaling_factor))
+        block.values[:count] = [
+            registers.get(address, 0) for address in range(start, start + count)
+        ]
+        await asyncio.sleep(1 / hz)
+
+
+async def main(args):
+    register_map = get_register_map(args.register_map)
+    start, count = register_span(register_map)
+    scaling_factor = args.scaling_factor or (0.1 if args.register_map == "weight_error" else 1.0)
+
+    scale = SimulatedScale(
+        build_segments(args), noise=args.noise, latency_ms=args.latency_ms
+    )
+    if args.fault is not None:
+        scale.segments = [dict(s, error_code=args.fault) for s in scale.segments]
+
+    block = LatencyDataBlock(start, [0] * count, scale)
+    context = ModbusServerContext(
+        slaves={args.unit_id: ModbusSlaveContext(hr=block, zero_mode=True)},
+        single=False,
+    )
+
+    asyncio.create_task(
+        update_registers(block, scale, register_map, scaling_factor, args.update_hz)
+    )
+    print(
+        f"⚖️  Simulated scale ({args.register_map}) on {args.host}:{args.port}, "
+        f"unit {args.unit_id}"
+    )
+    await StartAsyncTcpServer(context=context, address=(args.host, args.port))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Modbus TCP scale simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--unit-id", type=int, default=1)
+    parser.add_argument(
+        "--register-map", default="weight_error", choices=["weight_error", "float_status"]
+    )
+    parser.add_argument(
+        "--scaling-factor",
+        type=float,
+        default=None,
+        help="kg per raw count (default 0.1 for weight_error, 1.0 for float_status)",
+    )
+    parser.add_argument("--curve", default="fill", choices=["fill", "constant"])
+    parser.add_argument("--target", type=float, default=25.0, help="fill target (kg)")
+    parser.add_argument("--rate", type=float, default=2.0, help="fill rate (kg/s)")
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds empty before fill")
+    parser.add_argument("--hold", type=float, default=5.0, help="seconds held at target")
+    parser.add_argument("--noise", type=float, default=0.0, help="std dev (kg)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fault", type=int, default=None, help="constant error code")
+    parser.add_argument("--script", default=None, help="JSON segment script")
+    parser.add_argument("--update-hz", type=float, default=50.0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,178 @@
+import os
+import sys
+from types import SimpleNamespace
+import pytest
+
+# Modules are imported as in app.py (`from utils.register_map import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeSocketIO:
+    """Stands in for extensions.socketio: records emits and background tasks."""
+
+    def __init__(self):
+        self.emitted = []
+        self.tasks = []
+
+    def emit(self, event, data=None, **kwargs):
+        self.emitted.append((event, data, kwargs))
+
+    def start_background_task(self, target, *args, **kwargs):
+        self.tasks.append((target, args, kwargs))
+
+    def sleep(self, seconds=0):
+        pass
+
+    def events(self, name):
+        return [data for event, data, kwargs in self.emitted if event == name]
+
+
+@pytest.fixture
+def fake_socketio():
+    return FakeSocketIO()
+
+
+def pytest_configure(config):
+    """Register every model in app.py's order, before the test modules import them."""
+    from models.user import User  # noqa: F401
+    from models.scale import Scale  # noqa: F401
+    from models import material, recipe, production  # noqa: F401
+    from models import weight, storage, scale_data  # noqa: F401
+    from models import dose_statistics, dose_curve, schedule  # noqa: F401
+
+
+@pytest.fixture
+def db_app():
+    """Flask app on an in-memory SQLite database, inside an app context."""
+    from flask import Flask
+    from extensions import db
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+
+class Seed:
+    """Adds users, recipes and production orders to db_app."""
+
+    def user(self):
+        from extensions import db
+        from models.user import User
+
+        user = User.query.first()
+        if user is None:
+            user = User(
+                username="operator", full_name="Operator", email="operator@example.com",
+                password_hash="x", role="operator",
+            )
+            db.session.add(user)
+            db.session.flush()
+        return user
+
+    def recipe(self, set_points, margin=5.0, code="R-1"):
+        """A released recipe with one new material per set point (kg)."""
+        from extensions import db
+        from models.material import Material
+        from models.recipe import Recipe, RecipeMaterial
+
+        recipe = Recipe(name=code, code=code, version="1", status="Released", created_by=self.user().user_id)
+        db.session.add(recipe)
+        for number, set_point in enumerate(set_points, start=1):
+            material = Material(
+                title=f"{code}-M{number}", unit_of_measure="Kilogram (kg)", barcode_id=f"{code}-M{number}",
+                current_quantity=100, minimum_quantity=0, maximum_quantity=1000, status="Released",
+            )
+            db.session.add(material)
+            db.session.flush()
+            recipe.recipe_materials.append(
+                RecipeMaterial(material_id=material.material_id, set_point=set_point, margin=margin)
+            )
+        db.session.commit()
+        return recipe
+
+    def order(self, recipe, number="PO-1", status="verified", batch_size=1, scale_id=None, scheduled_date=None):
+        """A production order of `recipe` with its targets materialized."""
+        from datetime import date
+        from extensions import db
+        from models.production import ProductionOrder, ProductionOrderMaterial
+        from models.recipe import RecipeMaterial
+
+        order = ProductionOrder(
+            order_number=number, recipe_id=recipe.recipe_id, batch_size=batch_size,
+            scheduled_date=scheduled_date or date(2026, 3, 2), status=status,
+            created_by=self.user().user_id, scale_id=scale_id,
+        )
+        db.session.add(order)
+        db.session.flush()
+        recipe_materials = (
+            RecipeMaterial.query.filter_by(recipe_id=recipe.recipe_id)
+            .order_by(RecipeMaterial.recipe_material_id)
+            .all()
+        )
+        db.session.add_all(ProductionOrderMaterial.for_order(order, recipe_materials))
+        db.session.commit()
+        return order
+
+
+@pytest.fixture
+def seed(db_app):
+    return Seed()
+
+
+@pytest.fixture
+def dosing(db_app, fake_socketio, monkeypatch):
+    """
+    Station controllers on db_app. Socket.IO emits go to fake_socketio.
+    Re-plans run, with a fixed dosing rate in place of the MySQL-only
+    history query.
+    """
+    from helpers import dosing_controller, scheduler
+
+    calls = SimpleNamespace(socketio=fake_socketio)
+    monkeypatch.setattr(dosing_controller, "socketio", fake_socketio)
+    monkeypatch.setattr(scheduler, "socketio", fake_socketio)
+    monkeypatch.setattr(scheduler, "recipe_rates", lambda: ({}, 120.0))
+    monkeypatch.setattr(dosing_controller, "_controllers", {})
+    monkeypatch.setattr(dosing_controller, "_app", db_app)
+
+    from helpers.weight_filter import StabilityMonitor
+
+    def make(scale_id=None):
+        controller = dosing_controller.get_dosing_controller(scale_id)
+        controller.monitor = StabilityMonitor(controller.name, room=controller.room)
+        return controller
+
+    calls.make = make
+    return calls
+
+
+@pytest.fixture
+def api(db_app, seed, fake_socketio, monkeypatch):
+    """
+    Registers blueprints on db_app under /api and returns a test client
+    that sends a JWT of the seeded operator.
+    """
+    from flask_jwt_extended import create_access_token
+    from extensions import db, jwt, socketio
+
+    monkeypatch.setattr(socketio, "emit", fake_socketio.emit)
+    db_app.config["JWT_SECRET_KEY"] = "test-secret"
+    jwt.init_app(db_app)
+
+    def client(*blueprints):
+        for blueprint in blueprints:
+            db_app.register_blueprint(blueprint, url_prefix="/api")
+        token = create_access_token(identity=str(seed.user().user_id))
+        db.session.commit()
+        test_client = db_app.test_client()
+        test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return test_client
+
+    return client
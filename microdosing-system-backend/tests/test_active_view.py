@@ -0,0 +1,92 @@
+import pytest
+
+from extensions import db
+from helpers import dosing_controller
+from helpers.dosing_controller import refresh_all
+from models.material import MaterialInflight
+from models.production import ProductionOrderMaterial
+from routes.recipe_routes import recipe_bp
+
+
+@pytest.fixture
+def order(seed):
+    return seed.order(seed.recipe([1.0, 2.0]))
+
+
+def first_target():
+    return ProductionOrderMaterial.query.order_by(ProductionOrderMaterial.sequence).first()
+
+
+def test_view_is_served_from_memory_until_invalidated(dosing, order):
+    controller = dosing.make()
+    assert [m["set_point"] for m in controller.active_view()["materials"]] == [1.0, 2.0]
+
+    first_target().set_point = 1.5
+    db.session.commit()
+    assert controller.active_view()["materials"][0]["set_point"] == 1.0
+
+    controller.invalidate()
+    assert controller.active_view()["materials"][0]["set_point"] == 1.5
+
+
+def test_view_is_pushed_only_when_it_changes(dosing, order):
+    controller = dosing.make()
+    controller.refresh()
+    controller.refresh()
+    assert len(dosing.socketio.events("active_recipe_materials")) == 1
+
+    controller.evaluate(1.0, True)
+    views = dosing.socketio.events("active_recipe_materials")
+    assert len(views) == 2
+    assert [m["set_point"] for m in views[-1]["materials"]] == [2.0]
+
+
+def test_reload_keeps_the_dose_in_progress(dosing, order, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(dosing_controller.time, "monotonic", lambda: now[0])
+    db.session.add(MaterialInflight(material_id=first_target().material_id, inflight_kg=0.1))
+    db.session.commit()
+    controller = dosing.make()
+    controller.evaluate(0.95, True)  # past the 0.9 kg cut-off, still underweight
+    before = dict(controller.materials[0])
+    assert before["cutoff_weight"] == 0.95
+
+    now[0] = 105.0
+
+    controller.refresh()
+    assert [controller.materials[0][key] for key in dosing_controller.TRANSIENT_KEYS] == [
+        before["started_at"],
+        0.95,
+    ]
+    assert len(dosing.socketio.events("feeder_cutoff")) == 1
+
+    # a changed target starts over
+    first_target().set_point = 1.5
+    db.session.commit()
+    controller.refresh()
+    assert "cutoff_weight" not in controller.materials[0]
+    assert controller.materials[0]["started_at"] == 105.0
+
+
+def test_refresh_all_never_fails_the_caller(dosing, order, monkeypatch):
+    controller = dosing.make()
+    controller.refresh()
+
+    def broken():
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(controller, "refresh", broken)
+    refresh_all()
+    assert controller._dirty
+
+
+def test_active_route_reads_the_station_view(api, dosing, order):
+    client = api(recipe_bp)
+
+    response = client.get("/api/recipe_materials/active")
+
+    assert response.status_code == 200
+    assert (response.get_json()["order_id"], response.get_json()["set_point"]) == (order.order_id, 1.0)
+    assert client.get("/api/recipe_materials/active?scale_id=4").get_json() == {
+        "message": "No verified orders with pending recipe materials."
+    }
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_starts_with_every_blueprint():
+    # A separate interpreter: app.py monkey-patches the standard library
+    script = (
+        "import app\n"
+        "rules = {rule.rule for rule in app.app.url_map.iter_rules()}\n"
+        "print('routes:', '/api/production_orders' in rules, '/api/recipe_materials/active' in rules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND,
+        env=dict(os.environ, DATABASE_URL="sqlite://", SCALE_POLLING_ENABLED="false"),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "⚠️ Error" not in result.stdout, result.stdout
+    assert "routes: True True" in result.stdout
+    # the default station doses without the multi-scale polling engine
+    assert "Started Dosing Controllers (1 stations)" in result.stdout
@@ -0,0 +1,87 @@
+import pytest
+
+from models.production import Batch, ProductionOrder, ProductionOrderMaterial
+from routes import production_routes
+from routes.production_routes import production_bp
+
+
+@pytest.fixture
+def replanned(monkeypatch):
+    calls = []
+    monkeypatch.setattr(production_routes, "replan_orders", calls.append)
+    return calls
+
+
+@pytest.fixture
+def client(api, replanned):
+    return api(production_bp)
+
+
+def order(number, recipe_id, batch_size=2, **extra):
+    return dict(order_number=number, recipe_id=recipe_id, batch_size=batch_size, scheduled_date="2026-03-02", **extra)
+
+
+def test_orders_and_targets_in_one_request(client, fake_socketio, replanned, seed):
+    recipe = seed.recipe([0.5, 0.25])
+
+    response = client.post(
+        "/api/production_orders/bulk",
+        json={"orders": [order("PO-1", recipe.recipe_id), order("PO-2", recipe.recipe_id, batch_size=4)]},
+    )
+
+    assert response.status_code == 201
+    created = response.get_json()["orders"]
+    assert [o["order_number"] for o in created] == ["PO-1", "PO-2"]
+    second = ProductionOrder.query.filter_by(order_number="PO-2").one()
+    assert (second.status, second.dosing) == ("planned", 0.75)
+    targets = ProductionOrderMaterial.query.filter_by(order_id=second.order_id).order_by(ProductionOrderMaterial.sequence)
+    assert [t.set_point for t in targets] == [2.0, 1.0]
+    events = fake_socketio.events("orders_created")
+    assert len(events) == 1 and events[0]["count"] == 2
+    assert replanned == [[o["order_id"] for o in created]]
+
+
+def test_one_bad_order_creates_nothing(client, seed):
+    recipe = seed.recipe([1.0])
+    seed.order(recipe, number="PO-1")
+
+    response = client.post(
+        "/api/production_orders/bulk",
+        json={"orders": [
+            order("PO-2", recipe.recipe_id),
+            order("PO-1", recipe.recipe_id),  # taken
+            order("PO-3", 999),
+            order("PO-2", recipe.recipe_id),  # repeated in the request
+            order("PO-4", recipe.recipe_id, scale_id=7),
+            {"order_number": "PO-5"},
+            order("PO-6", recipe.recipe_id, batch_size=0),
+        ]},
+    )
+
+    assert response.status_code == 400
+    assert [e["index"] for e in response.get_json()["errors"]] == [1, 2, 3, 4, 5, 6]
+    assert ProductionOrder.query.count() == 1
+    assert client.post("/api/production_orders/bulk", json={"orders": []}).status_code == 400
+
+
+def test_batches_in_one_request(client, seed):
+    first = seed.order(seed.recipe([1.0]))
+    operator_id = seed.user().user_id
+
+    def batch(number, order_id=first.order_id, **extra):
+        return dict(batch_number=number, order_id=order_id, operator_id=operator_id, **extra)
+
+    bad = client.post(
+        "/api/batches/bulk",
+        json={"batches": [batch("B-1"), batch("B-2", order_id=999), batch("B-1"), batch("B-3", status="Done")]},
+    )
+    assert bad.status_code == 400
+    assert [e["index"] for e in bad.get_json()["errors"]] == [1, 2, 3]
+    assert Batch.query.count() == 0
+
+    response = client.post("/api/batches/bulk", json={"batches": [batch("B-1"), batch("B-2", status="Released")]})
+    assert response.status_code == 201 and response.get_json()["created"] == 2
+    assert [(b.batch_number, b.status) for b in Batch.query.order_by(Batch.batch_id)] == [
+        ("B-1", "Unreleased"),
+        ("B-2", "Released"),
+    ]
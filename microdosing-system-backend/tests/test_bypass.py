@@ -0,0 +1,79 @@
+import pytest
+
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial
+from helpers.dosing_controller import bypass_pending
+from routes import production_routes, recipe_routes
+from routes.production_routes import production_bp
+from routes.recipe_routes import recipe_bp
+
+
+@pytest.fixture
+def orders(dosing, seed):
+    recipe = seed.recipe([1.0, 2.0, 3.0])
+    first = seed.order(recipe, number="PO-1")
+    second = seed.order(recipe, number="PO-2", status="pending")
+    return first, second
+
+
+def statuses(order):
+    return [
+        t.status
+        for t in ProductionOrderMaterial.query.filter_by(order_id=order.order_id)
+        .order_by(ProductionOrderMaterial.sequence)
+    ]
+
+
+def test_rejects_only_pending_targets_of_the_matched_orders(dosing, orders):
+    first, second = orders
+    assert dosing.make().evaluate(1.0, True)["success"]
+
+    bypassed = bypass_pending(ProductionOrder.order_id == first.order_id)
+
+    assert [(m["order_id"], m["status"]) for m in bypassed] == [(first.order_id, "Rejected")] * 2
+    assert statuses(first) == ["Dosed", "Rejected", "Rejected"]
+    assert statuses(second) == ["pending"] * 3
+    rejected = DosedRecipeMaterial.query.filter_by(status="Rejected").all()
+    assert sorted(r.order_material_id for r in rejected) == sorted(m["order_material_id"] for m in bypassed)
+    assert all(r.actual is None for r in rejected)
+    # the station dropped the rejected targets from its view
+    assert dosing.make().active_view()["materials"] == []
+
+
+def test_nothing_pending_is_a_no_op(dosing, orders):
+    assert bypass_pending(ProductionOrder.order_id == -1) == []
+    assert DosedRecipeMaterial.query.count() == 0
+
+
+def test_route_emits_one_event_for_the_batch(api, dosing, orders, monkeypatch):
+    replanned = []
+    monkeypatch.setattr(production_routes, "replan_orders", replanned.append)
+    client = api(production_bp)
+    order_ids = [order.order_id for order in orders]
+
+    response = client.post("/api/production_orders/bypass", json={"order_ids": order_ids})
+
+    assert response.status_code == 200
+    assert len(response.get_json()["bypassed"]) == 6
+    events = dosing.socketio.events("materials_bypassed")
+    assert len(events) == 1
+    assert (events[0]["order_ids"], events[0]["count"]) == (sorted(order_ids), 6)
+    assert replanned == [sorted(order_ids)]
+
+    assert client.post("/api/production_orders/bypass", json={"order_ids": 1}).status_code == 400
+    assert client.post("/api/production_orders/bypass", json={}).status_code == 400
+
+
+def test_recipe_route_replans_the_bypassed_orders(api, dosing, orders, monkeypatch):
+    replanned = []
+    monkeypatch.setattr(recipe_routes, "replan_orders", replanned.append)
+    first, second = orders
+    client = api(recipe_bp)
+
+    response = client.post(f"/api/recipe_materials/bypass/{first.recipe_id}")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["bypassed_ids"]) == 3
+    assert len(dosing.socketio.events("materials_bypassed")) == 1
+    # only the verified order is bypassed, and re-planned after the commit
+    assert replanned == [[first.order_id]]
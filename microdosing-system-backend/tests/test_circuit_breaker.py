@@ -0,0 +1,80 @@
+import pytest
+
+from utils import circuit_breaker
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker("scale", failure_threshold=3, base_backoff=2.0)
+    for _ in range(2):
+        breaker.record_failure(OSError("timeout"))
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure(OSError("timeout"))
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("scale", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_after_backoff(clock):
+    breaker = CircuitBreaker("scale", failure_threshold=1, base_backoff=2.0)
+    breaker.record_failure()
+    clock[0] += 1.9
+    assert not breaker.allow()
+
+    clock[0] += 0.1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.backoff == 2.0
+
+
+def test_failed_probe_doubles_the_backoff_up_to_the_cap(clock):
+    breaker = CircuitBreaker("scale", failure_threshold=1, base_backoff=2.0, max_backoff=5.0)
+    breaker.record_failure()
+
+    expected = [4.0, 5.0, 5.0]
+    for backoff in expected:
+        clock[0] = breaker.next_attempt_at
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.backoff == backoff
+        assert breaker.next_attempt_at == clock[0] + backoff
+
+
+def test_get_state_reports_retry_time(clock):
+    breaker = CircuitBreaker("scale", failure_threshold=1, base_backoff=3.0)
+    breaker.record_failure(OSError("refused"))
+    clock[0] += 1.0
+
+    state = breaker.get_state()
+    assert state["state"] == OPEN
+    assert state["retry_in_s"] == 2.0
+    assert state["last_error"] == "refused"
@@ -0,0 +1,84 @@
+import math
+from datetime import datetime, timedelta
+import pytest
+
+import numpy as np
+from extensions import db
+from helpers.dose_analytics import (
+    DEFAULT_STATION,
+    METRICS,
+    analyze_doses,
+    curve_metrics,
+    group_means,
+)
+from helpers.dose_curve import CURVE_DTYPE, pack_curve
+from models.dose_curve import DoseCurve
+from models.recipe import DosedRecipeMaterial
+
+
+def curve(weights, step=1.0):
+    return np.array([(i * step, w, 0) for i, w in enumerate(weights)], dtype=CURVE_DTYPE)
+
+
+# 1 kg dose: 10% at 1 s, 90% at 3 s, 50 g peak, settled from 5 s
+DOSE = [0.0, 0.12, 0.5, 0.95, 1.05, 1.0, 1.002, 0.999, 1.001]
+
+
+def test_metrics_of_one_dose():
+    metrics = curve_metrics([curve(DOSE)], [1.0], band_kg=0.01)
+
+    assert metrics["feed_rate_kg_s"][0] == pytest.approx(0.4)
+    assert metrics["t90_s"][0] == 3.0
+    assert metrics["settle_s"][0] == 2.0
+    assert metrics["overshoot_g"][0] == pytest.approx(50, abs=0.01)
+    # tail deviations from the final weight: -1, 1, -2, 0 g
+    assert metrics["noise_g"][0] == pytest.approx(math.sqrt(1.25), abs=0.01)
+
+
+def test_segments_do_not_leak_into_each_other():
+    short = curve([0.0, 0.2, 0.4])  # never reaches 90%
+    curves = [curve(DOSE), curve([]), short, curve(DOSE, step=0.5)]
+
+    batch = curve_metrics(curves, [1.0, 1.0, 1.0, 1.0], band_kg=0.01)
+
+    for i, single in enumerate(curves):
+        alone = curve_metrics([single], [1.0], band_kg=0.01)
+        for name in METRICS:
+            np.testing.assert_allclose(batch[name][i], alone[name][0], equal_nan=True)
+    assert all(np.isnan(batch[name][1]) for name in METRICS)
+    assert np.isnan(batch["t90_s"][2]) and np.isnan(batch["feed_rate_kg_s"][2])
+    assert batch["t90_s"][3] == 1.5
+
+
+def test_group_means_leave_nan_out():
+    keys, counts, means = group_means(
+        np.array([3, 1, 3, 3]), {"t90_s": np.array([2.0, np.nan, 4.0, np.nan])}
+    )
+
+    assert keys.tolist() == [1, 3]
+    assert counts.tolist() == [1, 3]
+    assert np.isnan(means["t90_s"][0])
+    assert means["t90_s"][1] == 3.0
+
+
+def test_doses_are_streamed_in_chunks(db_app):
+    now = datetime(2026, 3, 2, 12, 0)
+    for material_id in (4, 5, 4):
+        dosed = DosedRecipeMaterial(
+            recipe_id=1, material_id=material_id, set_point=1.0, actual=1.001,
+            batch_size=1, dosed_at=now,
+        )
+        db.session.add(dosed)
+        db.session.flush()
+        data, samples, duration = pack_curve([(i, w, False) for i, w in enumerate(DOSE)], 0)
+        db.session.add(
+            DoseCurve(dosed_material_id=dosed.id, samples=samples, duration_s=duration, rate_hz=1, data=data)
+        )
+    db.session.commit()
+
+    material_ids, scale_ids, metrics = analyze_doses(now, now + timedelta(hours=1), chunk_size=2)
+
+    assert material_ids.tolist() == [4, 5, 4]
+    assert scale_ids.tolist() == [DEFAULT_STATION] * 3
+    assert metrics["t90_s"].tolist() == [3.0, 3.0, 3.0]
+    assert len(analyze_doses(now + timedelta(hours=1), now + timedelta(hours=2))[0]) == 0
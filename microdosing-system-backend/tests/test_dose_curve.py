@@ -0,0 +1,101 @@
+import pytest
+
+import numpy as np
+from helpers import dose_curve
+from helpers.dose_curve import CURVE_DTYPE, DoseCurveRecorder, pack_curve, unpack_curve
+from models.dose_curve import DoseCurve
+
+
+class Done(Exception):
+    pass
+
+
+class FakeBroadcaster:
+    interval = 0.1
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.captures = []
+
+    def subscribe(self, capture=False):
+        assert capture
+        return self
+
+    def get(self, timeout=None):
+        if not self.items:
+            raise Done()
+        item = self.items.pop(0)
+        if callable(item):  # act between two samples
+            item()
+            return None
+        return item
+
+    def set_capture(self, interval):
+        self.captures.append(interval)
+
+
+@pytest.fixture
+def socketio(monkeypatch, fake_socketio):
+    monkeypatch.setattr(dose_curve, "socketio", fake_socketio)
+    return fake_socketio
+
+
+def record(recorder, socketio):
+    """Run the recorder's capture task until its subscription runs dry."""
+    recorder.start()
+    target, args, kwargs = socketio.tasks[-1]
+    with pytest.raises(Done):
+        target(*args, **kwargs)
+
+
+def test_pack_round_trip():
+    samples = [(100.0, 0.0, True), (100.02, 0.5, True), (100.5, 1.25, False)]
+
+    data, count, duration = pack_curve(samples, started_at=100.0)
+    curve = unpack_curve(data)
+
+    assert (count, duration) == (3, pytest.approx(0.5))
+    assert curve.dtype == CURVE_DTYPE
+    np.testing.assert_allclose(curve["t"], [0.0, 0.02, 0.5], atol=1e-6)
+    np.testing.assert_allclose(curve["weight_kg"], [0.0, 0.5, 1.25])
+    assert curve["motion"].tolist() == [1, 1, 0]
+
+
+def test_recorder_captures_only_the_current_target(socketio):
+    broadcaster = FakeBroadcaster([])
+    recorder = DoseCurveRecorder(broadcaster, rate_hz=50)
+    broadcaster.items = [
+        (9.0, {"weight_kg": 0.1}),  # before begin(): dropped
+        lambda: recorder.begin(key=7, started_at=10.0),
+        (10.5, {"weight_kg": 0.4, "motion": 1}),
+        (10.6, {"error": "timeout"}),
+        (11.0, {"weight_kg": 0.9}),
+    ]
+
+    record(recorder, socketio)
+
+    assert broadcaster.captures == [0.02]
+    assert recorder.take(8) is None
+    data, count, duration = recorder.take(7)
+    assert (count, duration) == (2, pytest.approx(1.0))
+    assert unpack_curve(data)["motion"].tolist() == [1, 0]
+
+    recorder.stop()
+    assert broadcaster.captures == [0.02, None]
+    assert recorder.take(7) is None
+
+
+def test_dose_stores_its_curve(dosing, socketio, seed):
+    seed.order(seed.recipe([1.0]))
+    controller = dosing.make()
+    broadcaster = FakeBroadcaster([(10.5, {"weight_kg": 0.5}), (11.0, {"weight_kg": 1.0})])
+    controller.recorder = DoseCurveRecorder(broadcaster, rate_hz=25)
+    controller.active_view()  # begins the first material's curve
+    record(controller.recorder, socketio)
+
+    result = controller.evaluate(1.0, True)
+
+    curve = DoseCurve.query.one()
+    assert curve.dosed_material_id == result["data"]["dosed_material_id"]
+    assert (curve.samples, curve.rate_hz) == (2, 25)
+    np.testing.assert_allclose(unpack_curve(curve.data)["weight_kg"], [0.5, 1.0])
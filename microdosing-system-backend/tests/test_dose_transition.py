@@ -0,0 +1,53 @@
+import pytest
+
+from extensions import db
+from helpers.dosing_controller import DosingController
+from helpers.weight_filter import StabilityMonitor
+from models.production import ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial
+
+
+@pytest.fixture
+def order(seed):
+    return seed.order(seed.recipe([1.0, 1.0]))
+
+
+def second_worker(db_app):
+    """Another process's controller for the default station."""
+    controller = DosingController(app=db_app)
+    controller.monitor = StabilityMonitor(controller.name)
+    return controller
+
+
+def test_a_target_is_dosed_once_across_workers(dosing, db_app, order):
+    first, second = dosing.make(), second_worker(db_app)
+    second.load()  # both hold material 1 as pending
+
+    assert first.evaluate(1.0, True)["success"]
+    result = second.evaluate(1.001, True)
+
+    assert result["reason"] == "in_progress"
+    assert DosedRecipeMaterial.query.count() == 1
+    assert ProductionOrderMaterial.query.filter_by(status="Dosed").one().actual == 1.0
+
+    # The loser resyncs and carries on with the next material
+    assert second.evaluate(1.0, True)["success"]
+    assert ProductionOrderMaterial.query.filter_by(status="pending").count() == 0
+
+
+def test_a_duplicate_history_row_rolls_the_dose_back(dosing, order):
+    target = ProductionOrderMaterial.query.order_by(ProductionOrderMaterial.sequence).first()
+    db.session.add(
+        DosedRecipeMaterial(
+            recipe_id=order.recipe_id, material_id=target.material_id,
+            order_material_id=target.id, set_point=1.0, batch_size=1,
+        )
+    )
+    db.session.commit()
+
+    result = dosing.make().evaluate(1.0, True)
+
+    assert result["reason"] == "in_progress"
+    db.session.expire_all()
+    assert db.session.get(ProductionOrderMaterial, target.id).status == "pending"
+    assert dosing.socketio.events("dose_completed") == []
@@ -0,0 +1,104 @@
+import threading
+import pytest
+
+from extensions import db
+from helpers.scheduler import replan
+from models.dose_statistics import DoseStatistic
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial
+from models.schedule import ProductionSchedule
+
+
+@pytest.fixture
+def order(seed):
+    # 2.0 kg and 1.0 kg with a 5 g margin below each set point
+    return seed.order(seed.recipe([2.0, 1.0], margin=5.0))
+
+
+def test_no_verified_order(dosing):
+    result = dosing.make().evaluate(1.0, True)
+    assert result == {"success": False, "message": "No verified production order found"}
+
+
+def test_waits_until_the_weight_is_in_range_and_settled(dosing, order):
+    controller = dosing.make()
+
+    assert controller.evaluate(1.99, True)["reason"] == "underweight"
+    assert controller.evaluate(1.996, False)["reason"] == "unstable"
+    assert DosedRecipeMaterial.query.count() == 0
+    assert dosing.socketio.events("material_updated") == []
+
+
+def test_settled_weight_doses_and_moves_to_the_next_material(dosing, order):
+    controller = dosing.make()
+
+    result = controller.evaluate(2.001, True)
+
+    assert result["success"] and not result["reset_done"]
+    assert result["total_remaining"] == 1
+    assert result["data"]["margin"] == 1.0  # g over the set point
+
+    targets = ProductionOrderMaterial.query.order_by(ProductionOrderMaterial.sequence).all()
+    assert [t.status for t in targets] == ["Dosed", "pending"]
+    assert targets[0].actual == 2.001
+    dosed = DosedRecipeMaterial.query.one()
+    assert (dosed.order_material_id, dosed.status) == (targets[0].id, "Dosed")
+    stats = DoseStatistic.query.order_by(DoseStatistic.scope).all()
+    assert [(s.scope, s.ref_id, s.count, s.mean) for s in stats] == [
+        ("material", targets[0].material_id, 1, 1.0),
+        ("recipe", order.recipe_id, 1, 1.0),
+    ]
+
+    assert len(dosing.socketio.events("material_updated")) == 1
+    assert len(dosing.socketio.events("dose_completed")) == 1
+    assert controller.monitor.target["set_point"] == 1.0
+
+
+def test_force_skips_the_stability_check(dosing, order):
+    assert dosing.make().evaluate(2.0, False, force=True)["success"]
+
+
+def test_final_material_completes_the_order(dosing, order):
+    controller = dosing.make()
+    controller.evaluate(2.0, True)
+
+    result = controller.evaluate(1.0, True)
+
+    assert result["success"] and result["reset_done"]
+    assert db.session.get(ProductionOrder, order.order_id).status == "completed"
+    assert dosing.socketio.events("order_completed")[0]["order_id"] == order.order_id
+    assert controller.evaluate(1.0, True)["message"] == "No verified production order found"
+
+
+def test_final_material_on_the_station_task_replans(dosing, seed):
+    recipe = seed.recipe([1.0])
+    seed.order(recipe, number="PO-1")
+    waiting = seed.order(recipe, number="PO-2", status="planned")
+    replan()
+    controller = dosing.make()
+    controller.load()
+
+    # The station's background task runs without an app context
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(controller.evaluate(1.0, True)))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert result["reset_done"]
+    assert db.session.query(ProductionSchedule.order_id).all() == [(waiting.order_id,)]
+    assert controller.active_view() is None  # reloaded: nothing verified is left
+
+
+def test_a_busy_station_does_not_queue_when_asked_not_to(dosing, order):
+    controller = dosing.make()
+    controller._lock.acquire()
+    try:
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(controller.evaluate(2.0, True, wait=False)))
+        thread.start()
+        thread.join(timeout=5)
+    finally:
+        controller._lock.release()
+
+    assert result["reason"] == "busy"
+    assert DosedRecipeMaterial.query.count() == 0
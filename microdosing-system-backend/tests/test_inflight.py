@@ -0,0 +1,82 @@
+import pytest
+
+from extensions import db
+from helpers import dosing_controller
+from helpers.dosing_controller import cutoff_point
+from models.material import MaterialInflight
+from models.recipe import DosedRecipeMaterial
+
+
+@pytest.fixture
+def config(monkeypatch):
+    monkeypatch.setattr(dosing_controller.Config, "DOSING_INFLIGHT_MAX_FRACTION", 0.2)
+    monkeypatch.setattr(dosing_controller.Config, "DOSING_INFLIGHT_ALPHA", 0.5)
+
+
+def test_cutoff_is_set_point_minus_inflight_within_the_cap(config):
+    assert cutoff_point(10.0, 0.5) == 9.5
+    assert cutoff_point(10.0, None) == 10.0
+    assert cutoff_point(10.0, 5.0) == 8.0  # never earlier than 20% before set point
+
+
+def test_observe_keeps_running_averages():
+    estimate = MaterialInflight(material_id=1, inflight_kg=0.0, samples=0)
+
+    estimate.observe(0.02, inflight_kg=0.1, cycle_s=10.0, alpha=0.5)
+    estimate.observe(0.04, inflight_kg=0.3, alpha=0.5)
+
+    assert estimate.samples == 2
+    assert estimate.mean_overshoot_kg == pytest.approx(0.03)
+    assert estimate.inflight_kg == pytest.approx(0.175)  # 0.05, then halfway to 0.3
+    assert estimate.mean_cycle_s == 10.0
+
+    estimate.observe(0.0, inflight_kg=-5.0, alpha=0.5)
+    assert estimate.inflight_kg == 0.0
+
+
+def test_feeder_cutoff_is_signalled_once_and_learned(dosing, config, seed):
+    recipe = seed.recipe([2.0, 1.0, 2.0])
+    material_id = recipe.recipe_materials[0].material_id
+    recipe.recipe_materials[2].material_id = material_id  # dosed again last
+    seed.order(recipe)
+    db.session.add(MaterialInflight(material_id=material_id, inflight_kg=0.1, samples=3))
+    db.session.commit()
+    controller = dosing.make()
+
+    assert controller.evaluate(1.85, True)["reason"] == "underweight"
+    assert controller.evaluate(1.9, False)["reason"] == "underweight"
+    assert controller.evaluate(1.95, False)["reason"] == "underweight"
+    cutoffs = dosing.socketio.events("feeder_cutoff")
+    assert [(c["cutoff"], c["weight_kg"], c["inflight_kg"]) for c in cutoffs] == [(1.9, 1.9, 0.1)]
+
+    assert controller.evaluate(2.0, True)["data"]["cutoff"] == 1.9
+
+    db.session.expire_all()
+    estimate = db.session.get(MaterialInflight, material_id)
+    assert (estimate.samples, estimate.inflight_kg) == (4, pytest.approx(0.1))
+    assert estimate.mean_overshoot_kg == 0.0
+    # the 2 kg repeat of the same material later in the order uses the new estimate
+    assert controller.materials[2]["cutoff"] == cutoff_point(2.0, estimate.inflight_kg)
+
+
+def test_first_estimate_is_seeded_from_the_dose_history(dosing, config, seed):
+    recipe = seed.recipe([1.0])
+    material_id = recipe.recipe_materials[0].material_id
+    db.session.add_all(
+        DosedRecipeMaterial(
+            recipe_id=recipe.recipe_id, material_id=material_id, set_point=1.0,
+            actual=actual, batch_size=1,
+        )
+        for actual in (1.02, 1.04)
+    )
+    db.session.commit()
+    seed.order(recipe)
+
+    assert dosing.make().evaluate(1.0, True)["success"]
+
+    estimate = db.session.get(MaterialInflight, material_id)
+    assert estimate.samples == 1
+    # seeded with the 30 g mean overshoot, then this dose (cut off at the
+    # set point, landing on it) folded in
+    assert estimate.inflight_kg == pytest.approx(0.015)
+    assert estimate.mean_overshoot_kg == pytest.approx(0.015)
@@ -0,0 +1,82 @@
+import pytest
+
+from pymodbus.exceptions import ConnectionException
+from utils import modbus_pool as pool_module
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.modbus_pool import ModbusConnectionError, ModbusConnectionManager
+
+
+class FakeClient:
+    instances = []
+    reachable = True
+
+    def __init__(self, host, port=502, timeout=3):
+        self.connected = False
+        FakeClient.instances.append(self)
+
+    def connect(self):
+        self.connected = FakeClient.reachable
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    FakeClient.instances = []
+    FakeClient.reachable = True
+    monkeypatch.setattr(pool_module, "ModbusTcpClient", FakeClient)
+    # a new breaker per connection, so tests do not share breaker state
+    monkeypatch.setattr(
+        pool_module,
+        "get_breaker",
+        lambda host, port, unit_id: CircuitBreaker(
+            f"{host}:{port}/{unit_id}", failure_threshold=2, base_backoff=60
+        ),
+    )
+    return ModbusConnectionManager()
+
+
+def test_connection_is_reused(manager):
+    for _ in range(5):
+        assert manager.transaction("scale", 502, 1, lambda client, unit_id: unit_id) == 1
+
+    stats = manager.stats()[0]
+    assert len(FakeClient.instances) == 1
+    assert stats["connect_count"] == 1
+    assert stats["transaction_count"] == 5
+
+
+def test_dropped_socket_is_reopened_and_retried_once(manager):
+    calls = []
+
+    def fn(client, unit_id):
+        calls.append(client)
+        if len(calls) == 1:
+            raise ConnectionException("reset by peer")
+        return "ok"
+
+    assert manager.transaction("scale", 502, 1, fn) == "ok"
+    assert len(calls) == 2
+    assert calls[0] is not calls[1]
+    assert manager.stats()[0]["transaction_failures"] == 1
+
+
+def test_unreachable_device_opens_the_breaker(manager):
+    FakeClient.reachable = False
+    for _ in range(2):
+        with pytest.raises(ModbusConnectionError):
+            manager.transaction("scale", 502, 1, lambda client, unit_id: None)
+
+    connects = len(FakeClient.instances)
+    with pytest.raises(CircuitOpenError):
+        manager.transaction("scale", 502, 1, lambda client, unit_id: None)
+    assert len(FakeClient.instances) == connects
+
+
+def test_devices_get_their_own_connection(manager):
+    manager.transaction("scale-a", 502, 1, lambda client, unit_id: None)
+    manager.transaction("scale-b", 502, 1, lambda client, unit_id: None)
+    manager.transaction("scale-a", 502, 2, lambda client, unit_id: None)
+    assert len(manager.stats()) == 3
@@ -0,0 +1,63 @@
+from datetime import date
+import pytest
+
+from extensions import db
+from helpers.mrp import material_requirements
+from models.production import ProductionOrderMaterial
+from routes.planning_routes import planning_bp
+
+
+@pytest.fixture
+def plan(seed):
+    """
+    M1: 2 kg/batch, 10 kg in stock (minimum 5); M2: 1 kg/batch, 5000 g
+    in stock (minimum 1000 g).
+    """
+    recipe = seed.recipe([2.0, 1.0])
+    m1, m2 = (rm.material for rm in recipe.recipe_materials)
+    m1.current_quantity, m1.minimum_quantity = 10, 5
+    m2.unit_of_measure, m2.current_quantity, m2.minimum_quantity = "Gram (g)", 5000, 1000
+
+    seed.order(recipe, number="PO-1", status="planned", scheduled_date=date(2026, 3, 1))  # overdue
+    verified = seed.order(recipe, number="PO-2", batch_size=2, scheduled_date=date(2026, 3, 3))
+    seed.order(recipe, number="PO-3", status="completed", scheduled_date=date(2026, 3, 3))
+    legacy = seed.order(recipe, number="PO-4", status="planned", batch_size=3, scheduled_date=date(2026, 3, 4))
+    seed.order(recipe, number="PO-5", status="planned", scheduled_date=date(2026, 3, 5))
+
+    ProductionOrderMaterial.query.filter_by(order_id=verified.order_id, sequence=1).one().status = "Dosed"
+    ProductionOrderMaterial.query.filter_by(order_id=legacy.order_id).delete()
+    db.session.commit()
+    return m1.material_id, m2.material_id
+
+
+def test_requirements_against_stock(plan):
+    m1, m2 = plan
+
+    result = material_requirements(date(2026, 3, 2), date(2026, 3, 4))
+
+    assert [m["material_id"] for m in result] == [m2, m1]  # the short one first
+    grams, kilograms = result
+    assert [(d["date"], d["required"], d["projected"]) for d in grams["days"]] == [
+        ("2026-03-02", 1000, 4000),
+        ("2026-03-03", 2000, 2000),
+        ("2026-03-04", 3000, -1000),
+    ]
+    assert (grams["shortage"], grams["short_on"], grams["below_minimum_on"]) == (1000, "2026-03-04", "2026-03-04")
+    assert [(d["date"], d["required"]) for d in kilograms["days"]] == [("2026-03-02", 2), ("2026-03-04", 6)]
+    assert (kilograms["required"], kilograms["projected"]) == (8, 2)
+    assert (kilograms["short_on"], kilograms["below_minimum_on"]) == (None, "2026-03-04")
+
+
+def test_nothing_open_in_the_horizon(db_app):
+    assert material_requirements(date(2026, 3, 2), date(2026, 3, 4)) == []
+
+
+def test_route(db_app, plan):
+    db_app.register_blueprint(planning_bp, url_prefix="/api")
+    client = db_app.test_client()
+
+    body = client.get("/api/planning/mrp?from=2026-03-02&days=2&shortages_only=true").get_json()
+
+    assert (body["from"], body["to"], body["shortages"], body["below_minimum"]) == ("2026-03-02", "2026-03-03", 0, 0)
+    assert body["materials"] == []
+    assert client.get("/api/planning/mrp?from=03/02").status_code == 400
@@ -0,0 +1,88 @@
+from datetime import datetime
+import pytest
+
+from sqlalchemy import event
+from extensions import db
+from models.production import Batch, BatchMaterialDispensing
+from models.recipe import DosedRecipeMaterial
+from routes.production_routes import production_bp
+
+
+@pytest.fixture
+def client(api):
+    return api(production_bp)
+
+
+def add_batches(order, count):
+    operator_id = order.created_by
+    material_id = order.materials[0].material_id
+    for number in range(count):
+        batch = Batch(
+            batch_number=f"{order.order_number}-B{number}", order_id=order.order_id,
+            status="Released", operator_id=operator_id, start_time=datetime(2026, 3, 2, 8),
+        )
+        batch.batch_material_dispensings = [
+            BatchMaterialDispensing(
+                material_id=material_id, planned_quantity=1.5, actual_quantity=1.49,
+                dispensed_by=operator_id, status="dispensed",
+            )
+        ]
+        db.session.add(batch)
+    db.session.commit()
+
+
+def statements_for(client, url):
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    return response, len(statements)
+
+
+def test_full_tree_in_one_response(client, seed):
+    order = seed.order(seed.recipe([1.0, 2.0]))
+    add_batches(order, 2)
+    first = order.materials[0]
+    first.status = "Dosed"
+    db.session.add(DosedRecipeMaterial(
+        recipe_id=order.recipe_id, material_id=first.material_id, order_material_id=first.id,
+        set_point=1.0, actual=1.0, margin=5.0, batch_size=1,
+    ))
+    db.session.commit()
+
+    response = client.get(f"/api/production_orders/{order.order_id}/full")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["recipe_name"], body["recipe_code"], body["created_by_username"]) == ("R-1", "R-1", "operator")
+    assert [(m["sequence"], m["status"]) for m in body["materials"]] == [(1, "Dosed"), (2, "pending")]
+    assert body["materials"][0]["material_name"] == "R-1-M1"
+    assert [b["batch_number"] for b in body["batches"]] == ["PO-1-B0", "PO-1-B1"]
+    assert body["batches"][0]["dispensing"][0]["planned_quantity"] == "1.50"
+    assert [(d["order_material_id"], d["actual"]) for d in body["dosed_materials"]] == [
+        (body["materials"][0]["order_material_id"], 1.0)
+    ]
+
+
+def test_query_count_does_not_grow_with_the_batches(client, seed):
+    recipe = seed.recipe([1.0, 2.0])
+    small, large = seed.order(recipe, number="PO-1"), seed.order(recipe, number="PO-2")
+    add_batches(small, 1)
+    add_batches(large, 6)
+
+    _, few = statements_for(client, f"/api/production_orders/{small.order_id}/full")
+    response, many = statements_for(client, f"/api/production_orders/{large.order_id}/full")
+
+    assert len(response.get_json()["batches"]) == 6
+    assert many == few
+
+
+def test_unknown_order_and_missing_token(db_app, client):
+    assert client.get("/api/production_orders/99/full").status_code == 404
+    assert db_app.test_client().get("/api/production_orders/99/full").status_code == 401
@@ -0,0 +1,86 @@
+from datetime import date
+import pytest
+
+from sqlalchemy import event
+from extensions import db
+from models.production import ProductionOrderMaterial
+from models.scale import Scale
+from routes.production_routes import production_bp
+
+
+@pytest.fixture
+def client(api):
+    return api(production_bp)
+
+
+@pytest.fixture
+def orders(seed):
+    db.session.add(Scale(scale_id=1, name="line-1", host="10.0.0.1"))
+    recipe = seed.recipe([1.0, 2.0])
+    orders = [
+        seed.order(recipe, number="PO-1", status="completed", scheduled_date=date(2026, 3, 1)),
+        seed.order(recipe, number="PO-2", status="verified", scheduled_date=date(2026, 3, 2), scale_id=1),
+        seed.order(recipe, number="PO-3", status="pending", scheduled_date=date(2026, 3, 3)),
+    ]
+    target = ProductionOrderMaterial.query.filter_by(order_id=orders[1].order_id, sequence=1).one()
+    target.status = "Dosed"
+    db.session.commit()
+    return orders
+
+
+def numbers(response):
+    body = response.get_json()
+    return [o["order_number"] for o in (body["orders"] if isinstance(body, dict) else body)]
+
+
+def test_lists_newest_first_with_progress(client, orders):
+    response = client.get("/api/production_orders")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [o["order_number"] for o in body] == ["PO-3", "PO-2", "PO-1"]
+    verified = body[1]
+    assert (verified["recipe_name"], verified["created_by_username"], verified["scale_id"]) == ("R-1", "operator", 1)
+    assert (verified["materials_total"], verified["materials_dosed"], verified["materials_pending"]) == (2, 1, 1)
+
+
+def test_filters(client, orders):
+    assert numbers(client.get("/api/production_orders?status=pending,completed")) == ["PO-3", "PO-1"]
+    assert numbers(client.get("/api/production_orders?scale_id=1")) == ["PO-2"]
+    assert numbers(client.get("/api/production_orders?scale_id=default")) == ["PO-3", "PO-1"]
+    assert numbers(client.get("/api/production_orders?from=2026-03-02&to=2026-03-02")) == ["PO-2"]
+    assert numbers(client.get(f"/api/production_orders?recipe_id={orders[0].recipe_id}&status=x")) == []
+    assert client.get("/api/production_orders?from=tomorrow").status_code == 400
+
+
+def test_pages(client, orders):
+    body = client.get("/api/production_orders?page=2&per_page=2").get_json()
+
+    assert [o["order_number"] for o in body["orders"]] == ["PO-1"]
+    assert (body["total"], body["page"], body["pages"], body["per_page"]) == (3, 2, 2, 2)
+
+
+def test_query_count_does_not_grow_with_the_orders(client, orders, seed):
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client.get("/api/production_orders")
+        few = len(statements)
+        recipe = seed.recipe([1.0], code="R-2")
+        for number in range(10):
+            seed.order(recipe, number=f"PO-X{number}")
+        statements.clear()
+        client.get("/api/production_orders")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(statements) == few
+
+
+def test_requires_a_token(db_app, client):
+    assert db_app.test_client().get("/api/production_orders").status_code == 401
@@ -0,0 +1,108 @@
+import importlib.util
+import os
+from datetime import datetime
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from extensions import db
+from helpers.dosing_controller import load_order_materials
+from models.production import ProductionOrder, ProductionOrderMaterial
+from models.recipe import DosedRecipeMaterial, RecipeMaterial
+
+VERSIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations", "versions")
+
+
+def test_targets_scale_with_the_batch_size(seed):
+    recipe = seed.recipe([0.5, 0.25], margin=3.0)
+    order = seed.order(recipe, batch_size=4)
+
+    targets = load_order_materials(order)
+
+    assert [(t.sequence, t.set_point, t.margin) for t in targets] == [(1, 2.0, 3.0), (2, 1.0, 3.0)]
+    rows = ProductionOrderMaterial.rows_for(order.order_id, 4, recipe.recipe_materials)
+    assert [(r["sequence"], r["set_point"], r["status"]) for r in rows] == [
+        (1, 2.0, "pending"),
+        (2, 1.0, "pending"),
+    ]
+
+
+def test_orders_without_targets_get_them_once(seed):
+    order = seed.order(seed.recipe([1.5]), batch_size=2)
+    ProductionOrderMaterial.query.delete()
+    db.session.commit()
+
+    first = load_order_materials(order)
+    again = load_order_materials(order)
+
+    assert [t.set_point for t in first] == [3.0]
+    assert [t.id for t in again] == [t.id for t in first]
+    assert ProductionOrderMaterial.query.count() == 1
+
+
+def test_dosing_leaves_the_recipe_untouched(dosing, seed):
+    recipe = seed.recipe([1.0, 1.0])
+    seed.order(recipe, number="PO-1", batch_size=2, status="completed")
+    order = seed.order(recipe, number="PO-2", batch_size=2)
+
+    assert dosing.make().evaluate(2.0, True)["success"]
+
+    assert [(rm.set_point, rm.actual, rm.status) for rm in RecipeMaterial.query] == [
+        (1.0, None, "pending"),
+        (1.0, None, "pending"),
+    ]
+    dosed = ProductionOrderMaterial.query.filter_by(status="Dosed").one()
+    assert (dosed.order_id, dosed.sequence, dosed.actual) == (order.order_id, 1, 2.0)
+
+
+def upgrade(revision):
+    spec = importlib.util.spec_from_file_location(revision, os.path.join(VERSIONS, f"{revision}_.py"))
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with db.engine.begin() as connection, Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+    db.session.expire_all()
+
+
+def legacy(order, *set_points):
+    """As created before per-order targets: no targets, the recipe scaled in place."""
+    ProductionOrderMaterial.query.filter_by(order_id=order.order_id).delete()
+    for rm, set_point in zip(RecipeMaterial.query.filter_by(recipe_id=order.recipe_id), set_points):
+        rm.set_point = set_point
+
+
+def test_migration_restores_recipes_scaled_by_legacy_orders(seed):
+    # R-1 is 1.0 + 0.5 kg per batch, scaled by PO-1 (x2) and PO-2 (x3)
+    recipe = seed.recipe([1.0, 0.5], code="R-1")
+    planned = seed.order(recipe, number="PO-1", status="planned", batch_size=2)
+    running = seed.order(recipe, number="PO-2", batch_size=3)
+    current = seed.order(recipe, number="PO-3", status="planned", batch_size=5)
+    legacy(planned)
+    legacy(running, 6.0, 3.0)
+    first = RecipeMaterial.query.filter_by(recipe_id=recipe.recipe_id).first()
+    first.status, first.actual = "Dosed", 3.0  # PO-2 is mid-round
+    # R-2's verified order was dosed through and divided back
+    done = seed.order(seed.recipe([2.0], code="R-2"), number="PO-4", batch_size=2)
+    legacy(done)
+    db.session.add(DosedRecipeMaterial(
+        recipe_id=done.recipe_id, material_id=done.recipe.recipe_materials[0].material_id,
+        set_point=4.0, actual=4.0, margin=0.0, batch_size=2, dosed_at=datetime(2099, 1, 1),
+    ))
+    db.session.commit()
+
+    upgrade("f3d8a61b2c57")
+
+    assert [(rm.set_point, rm.status, rm.actual) for rm in RecipeMaterial.query.filter_by(recipe_id=recipe.recipe_id)] == [
+        (1.0, "pending", None),
+        (0.5, "pending", None),
+    ]
+
+    def targets(order):
+        rows = ProductionOrderMaterial.query.filter_by(order_id=order.order_id).order_by(ProductionOrderMaterial.sequence)
+        return [(t.set_point, t.status, t.actual) for t in rows]
+
+    assert targets(planned) == [(2.0, "pending", None), (1.0, "pending", None)]
+    assert targets(running) == [(3.0, "Dosed", 3.0), (1.5, "pending", None)]
+    assert targets(current) == [(5.0, "pending", None), (2.5, "pending", None)]  # untouched
+    assert db.session.get(ProductionOrder, done.order_id).status == "completed"
+    assert targets(done) == []
+    assert RecipeMaterial.query.filter_by(recipe_id=done.recipe_id).one().set_point == 2.0
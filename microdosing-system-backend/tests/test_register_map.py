@@ -0,0 +1,130 @@
+import pytest
+from utils.register_map import (
+    REGISTER_MAPS,
+    check_register_map,
+    decode_registers,
+    encode_registers,
+    read_register_map,
+    register_span,
+)
+
+# A value per field type that survives the encoding exactly
+SAMPLES = {
+    "uint16": 40000,
+    "int16": -1234,
+    "bool": True,
+    "uint32": 3000000000,
+    "int32": -2000000000,
+    "float32": 12.375,
+}
+
+
+def sample_values(register_map):
+    derived = register_map.get("derived", ())
+    return {name: SAMPLES[spec["type"]] for name, spec in register_map["fields"].items() if name not in derived}
+
+
+@pytest.mark.parametrize("name", sorted(REGISTER_MAPS))
+@pytest.mark.parametrize("word_order", ["big", "little"])
+def test_round_trip(name, word_order):
+    register_map = dict(REGISTER_MAPS[name], word_order=word_order)
+    values = sample_values(register_map)
+    start, count = register_span(register_map)
+    encoded = encode_registers(register_map, values)
+    registers = [encoded.get(address, 0) for address in range(start, start + count)]
+
+    assert decode_registers(register_map, registers, start, list(values)) == values
+
+
+@pytest.mark.parametrize("name", sorted(REGISTER_MAPS))
+def test_only_derived_fields_overlap(name):
+    check_register_map(REGISTER_MAPS[name])
+
+
+def test_float_status_is_the_indicator_layout():
+    register_map = REGISTER_MAPS["float_status"]
+    fields = register_map["fields"]
+    assert fields["net_weight"]["address"] == fields["tare_weight"]["address"] == 2
+    assert [fields[name]["address"] for name in ("overrange", "underrange", "motion", "negative")] == [3, 4, 5, 6]
+    with pytest.raises(ValueError):
+        check_register_map(dict(register_map, derived=[]))
+
+
+def test_derived_fields_read_their_owners_registers():
+    register_map = REGISTER_MAPS["float_status"]
+    # 25.0 and 0.5 are 0x41C80000 and 0x3F000000: net's second word is zero
+    values = {"gross_weight": 25.5, "tare_weight": 0.5, "net_weight": 25.0, "motion": True, "overrange": True}
+    encoded = encode_registers(register_map, values)
+    start, count = register_span(register_map)
+    registers = [encoded.get(address, 0) for address in range(start, start + count)]
+
+    decoded = decode_registers(register_map, registers, start)
+    assert decoded["gross_weight"] == 25.5
+    assert decoded["net_weight"] == decoded["tare_weight"] == 25.0
+    assert decoded["overrange"] is False
+    assert decoded["motion"] is True
+
+
+def test_span_of_selected_fields():
+    assert register_span(REGISTER_MAPS["float_status"], ["net_weight"]) == (2, 2)
+    assert register_span(REGISTER_MAPS["weight_error"]) == (0, 2)
+
+
+def test_overlapping_fields_are_rejected():
+    register_map = {
+        "word_order": "big",
+        "fields": {
+            "tare_weight": {"address": 2, "type": "float32"},
+            "net_weight": {"address": 3, "type": "float32"},
+        },
+    }
+    with pytest.raises(ValueError):
+        encode_registers(register_map, {"tare_weight": 1.0, "net_weight": 2.0})
+
+
+class FakeResult:
+    def __init__(self, registers, error=False):
+        self.registers = registers
+        self.error = error
+
+    def isError(self):
+        return self.error
+
+
+class FakeClient:
+    """Holding registers served from a dict, recording every request."""
+
+    def __init__(self, registers, error=False):
+        self.registers = registers
+        self.error = error
+        self.requests = []
+
+    def read_holding_registers(self, address, count, slave):
+        self.requests.append((address, count, slave))
+        block = [self.registers.get(a, 0) for a in range(address, address + count)]
+        return FakeResult(block, self.error)
+
+
+def test_snapshot_is_one_block_read():
+    register_map = REGISTER_MAPS["float_status"]
+    values = {"gross_weight": 10.5, "tare_weight": 0.5, "net_weight": 10.0, "negative": True}
+    client = FakeClient(encode_registers(register_map, values))
+
+    decoded = read_register_map(client, 7, register_map)
+
+    assert client.requests == [(0, 7, 7)]
+    assert decoded["net_weight"] == 10.0
+    assert decoded["negative"] is True
+
+
+def test_selected_fields_read_only_their_span():
+    register_map = REGISTER_MAPS["float_status"]
+    client = FakeClient(encode_registers(register_map, {"net_weight": 2.25}))
+
+    assert read_register_map(client, 1, register_map, ["net_weight"]) == {"net_weight": 2.25}
+    assert client.requests == [(2, 2, 1)]
+
+
+def test_error_response_raises():
+    with pytest.raises(Exception):
+        read_register_map(FakeClient({}, error=True), 1, REGISTER_MAPS["weight_error"])
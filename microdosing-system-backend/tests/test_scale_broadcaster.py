@@ -0,0 +1,94 @@
+import pytest
+
+from helpers import scale_broadcaster
+from helpers.scale_broadcaster import ScaleBroadcaster, SocketRelay, Subscription
+
+
+@pytest.fixture
+def socketio(monkeypatch, fake_socketio):
+    monkeypatch.setattr(scale_broadcaster, "socketio", fake_socketio)
+    return fake_socketio
+
+
+def test_full_subscription_drops_the_oldest_reading():
+    subscription = Subscription(maxsize=2)
+    for weight in (1, 2, 3):
+        subscription.put({"weight_kg": weight})
+
+    assert subscription.dropped == 1
+    assert subscription.get()["weight_kg"] == 2
+    assert subscription.get()["weight_kg"] == 3
+    assert subscription.get(timeout=0.01) is None
+
+
+def test_poller_starts_once_and_stops_without_subscribers(socketio):
+    broadcaster = ScaleBroadcaster("scale", lambda: {"weight_kg": 1.0})
+    subscriptions = [broadcaster.subscribe(), broadcaster.subscribe()]
+    assert len(socketio.tasks) == 1
+
+    for subscription in subscriptions:
+        broadcaster.unsubscribe(subscription)
+    poll, args, kwargs = socketio.tasks[0]
+    poll()  # returns right away: nobody is subscribed
+    assert not broadcaster.get_stats()["running"]
+
+
+def test_publish_fans_out_and_replays_the_latest(socketio):
+    broadcaster = ScaleBroadcaster("scale", None)
+    first = broadcaster.subscribe()
+    broadcaster.publish({"weight_kg": 2.5})
+    assert first.get(timeout=0.01) == {"weight_kg": 2.5}
+
+    late = broadcaster.subscribe()
+    assert late.get(timeout=0.01) == {"weight_kg": 2.5}
+    assert socketio.tasks == []  # fed through publish(), no poller of its own
+
+
+def test_capture_keeps_regular_subscribers_at_the_normal_rate(socketio, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(scale_broadcaster.time, "monotonic", lambda: now[0])
+    broadcaster = ScaleBroadcaster("scale", None, interval=1.0)
+    regular = broadcaster.subscribe()
+    capture = broadcaster.subscribe(capture=True)
+    broadcaster.set_capture(0.1)
+    assert broadcaster.next_interval() == 0.1
+
+    for _ in range(10):
+        broadcaster.publish({"weight_kg": now[0]})
+        now[0] += 0.1
+
+    captured = []
+    while (item := capture.get(timeout=0.01)) is not None:
+        captured.append(item)
+    regular_readings = []
+    while (item := regular.get(timeout=0.01)) is not None:
+        regular_readings.append(item)
+
+    assert len(captured) == 10
+    assert captured[0] == (100.0, {"weight_kg": 100.0})
+    assert len(regular_readings) == 1
+
+    broadcaster.set_capture(None)
+    assert broadcaster.next_interval() == 1.0
+
+
+def test_socket_relay_subscribes_only_while_it_has_clients(socketio):
+    broadcaster = ScaleBroadcaster("scale", None)
+    relay = SocketRelay(broadcaster, event="weight", room="weight")
+
+    relay.join("sid-1")
+    relay.join("sid-2")
+    assert broadcaster.get_stats()["subscribers"] == 1
+    assert len(socketio.tasks) == 1
+
+    relay.leave("sid-1")
+    assert broadcaster.get_stats()["subscribers"] == 1
+
+    relay.leave("sid-2")
+    assert broadcaster.get_stats()["subscribers"] == 0
+    assert relay.get_stats() == {"clients": 0, "subscribed": False}
+
+    relay.leave("sid-2")  # disconnect after unsubscribe_weight
+    relay.join("sid-3")
+    assert broadcaster.get_stats()["subscribers"] == 1
+    assert len(socketio.tasks) == 2
@@ -0,0 +1,91 @@
+import asyncio
+
+from helpers import scale_poller
+from helpers.scale_poller import ScalePollingEngine
+from utils.register_map import REGISTER_MAPS, encode_registers
+
+CONFIG = {
+    "scale_id": 901,
+    "name": "bench",
+    "host": "10.0.0.91",
+    "port": 502,
+    "unit_id": 1,
+    "register_map": "weight_error",
+    "scaling_factor": 0.1,
+    "poll_interval": 0.01,
+}
+
+
+class FakeResult:
+    def __init__(self, registers):
+        self.registers = registers
+
+    def isError(self):
+        return False
+
+
+class FakeAsyncClient:
+    def __init__(self, host, port=502, timeout=3):
+        self.connected = False
+
+    async def connect(self):
+        self.connected = True
+
+    async def read_holding_registers(self, address, count, slave):
+        encoded = encode_registers(REGISTER_MAPS["weight_error"], {"weight": 123, "error_code": 0})
+        return FakeResult([encoded[a] for a in range(address, address + count)])
+
+    def close(self):
+        self.connected = False
+
+
+def drain(engine):
+    items = []
+    while not engine._readings.empty():
+        items.append(engine._readings.get_nowait())
+    return items
+
+
+def test_readings_are_queued_for_the_hub(monkeypatch):
+    monkeypatch.setattr(scale_poller, "AsyncModbusTcpClient", FakeAsyncClient)
+    engine = ScalePollingEngine()
+
+    async def run():
+        engine._loop = asyncio.get_running_loop()
+        engine._apply_configs([CONFIG])
+        await asyncio.sleep(0.05)
+        engine._apply_configs([])
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    items = drain(engine)
+    assert items
+    service, broadcaster, reading = items[0]
+    assert reading["scale_id"] == 901
+    assert reading["weight_kg"] == 12.3
+    assert broadcaster.name == "scale-901"
+    assert engine.get_config(901) is None  # removed configs are stopped
+
+
+def test_changed_config_restarts_its_task(monkeypatch):
+    monkeypatch.setattr(scale_poller, "AsyncModbusTcpClient", FakeAsyncClient)
+    engine = ScalePollingEngine()
+    tasks = []
+
+    async def run():
+        engine._loop = asyncio.get_running_loop()
+        engine._apply_configs([CONFIG])
+        tasks.append(engine._tasks[901])
+        engine._apply_configs([CONFIG])
+        tasks.append(engine._tasks[901])
+        engine._apply_configs([dict(CONFIG, poll_interval=0.02)])
+        tasks.append(engine._tasks[901])
+        engine._apply_configs([])
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert tasks[0] is tasks[1]
+    assert tasks[1] is not tasks[2]
+    assert tasks[0].cancelled()
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+
+from sqlalchemy.dialects import mysql
+from helpers import scale_rollup, upsert
+from helpers.scale_rollup import (
+    aggregate_rows,
+    apply_rollups,
+    choose_resolution,
+    parse_range,
+)
+from models.scale_data import ScaleDataHour, ScaleDataMinute
+
+T0 = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def row(seconds, weight, error_code=0):
+    return {"timestamp": T0 + timedelta(seconds=seconds), "weight": weight, "error_code": error_code}
+
+
+def test_rows_aggregate_per_bucket():
+    rows = [row(5, 10), row(50, 14), row(20, 12, error_code=4), row(65, 3)]
+
+    minutes = {a["bucket"]: a for a in aggregate_rows(rows, 60)}
+    first = minutes[T0]
+    assert first["count"] == 3
+    assert first["sum_weight"] == 36
+    assert (first["min_weight"], first["max_weight"]) == (10, 14)
+    assert first["last_weight"] == 14  # latest timestamp, not the last row
+    assert first["error_count"] == 1
+    assert minutes[T0 + timedelta(minutes=1)]["count"] == 1
+
+    hours = aggregate_rows(rows, 3600)
+    assert len(hours) == 1 and hours[0]["count"] == 4
+
+
+def test_resolution_fits_the_point_budget():
+    hour = timedelta(hours=1)
+    assert choose_resolution(T0, T0 + hour, 5000, 1.0) == "raw"
+    assert choose_resolution(T0, T0 + hour, 500, 1.0) == "minute"
+    assert choose_resolution(T0, T0 + 30 * hour, 500, 1.0) == "hour"
+
+
+def test_parse_range():
+    start, end = parse_range("2026-03-01T08:00:00", "2026-03-01T09:00:00")
+    assert (start, end) == (T0, T0 + timedelta(hours=1))
+
+    start, end = parse_range(None, "2026-03-01T09:00:00")
+    assert end - start == timedelta(hours=1)
+
+
+@pytest.mark.parametrize(
+    "from_arg, to_arg, message",
+    [
+        ("yesterday", None, "'from' must be an ISO datetime"),
+        (None, "2026-13-01", "'to' must be an ISO datetime"),
+        ("2026-03-01T09:00:00", "2026-03-01T08:00:00", "'from' must be before 'to'"),
+    ],
+)
+def test_invalid_range(from_arg, to_arg, message):
+    with pytest.raises(ValueError, match=message):
+        parse_range(from_arg, to_arg)
+
+
+@pytest.mark.usefixtures("db_app")
+def test_rollups_merge_into_existing_buckets():
+    apply_rollups([row(5, 10), row(50, 14, error_code=4)])
+    apply_rollups([row(20, 12), row(30, 8), row(65, 3)])
+    # a late row older than the bucket's last one
+    apply_rollups([row(10, 20)])
+
+    minutes = {m.bucket: m for m in ScaleDataMinute.query.all()}
+    first = minutes[T0]
+    assert (first.count, first.sum_weight, first.error_count) == (5, 64, 1)
+    assert (first.min_weight, first.max_weight) == (8, 20)
+    assert (first.last_weight, first.last_timestamp) == (14, T0 + timedelta(seconds=50))
+    assert minutes[T0 + timedelta(minutes=1)].count == 1
+
+    hour = ScaleDataHour.query.one()
+    assert (hour.count, hour.last_weight) == (6, 3)
+
+
+def test_rollups_compile_to_one_mysql_upsert_per_table(monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        scale_rollup, "db", SimpleNamespace(session=SimpleNamespace(execute=statements.append))
+    )
+    monkeypatch.setattr(
+        upsert, "db", SimpleNamespace(engine=SimpleNamespace(dialect=mysql.dialect()))
+    )
+
+    apply_rollups([row(5, 10), row(65, 3)])
+
+    assert len(statements) == 2
+    for stmt in statements:
+        sql = str(stmt.compile(dialect=mysql.dialect()))
+        assert "ON DUPLICATE KEY UPDATE" in sql
+        # last_weight is assigned before last_timestamp moves
+        assert sql.index("last_weight = CASE") < sql.index("last_timestamp = CASE")
@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+
+from helpers import scale_service as service_module
+from helpers.scale_service import ScaleReadingService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [50.0]
+    monkeypatch.setattr(service_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_readings_are_cached_for_the_ttl(clock):
+    reads = []
+    service = ScaleReadingService(lambda: reads.append(1) or {"weight_kg": len(reads)}, ttl=0.5)
+
+    assert service.get_reading()["weight_kg"] == 1
+    clock[0] += 0.4
+    assert service.get_reading()["weight_kg"] == 1
+    clock[0] += 0.2
+    assert service.get_reading()["weight_kg"] == 2
+    assert (service.hits, service.misses) == (1, 2)
+
+
+def test_concurrent_misses_share_one_read():
+    started = threading.Event()
+    release = threading.Event()
+    reads = []
+
+    def read():
+        reads.append(1)
+        started.set()
+        release.wait(1)
+        return {"weight_kg": 4.2}
+
+    service = ScaleReadingService(read, ttl=10)
+    results = []
+    leader = threading.Thread(target=lambda: results.append(service.get_reading()))
+    leader.start()
+    started.wait(1)
+    followers = [
+        threading.Thread(target=lambda: results.append(service.get_reading(max_age=0)))
+        for _ in range(4)
+    ]
+    for thread in followers:
+        thread.start()
+    while service.misses < 5:  # every follower is waiting on the leader's read
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(1)
+
+    assert len(reads) == 1
+    assert [r["weight_kg"] for r in results] == [4.2] * 5
+
+
+def test_failed_read_serves_the_last_good_reading_as_stale(clock):
+    readings = iter([{"weight_kg": 3.0}, {"error": "circuit open"}])
+    service = ScaleReadingService(lambda: next(readings), ttl=0)
+
+    assert service.get_reading() == {"weight_kg": 3.0, "stale": False}
+    clock[0] += 2
+    reading = service.get_reading()
+    assert reading["weight_kg"] == 3.0
+    assert reading["error"] == "circuit open"
+    assert reading["stale"] and reading["unavailable"]
+    assert reading["stale_ms"] == 2000.0
+
+
+def test_error_without_history_is_unavailable():
+    service = ScaleReadingService(lambda: {"error": "refused"}, ttl=0)
+    assert service.get_reading() == {"error": "refused", "stale": True, "unavailable": True}
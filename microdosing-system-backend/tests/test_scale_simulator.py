@@ -0,0 +1,67 @@
+import pytest
+
+from simulator import scale_simulator
+from simulator.scale_simulator import SimulatedScale
+from utils.register_map import (
+    decode_registers,
+    encode_registers,
+    get_register_map,
+    register_span,
+)
+
+FILL = [
+    {"duration": 2, "weight": 0},
+    {"duration": 10, "ramp_from": 0, "ramp_to": 25},
+    {"duration": 3, "weight": 25},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(scale_simulator.time, "monotonic", lambda: now[0])
+    return now
+
+
+def served(register_map_name, scale, scaling_factor):
+    """Registers as the simulator serves them, decoded like a client would."""
+    register_map = get_register_map(register_map_name)
+    start, count = register_span(register_map)
+    encoded = encode_registers(register_map, scale.values(scaling_factor))
+    block = [encoded.get(address, 0) for address in range(start, start + count)]
+    return decode_registers(register_map, block, start)
+
+
+def test_script_plays_hold_ramp_hold(clock):
+    scale = SimulatedScale(FILL)
+    clock[0] = 1
+    assert scale.advance() == 0
+    clock[0] = 7
+    assert scale.advance() == 12.5
+    assert scale.motion
+    clock[0] = 13
+    assert scale.advance() == 25
+    assert not scale.motion
+    clock[0] = 16  # the script loops
+    assert scale.advance() == 0
+
+
+def test_float_status_serves_the_indicator_layout(clock):
+    scale = SimulatedScale(FILL)
+    clock[0] = 7
+
+    values = served("float_status", scale, 1.0)
+
+    assert values["gross_weight"] == 12.5
+    assert values["net_weight"] == 12.5
+    assert values["tare_weight"] == 12.5  # net's registers, as on the device
+    assert values["motion"] is True
+    assert values["overrange"] is False
+
+
+def test_weight_error_serves_raw_counts(clock):
+    scale = SimulatedScale([{"duration": 1, "weight": 2.5}, {"duration": 1, "error_code": 4}])
+    clock[0] = 0.5
+    assert served("weight_error", scale, 0.1) == {"weight": 25, "error_code": 0}
+    clock[0] = 1.5
+    assert served("weight_error", scale, 0.1)["error_code"] == 4
@@ -0,0 +1,85 @@
+import contextlib
+from types import SimpleNamespace
+import pytest
+
+from helpers import scale_helper
+from helpers.scale_helper import ScaleDataWriter
+
+
+class FakeApp:
+    config = {}
+
+    @contextlib.contextmanager
+    def app_context(self):
+        yield
+
+
+class FakeSession:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, stmt, rows):
+        if self.fail:
+            raise RuntimeError("database is down")
+        self.batches.append(rows)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(scale_helper, "db", SimpleNamespace(session=session))
+    monkeypatch.setattr(scale_helper, "apply_rollups", lambda rows: None)
+    return session
+
+
+def make_writer(**kwargs):
+    writer = ScaleDataWriter(**kwargs)
+    writer.app = FakeApp()
+    writer._thread = object()  # flushed by the test, not a background thread
+    return writer
+
+
+def test_full_buffer_drops_the_oldest_rows():
+    writer = make_writer(max_buffer=3)
+    for weight in range(5):
+        writer.add(weight, 0, "OK")
+
+    assert [row["weight"] for row in writer._buffer] == [2, 3, 4]
+    assert writer.get_stats()["dropped"] == 2
+
+
+def test_flush_writes_in_batches_with_one_commit_each(session):
+    writer = make_writer(batch_size=2)
+    for weight in range(5):
+        writer.add(weight, 0, "OK")
+
+    assert writer.flush()
+    assert [len(rows) for rows in session.batches] == [2, 2, 1]
+    assert session.commits == 3
+    assert writer.get_stats() == {"buffered": 0, "written": 5, "dropped": 0, "failed_flushes": 0}
+
+
+def test_failed_flush_puts_rows_back_in_order(session):
+    writer = make_writer(batch_size=10)
+    for weight in range(3):
+        writer.add(weight, 0, "OK")
+
+    session.fail = True
+    assert not writer.flush()
+    assert session.rollbacks == 1
+    assert [row["weight"] for row in writer._buffer] == [0, 1, 2]
+
+    session.fail = False
+    writer.add(3, 0, "OK")
+    assert writer.flush()
+    assert [row["weight"] for row in session.batches[0]] == [0, 1, 2, 3]
+    assert writer.get_stats()["failed_flushes"] == 1
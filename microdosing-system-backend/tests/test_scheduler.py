@@ -0,0 +1,146 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+
+from extensions import db
+from helpers import scheduler
+from helpers.scheduler import _fit, _Plan, get_schedule, replan
+from models.production import ProductionOrder
+from models.schedule import ProductionSchedule
+from routes.planning_routes import planning_bp
+
+DAY = date(2026, 3, 2)
+NOW = datetime(2026, 3, 2, 8, 0)
+
+
+@pytest.fixture(autouse=True)
+def shift(monkeypatch):
+    monkeypatch.setattr(scheduler, "SHIFT_START", time(6, 0))
+    monkeypatch.setattr(scheduler, "SHIFT_END", time(22, 0))
+
+
+def at(hours, minutes=0, day=DAY):
+    return datetime.combine(day, time(hours, minutes))
+
+
+def test_fit_keeps_slots_inside_a_shift():
+    assert _fit(at(5), 600) == at(6)
+    assert _fit(at(9, 30), 600) == at(9, 30)
+    assert _fit(at(22), 600) == at(6, day=DAY + timedelta(days=1))
+    assert _fit(at(21, 55), 600) == at(6, day=DAY + timedelta(days=1))  # would overrun
+    assert _fit(at(6), 20 * 3600) == at(6)  # longer than a shift: starts at its opening
+
+
+def order(order_id, status="planned", scale_id=None, recipe_id=2, materials=1, scheduled_date=DAY):
+    return {
+        "order_id": order_id,
+        "order_number": f"PO-{order_id}",
+        "recipe_id": recipe_id,
+        "status": status,
+        "scale_id": scale_id,
+        "scheduled_date": scheduled_date,
+        "created_at": NOW - timedelta(days=1) + timedelta(minutes=order_id),
+        "materials": materials,
+    }
+
+
+@pytest.fixture
+def plan(db_app):
+    orders = {
+        1: order(1, status="verified", recipe_id=1, materials=2),  # 2 x 60 s, running
+        2: order(2, materials=3),  # 3 x 120 s
+        3: order(3),
+        4: order(4, scale_id=1),
+    }
+    plan = _Plan(orders, [None, 1], ({1: 60.0}, 120.0), NOW)
+    for order_id in (1, 2, 3, 4):
+        plan.place(orders[order_id])
+    return plan
+
+
+def slots(plan, station):
+    return [(row.order_id, row.planned_start.strftime("%H:%M"), row.planned_end.strftime("%H:%M")) for row in plan.queues[station]]
+
+
+def test_orders_go_where_they_finish_first(plan):
+    assert slots(plan, None) == [(1, "08:00", "08:02"), (3, "08:02", "08:04")]
+    assert slots(plan, 1) == [(2, "08:00", "08:06"), (4, "08:06", "08:08")]
+    assert [row.position for row in plan.queues[1]] == [0, 1]
+
+
+def test_recompute_stops_at_the_first_unchanged_slot(plan):
+    plan.touched.clear()
+    plan.recompute(None, 0)
+    assert plan.touched == set()
+
+    plan.orders[1]["materials"] = 4
+    plan.recompute(None, 0)
+    assert plan.touched == {1, 3}
+    assert slots(plan, None) == [(1, "08:00", "08:04"), (3, "08:04", "08:06")]
+
+
+def test_later_orders_wait_for_their_day_and_shift(db_app):
+    orders = {1: order(1, scheduled_date=DAY + timedelta(days=3)), 2: order(2, materials=3)}
+    plan = _Plan(orders, [None], ({}, 120.0), at(21, 56))
+    plan.place(orders[1])
+    plan.place(orders[2])
+
+    assert [(row.order_id, row.planned_start) for row in plan.queues[None]] == [
+        (2, at(6, day=DAY + timedelta(days=1))),  # 6 minutes do not fit before 22:00
+        (1, at(6, day=DAY + timedelta(days=3))),
+    ]
+
+
+@pytest.fixture
+def replanning(db_app, fake_socketio, monkeypatch):
+    monkeypatch.setattr(scheduler, "socketio", fake_socketio)
+    monkeypatch.setattr(scheduler, "recipe_rates", lambda: ({}, 120.0))
+    return fake_socketio
+
+
+def test_replan_is_incremental(replanning, seed):
+    recipe = seed.recipe([1.0, 1.0])
+    first = seed.order(recipe, number="PO-1", status="planned")
+    second = seed.order(recipe, number="PO-2", status="planned")
+
+    assert replan() == {"removed": 0, "added": 2, "retimed": 2}
+    assert replan() == {"removed": 0, "added": 0, "retimed": 0}
+    assert len(replanning.events("schedule_updated")) == 1
+
+    db.session.get(ProductionOrder, first.order_id).status = "completed"
+    db.session.commit()
+    summary = replan([first.order_id])
+
+    assert summary["removed"] == 1 and summary["added"] == 0
+    rows = ProductionSchedule.query.all()
+    assert [(row.order_id, row.position) for row in rows] == [(second.order_id, 0)]
+
+
+def test_get_schedule_reads_without_replanning(replanning, seed):
+    recipe = seed.recipe([1.0])
+    seed.order(recipe, number="PO-1", status="planned")
+    assert get_schedule() == []
+
+    replan()
+    stations = get_schedule(horizon_hours=1)
+
+    assert [(s["scale_id"], s["name"], len(s["queue"])) for s in stations] == [(None, "default", 1)]
+    assert ProductionSchedule.query.count() == 1
+
+
+def test_schedule_route_only_reads_open_orders(db_app, replanning, seed):
+    db_app.register_blueprint(planning_bp, url_prefix="/api")
+    client = db_app.test_client()
+    recipe = seed.recipe([1.0])
+    first = seed.order(recipe, number="PO-1", status="planned")
+    second = seed.order(recipe, number="PO-2", status="planned")
+
+    assert client.get("/api/planning/schedule").get_json()["stations"] == []
+    assert ProductionSchedule.query.count() == 0
+
+    replan()
+    db.session.get(ProductionOrder, first.order_id).status = "completed"
+    db.session.commit()
+    stations = client.get("/api/planning/schedule").get_json()["stations"]
+
+    assert [slot["order_id"] for slot in stations[0]["queue"]] == [second.order_id]
+    assert len(replanning.events("schedule_updated")) == 1
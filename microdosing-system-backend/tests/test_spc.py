@@ -0,0 +1,142 @@
+import statistics
+import pytest
+
+from extensions import db
+from helpers import spc
+from helpers.spc import control_chart, control_limits, record_dose
+from models.dose_statistics import DoseStatistic, DoseSubgroup
+from models.recipe import DosedRecipeMaterial
+from routes import spc_routes
+from routes.spc_routes import spc_bp
+
+pytestmark = pytest.mark.usefixtures("db_app")
+
+
+def fresh(scope="material", ref_id=1):
+    return DoseStatistic(
+        scope=scope, ref_id=ref_id, count=0, mean=0.0, m2=0.0,
+        subgroup_count=0, subgroup_sum=0.0, subgroups=0, xbar_sum=0.0, range_sum=0.0,
+    )
+
+
+def test_observe_matches_the_batch_statistics():
+    deviations = [1.5, -0.5, 2.0, 0.25, -1.0, 3.0, 0.0]
+    stat = fresh()
+    for d in deviations:
+        stat.observe(d, subgroup_size=100)
+
+    assert stat.count == len(deviations)
+    assert stat.mean == pytest.approx(statistics.mean(deviations))
+    assert stat.variance == pytest.approx(statistics.variance(deviations))
+    assert (stat.min_deviation, stat.max_deviation) == (-1.0, 3.0)
+
+
+def test_ewma_starts_at_the_first_deviation():
+    stat = fresh()
+    stat.observe(10.0, alpha=0.5)
+    assert stat.ewma == 10.0
+    stat.observe(0.0, alpha=0.5)
+    assert stat.ewma == 5.0
+
+
+def test_subgroup_closes_every_n_doses():
+    stat = fresh()
+    assert [stat.observe(d, subgroup_size=3) for d in (1.0, 4.0)] == [None, None]
+
+    assert stat.observe(2.5, subgroup_size=3) == (2.5, 3.0)
+    assert stat.subgroups == 1
+    assert (stat.xbar_sum, stat.range_sum) == (2.5, 3.0)
+    assert stat.subgroup_count == 0 and stat.subgroup_min is None
+
+    assert stat.observe(7.0, subgroup_size=3) is None
+    assert stat.subgroup_min == stat.subgroup_max == 7.0
+
+
+def test_control_limits_use_the_subgroup_constants():
+    stat = fresh()
+    assert control_limits(stat, 5) is None
+
+    stat.subgroups, stat.xbar_sum, stat.range_sum = 2, 2.0, 4.0
+    limits = control_limits(stat, 5)
+    a2, d3, d4 = spc.CONTROL_CONSTANTS[5]
+    assert limits["xbar"] == {"cl": 1.0, "ucl": round(1 + a2 * 2, 3), "lcl": round(1 - a2 * 2, 3)}
+    assert limits["range"] == {"cl": 2.0, "ucl": round(d4 * 2, 3), "lcl": round(d3 * 2, 3)}
+
+
+def test_record_dose_folds_into_material_and_recipe(monkeypatch):
+    monkeypatch.setattr(spc.Config, "SPC_SUBGROUP_SIZE", 2)
+    db.session.add_all([fresh("material", 7), fresh("recipe", 3)])
+    db.session.commit()
+
+    record_dose(7, 3, 1.0)
+    record_dose(7, 3, 3.0)
+    record_dose(7, None, 5.0)
+    db.session.commit()
+
+    material = db.session.get(DoseStatistic, ("material", 7))
+    recipe = db.session.get(DoseStatistic, ("recipe", 3))
+    assert (material.count, recipe.count) == (3, 2)
+    assert material.mean == pytest.approx(3.0)
+
+    subgroups = DoseSubgroup.query.order_by(DoseSubgroup.id).all()
+    assert [(s.scope, s.ref_id, s.mean, s.range) for s in subgroups] == [
+        ("material", 7, 2.0, 2.0),
+        ("recipe", 3, 2.0, 2.0),
+    ]
+
+
+def test_first_dose_seeds_the_statistic_from_history(seed):
+    recipe = seed.recipe([1.0])
+    material_id = recipe.recipe_materials[0].material_id
+    history = [0.5, -1.5, 2.0]
+    db.session.add_all(
+        DosedRecipeMaterial(
+            recipe_id=recipe.recipe_id, material_id=material_id, set_point=1.0,
+            actual=1.0 + d / 1000, batch_size=1,
+        )
+        for d in history
+    )
+    db.session.commit()
+
+    record_dose(material_id, recipe.recipe_id, 3.0)
+    record_dose(material_id, recipe.recipe_id, 1.0)  # the row exists now
+    db.session.commit()
+
+    deviations = history + [3.0, 1.0]
+    for scope, ref_id in (("material", material_id), ("recipe", recipe.recipe_id)):
+        stat = db.session.get(DoseStatistic, (scope, ref_id))
+        assert stat.count == len(deviations)
+        assert stat.mean == pytest.approx(statistics.mean(deviations))
+        assert stat.variance == pytest.approx(statistics.variance(deviations))
+        assert (stat.min_deviation, stat.max_deviation) == (pytest.approx(-1.5), 3.0)
+
+
+def test_control_chart_flags_a_run_on_one_side(monkeypatch):
+    monkeypatch.setattr(spc.Config, "SPC_SUBGROUP_SIZE", 5)
+    stat = fresh()
+    means = [-1.0] * 4 + [1.0] * spc.RUN_LENGTH
+    stat.subgroups, stat.xbar_sum, stat.range_sum = len(means), sum(means), 10.0 * len(means)
+    db.session.add(stat)
+    db.session.add_all(
+        DoseSubgroup(scope="material", ref_id=1, size=5, mean=m, range=10.0) for m in means
+    )
+    db.session.commit()
+
+    points = control_chart("material", 1)["points"]
+    assert [p["out_of_control"] for p in points] == [False] * (len(means) - 1) + [True]
+    assert points[-1]["flags"] == ["run_one_side"]
+    assert control_chart("material", 2) is None
+
+
+def test_chart_limit_is_parsed_and_clamped(api, monkeypatch):
+    limits = []
+    monkeypatch.setattr(
+        spc_routes, "control_chart",
+        lambda scope, ref_id, limit: limits.append(limit) or {"points": []},
+    )
+    client = api(spc_bp)
+
+    for query in ("", "?limit=abc", "?limit=0", "?limit=-5", "?limit=20", "?limit=10000"):
+        assert client.get(f"/api/spc/control-chart/material/1{query}").status_code == 200
+
+    assert limits == [50, 50, 1, 1, 20, 500]
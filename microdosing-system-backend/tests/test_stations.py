@@ -0,0 +1,79 @@
+import pytest
+
+from extensions import db
+from models.production import ProductionOrder
+from models.scale import Scale
+from routes import production_routes, scale_routes
+from routes.production_routes import production_bp
+from routes.recipe_routes import recipe_bp, request_scale_id
+
+
+@pytest.fixture
+def scales(db_app):
+    db.session.add_all([Scale(scale_id=1, name="line-1", host="10.0.0.1"), Scale(scale_id=2, name="line-2", host="10.0.0.2")])
+    db.session.commit()
+
+
+@pytest.fixture
+def client(api, dosing, monkeypatch):
+    monkeypatch.setattr(production_routes, "replan_orders", lambda order_ids: None)
+    return api(production_bp, recipe_bp)
+
+
+def test_each_station_doses_its_own_order(dosing, scales, seed):
+    default_order = seed.order(seed.recipe([1.0], code="R-1"), number="PO-1")
+    line_order = seed.order(seed.recipe([2.0], code="R-2"), number="PO-2", scale_id=1)
+    default, line = dosing.make(), dosing.make(1)
+
+    assert default.evaluate(2.0, True)["data"]["order_id"] == default_order.order_id
+    assert line.evaluate(2.0, True)["data"]["order_id"] == line_order.order_id
+
+    rooms = [kwargs["to"] for event, data, kwargs in dosing.socketio.emitted if event == "dose_completed"]
+    assert rooms == [None, "station-1"]
+    assert line.active_view() is None and line.get_status()["station"] == "scale-1"
+
+
+def test_request_scale_id(db_app):
+    with db_app.test_request_context("/?scale_id=2"):
+        assert request_scale_id() == 2
+        assert request_scale_id({"scale_id": "3"}) == 3
+        assert request_scale_id({"scale_id": None}) is None  # explicit default station
+    with db_app.test_request_context("/?scale_id="):
+        assert request_scale_id() is None
+    for bad in ("one", True, [1]):
+        with db_app.test_request_context("/"), pytest.raises(ValueError):
+            request_scale_id({"scale_id": bad})
+
+
+def test_bad_scale_id_is_a_client_error(client):
+    response = client.get("/api/recipe_materials/active?scale_id=abc")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "scale_id must be an integer"}
+
+
+def test_moving_a_verified_order_demotes_the_one_on_its_new_station(client, scales, seed):
+    recipe = seed.recipe([1.0])
+    staying = seed.order(recipe, number="PO-1", scale_id=1)
+    other_line = seed.order(recipe, number="PO-2", scale_id=2)
+    moving = seed.order(recipe, number="PO-3", scale_id=2)
+    ids = staying.order_id, other_line.order_id, moving.order_id
+
+    response = client.put(f"/api/production_orders/{ids[2]}", json={"scale_id": 1})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    statuses = [db.session.get(ProductionOrder, order_id).status for order_id in ids]
+    assert statuses == ["pending", "verified", "verified"]
+
+
+def test_join_station_validates_the_scale_id(monkeypatch):
+    joined, emitted = [], []
+    monkeypatch.setattr(scale_routes, "join_room", joined.append)
+    monkeypatch.setattr(scale_routes, "emit", lambda event, payload: emitted.append((event, payload)))
+
+    for data in ({"scale_id": "2"}, {"scale_id": "line-1"}, {"scale_id": [1]}, {}, None, "1"):
+        scale_routes.handle_join_station(data)
+
+    assert joined == [scale_routes.station_room(2)]
+    assert [event for event, _ in emitted] == ["join_station_error"] * 2
+    assert emitted[0][1]["scale_id"] == "line-1"
@@ -0,0 +1,73 @@
+import pytest
+
+from helpers import weight_filter
+from helpers.weight_filter import StabilityDetector, StabilityMonitor
+
+
+def test_median_filters_out_a_spike():
+    detector = StabilityDetector(window=3, band_kg=0.05)
+    for weight in (10.0, 10.02, 14.0):
+        detector.feed(weight)
+    assert detector.filtered == 10.02
+    assert not detector.stable
+
+
+def test_stable_once_the_window_is_full_and_within_the_band():
+    detector = StabilityDetector(window=3, band_kg=0.05)
+    assert not detector.feed(10.0)
+    assert not detector.feed(10.02)
+    assert detector.feed(10.04)  # changed: now stable
+    assert detector.stable
+    assert not detector.feed(10.03)  # still stable, no edge
+    assert detector.feed(10.2)  # spread above the band
+    assert not detector.stable
+
+
+def test_motion_bit_keeps_it_unstable():
+    detector = StabilityDetector(window=2, band_kg=0.05)
+    detector.feed(5.0, motion=True)
+    detector.feed(5.0, motion=True)
+    assert not detector.stable
+    assert detector.feed(5.0, motion=False)
+
+
+@pytest.fixture
+def socketio(monkeypatch, fake_socketio):
+    monkeypatch.setattr(weight_filter, "socketio", fake_socketio)
+    return fake_socketio
+
+
+def test_monitor_emits_only_edges(socketio):
+    monitor = StabilityMonitor("default", window=2, band_kg=0.05, room="station-1")
+    monitor.set_target(10.0, 9.95, material_id=3)
+
+    for weight in (4.0, 9.0, 9.97, 9.98, 9.98, 9.99):
+        monitor.feed({"weight_kg": weight})
+
+    assert [s["stable"] for s in socketio.events("weight_stable")] == [True]
+    reached = socketio.events("target_reached")
+    assert len(reached) == 1
+    assert reached[0]["reached"] and reached[0]["material_id"] == 3
+    assert all(kwargs["to"] == "station-1" for _, _, kwargs in socketio.emitted)
+
+
+def test_read_error_resets_stability(socketio):
+    monitor = StabilityMonitor("default", window=2, band_kg=0.05)
+    monitor.feed({"weight_kg": 1.0})
+    monitor.feed({"weight_kg": 1.0})
+    assert monitor.get_state()["stable"]
+
+    monitor.feed({"error": "timeout"})
+    assert monitor.get_state() is None
+    assert [s["stable"] for s in socketio.events("weight_stable")] == [True, False]
+
+
+def test_stale_state_is_not_served(socketio, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(weight_filter.time, "monotonic", lambda: now[0])
+    monitor = StabilityMonitor("default", window=1)
+    monitor.feed({"weight_kg": 2.0})
+
+    now[0] += 5
+    assert monitor.get_state(max_age=10)["weight_kg"] == 2.0
+    assert monitor.get_state(max_age=3) is None
@@ -0,0 +1,121 @@
+import threading
+import time
+from config import Config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Per-device circuit breaker. After `failure_threshold` consecutive
+    failures the circuit opens and calls fail fast. Once the backoff has
+    elapsed a single half-open probe is let through: success closes the
+    circuit, failure re-opens it with the backoff doubled (up to
+    `max_backoff` seconds).
+    """
+
+    def __init__(self, name, failure_threshold=3, base_backoff=1.0, max_backoff=60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.backoff = base_backoff
+        self.opened_at = None
+        self.next_attempt_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.next_attempt_at:
+                self.state = HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self):
+        """Raise CircuitOpenError instead of returning False."""
+        if not self.allow():
+            raise CircuitOpenError(f"Scale unavailable (circuit open: {self.last_error})")
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.backoff = self.base_backoff
+            self.opened_at = None
+            self.next_attempt_at = None
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self.last_error = str(error) if error is not None else None
+
+            if self.state == HALF_OPEN:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self.backoff = self.base_backoff
+                self._open()
+
+    def _open(self):
+        now = time.monotonic()
+        self.state = OPEN
+        self.opened_at = now
+        self.next_attempt_at = now + self.backoff
+
+    def get_state(self):
+        with self._lock:
+            retry_in = (
+                max(self.next_attempt_at - time.monotonic(), 0)
+                if self.state == OPEN
+                else None
+            )
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "total_failures": self.total_failures,
+                "rejected": self.rejected,
+                "backoff_s": self.backoff,
+                "retry_in_s": round(retry_in, 2) if retry_in is not None else None,
+                "last_error": self.last_error,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host, port, unit_id):
+    """Process-wide breaker for one device, shared by every code path."""
+    key = (host, port, unit_id)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                f"{host}:{port}/{unit_id}",
+                failure_threshold=Config.SCALE_BREAKER_THRESHOLD,
+                base_backoff=Config.SCALE_BREAKER_BACKOFF,
+                max_backoff=Config.SCALE_BREAKER_MAX_BACKOFF,
+            )
+            _breakers[key] = breaker
+        return breaker
+
+
+def all_breakers():
+    with _breakers_lock:
+        return [breaker.get_state() for breaker in _breakers.values()]
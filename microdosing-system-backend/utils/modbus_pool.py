@@ -0,0 +1,182 @@
+import threading
+import time
+from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from utils.circuit_breaker import get_breaker
+
+
+class ModbusConnectionError(Exception):
+    pass
+
+
+class ModbusConnection:
+    """
+    One persistent Modbus TCP socket to a single (host, port, unit_id).
+    Transactions are serialized with a lock so request/response pairs
+    never interleave on the same socket.
+    """
+
+    def __init__(self, host, port=502, unit_id=1, timeout=3):
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self._client = None
+        self._lock = threading.Lock()
+        self.breaker = get_breaker(host, port, unit_id)
+
+        self.connect_count = 0
+        self.connect_failures = 0
+        self.connect_time_total_ms = 0.0
+        self.last_connect_ms = None
+        self.transaction_count = 0
+        self.transaction_failures = 0
+        self.transaction_time_total_ms = 0.0
+        self.transaction_time_max_ms = 0.0
+        self.last_transaction_ms = None
+
+    def _ensure_connected(self):
+        if self._client is not None and self._client.connected:
+            return
+
+        self._close_client()
+        client = ModbusTcpClient(self.host, port=self.port, timeout=self.timeout)
+
+        start = time.perf_counter()
+        connected = client.connect()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.connect_count += 1
+        self.connect_time_total_ms += elapsed_ms
+        self.last_connect_ms = round(elapsed_ms, 2)
+
+        if not connected:
+            self.connect_failures += 1
+            client.close()
+            raise ModbusConnectionError("Unable to connect to scale")
+
+        self._client = client
+
+    def _close_client(self):
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    def transaction(self, fn):
+        """
+        Run fn(client, unit_id) on the pooled socket and return its result.
+        A dropped socket is reopened and the transaction retried once.
+        While the device's circuit breaker is open this fails immediately
+        with CircuitOpenError instead of waiting for the connect timeout.
+        """
+        self.breaker.check()
+        try:
+            result = self._transaction(fn)
+        except (ModbusConnectionError, ConnectionException, ModbusIOException, OSError) as e:
+            self.breaker.record_failure(e)
+            raise
+        except Exception:
+            # The device answered (e.g. a Modbus exception response)
+            self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _transaction(self, fn):
+        with self._lock:
+            for attempt in range(2):
+                self._ensure_connected()
+                start = time.perf_counter()
+                try:
+                    result = fn(self._client, self.unit_id)
+                except (ConnectionException, ModbusIOException, OSError):
+                    self._record_transaction(start, failed=True)
+                    self._close_client()
+                    if attempt == 0:
+                        continue
+                    raise
+                except Exception:
+                    self._record_transaction(start, failed=True)
+                    raise
+
+                self._record_transaction(start)
+                return result
+
+    def _record_transaction(self, start, failed=False):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.transaction_count += 1
+        self.transaction_time_total_ms += elapsed_ms
+        self.transaction_time_max_ms = max(self.transaction_time_max_ms, elapsed_ms)
+        self.last_transaction_ms = round(elapsed_ms, 2)
+        if failed:
+            self.transaction_failures += 1
+
+    def close(self):
+        with self._lock:
+            self._close_client()
+
+    def get_stats(self):
+        successful_connects = self.connect_count - self.connect_failures
+        return {
+            "host": self.host,
+            "port": self.port,
+            "unit_id": self.unit_id,
+            "connected": bool(self._client is not None and self._client.connected),
+            "connect_count": self.connect_count,
+            "connect_failures": self.connect_failures,
+            "avg_connect_ms": round(self.connect_time_total_ms / self.connect_count, 2)
+            if self.connect_count
+            else None,
+            "last_connect_ms": self.last_connect_ms,
+            "reconnects": max(successful_connects - 1, 0),
+            "transaction_count": self.transaction_count,
+            "transaction_failures": self.transaction_failures,
+            "avg_transaction_ms": round(
+                self.transaction_time_total_ms / self.transaction_count, 2
+            )
+            if self.transaction_count
+            else None,
+            "max_transaction_ms": round(self.transaction_time_max_ms, 2),
+            "last_transaction_ms": self.last_transaction_ms,
+            "breaker": self.breaker.get_state(),
+        }
+
+
+class ModbusConnectionManager:
+    """
+    Process-wide registry of persistent Modbus connections keyed by
+    (host, port, unit_id).
+    """
+
+    def __init__(self):
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def get(self, host, port=502, unit_id=1, timeout=3):
+        key = (host, port, unit_id)
+        with self._lock:
+            connection = self._connections.get(key)
+            if connection is None:
+                connection = ModbusConnection(host, port, unit_id, timeout=timeout)
+                self._connections[key] = connection
+            return connection
+
+    def transaction(self, host, port, unit_id, fn, timeout=3):
+        return self.get(host, port, unit_id, timeout=timeout).transaction(fn)
+
+    def stats(self):
+        with self._lock:
+            connections = list(self._connections.values())
+        return [connection.get_stats() for connection in connections]
+
+    def close_all(self):
+        with self._lock:
+            connections = list(self._connections.values())
+        for connection in connections:
+            connection.close()
+
+
+modbus_pool = ModbusConnectionManager()
@@ -0,0 +1,140 @@
+import struct
+
+# Register widths (in 16-bit words) and struct codes per field type
+FIELD_TYPES = {
+    "uint16": (1, "H"),
+    "int16": (1, "h"),
+    "bool": (1, "H"),
+    "uint32": (2, "I"),
+    "int32": (2, "i"),
+    "float32": (2, "f"),
+}
+
+# Declarative register layouts per indicator model. Addresses are 0-based
+# holding registers (40001 --> 0). Add a new entry here to support another
+# indicator; every field is decoded from one block read.
+# `weight_field` / `error_field` name the fields the polling engine reports.
+# Fields may only overlap as `derived` fields: they sit on the registers of
+# another field on the device, so they are decoded but never encoded.
+REGISTER_MAPS = {
+    # Integer weight + status word (utils/scale_connection)
+    "weight_error": {
+        "word_order": "big",
+        "weight_field": "weight",
+        "error_field": "error_code",
+        "fields": {
+            "weight": {"address": 0, "type": "uint16"},
+            "error_code": {"address": 1, "type": "uint16"},
+        },
+    },
+    # Float gross/tare/net + alarm flags (models/scale.ScaleClient). On the
+    # indicator tare reads net's registers and overrange its second word.
+    "float_status": {
+        "word_order": "big",
+        "weight_field": "net_weight",
+        "error_field": None,
+        "derived": ["tare_weight", "overrange"],
+        "fields": {
+            "gross_weight": {"address": 0, "type": "float32"},  # 40001-40002
+            "tare_weight": {"address": 2, "type": "float32"},  # 40003-40004
+            "net_weight": {"address": 2, "type": "float32"},  # same as tare
+            "overrange": {"address": 3, "type": "bool"},  # 40004
+            "underrange": {"address": 4, "type": "bool"},  # 40005
+            "motion": {"address": 5, "type": "bool"},  # 40006
+            "negative": {"address": 6, "type": "bool"},  # 40007
+        },
+    },
+}
+
+
+def get_register_map(name):
+    try:
+        return REGISTER_MAPS[name]
+    except KeyError:
+        raise ValueError(f"Unknown register map: {name}")
+
+
+def check_register_map(register_map):
+    """Raise ValueError if two fields of the map, derived ones aside, share a register."""
+    derived = set(register_map.get("derived", ()))
+    owners = {}
+    for name, spec in register_map["fields"].items():
+        if name in derived:
+            continue
+        width = FIELD_TYPES[spec["type"]][0]
+        for address in range(spec["address"], spec["address"] + width):
+            if address in owners:
+                raise ValueError(
+                    f"Register {address} is used by both {owners[address]} and {name}"
+                )
+            owners[address] = name
+
+
+def register_span(register_map, fields=None):
+    """Return (start, count) covering the requested fields (default: all)."""
+    specs = register_map["fields"]
+    names = fields or list(specs)
+    start = min(specs[n]["address"] for n in names)
+    end = max(specs[n]["address"] + FIELD_TYPES[specs[n]["type"]][0] for n in names)
+    return start, end - start
+
+
+def decode_registers(register_map, registers, start, fields=None):
+    """Decode fields from a block of registers that begins at `start`."""
+    specs = register_map["fields"]
+    little_words = register_map.get("word_order") == "little"
+    values = {}
+
+    for name in fields or list(specs):
+        spec = specs[name]
+        width, code = FIELD_TYPES[spec["type"]]
+        offset = spec["address"] - start
+        words = list(registers[offset : offset + width])
+        if little_words:
+            words.reverse()
+        raw = struct.pack(f">{width}H", *words)
+        value = struct.unpack(f">{code}", raw)[0]
+        values[name] = bool(value) if spec["type"] == "bool" else value
+
+    return values
+
+
+def encode_registers(register_map, values):
+    """
+    Inverse of decode_registers: {address: register} for the given field
+    values, as the device stores them. Derived fields are not written: they
+    decode from the registers of the field they share. Raises ValueError
+    for a map whose other fields overlap, which would overwrite each other.
+    """
+    check_register_map(register_map)
+    specs = register_map["fields"]
+    derived = set(register_map.get("derived", ()))
+    little_words = register_map.get("word_order") == "little"
+    registers = {}
+
+    for name, spec in specs.items():
+        if name not in values or name in derived:
+            continue
+        width, code = FIELD_TYPES[spec["type"]]
+        value = values[name]
+        if code != "f":
+            value = int(value)
+        words = list(struct.unpack(f">{width}H", struct.pack(f">{code}", value)))
+        if little_words:
+            words.reverse()
+        for i, word in enumerate(words):
+            registers[spec["address"] + i] = word
+
+    return registers
+
+
+def read_register_map(client, unit_id, register_map, fields=None):
+    """
+    Fetch the contiguous span covering `fields` in one request and decode
+    every field from that buffer.
+    """
+    start, count = register_span(register_map, fields)
+    result = client.read_holding_registers(address=start, count=count, slave=unit_id)
+    if result.isError():
+        raise Exception("Error reading register from scale")
+    return decode_registers(register_map, result.registers, start, fields)
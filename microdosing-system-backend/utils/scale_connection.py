@@ -1,54 +1,71 @@
-from pymodbus.client import ModbusTcpClient
-from datetime import datetime
-
-SCALE_IP = "192.168.10.21"
-SCALE_PORT = 502
-UNIT_ID = 1
-WEIGHT_REGISTER = 0  # 40001 --> 0
-ERROR_CODE_REGISTER = 1  # 40002 --> 1
-
-ERROR_MESSAGES = {
-    0: "OK",
-    1: "Overload",
-    2: "Underload",
-    3: "Calibration Error",
-    4: "Communication Fault",
-    5: "Mechanical Fault",
-}
-
-
-def read_scale_data():
-    try:
-        client = ModbusTcpClient(SCALE_IP, port=SCALE_PORT, timeout=3)
-        connection = client.connect()
-        if not connection:
-            client.close()
-            raise Exception("Unable to connect to scale")
-
-        weight_result = client.read_holding_registers(
-            address=WEIGHT_REGISTER, count=1, slave=UNIT_ID
-        )
-        error_result = client.read_holding_registers(
-            address=ERROR_CODE_REGISTER, count=1, slave=UNIT_ID
-        )
-
-        client.close()
-
-        if weight_result.isError() or error_result.isError():
-            raise Exception("Error reading register from scale")
-
-        weight = weight_result.registers[0]
-        error_code = error_result.registers[0]
-        error_message = ERROR_MESSAGES.get(error_code, "Unknown Error")
-
-        timestamp = datetime.now().isoformat()
-
-        return {
-            "timestamp": timestamp,
-            "weight": weight,
-            "error_code": error_code,
-            "error_message": error_message,
-        }
-
-    except Exception as e:
-        return {"error": str(e)}
+from datetime import datetime
+from config import Config
+from utils.modbus_pool import modbus_pool
+from utils.register_map import get_register_map, read_register_map
+
+# Default (unconfigured) scale used by /api/scale/read-weight and live-weight.
+# Additional dosing stations are configured in the `scale` table.
+SCALE_IP = Config.SCALE_HOST
+SCALE_PORT = Config.SCALE_PORT
+UNIT_ID = Config.SCALE_UNIT_ID
+# weight (40001 --> 0) and error code (40002 --> 1), read as one block
+REGISTER_MAP = get_register_map("weight_error")
+
+ERROR_MESSAGES = {
+    0: "OK",
+    1: "Overload",
+    2: "Underload",
+    3: "Calibration Error",
+    4: "Communication Fault",
+    5: "Mechanical Fault",
+}
+
+
+def raw_to_kg(raw_weight):
+    return (raw_weight * 100) / 1000
+
+
+def build_reading(values, register_map, scaling_factor=0.1):
+    """
+    Turn decoded register values into the reading dict served by the API.
+    """
+    raw_weight = values[register_map["weight_field"]]
+    error_field = register_map.get("error_field")
+    error_code = values[error_field] if error_field else 0
+    reading = {
+        "timestamp": datetime.now().isoformat(),
+        "weight": raw_weight,
+        "weight_kg": round(raw_weight * scaling_factor, 3),
+        "error_code": error_code,
+        "error_message": ERROR_MESSAGES.get(error_code, "Unknown Error"),
+    }
+    if "motion" in values:
+        reading["motion"] = values["motion"]
+    return reading
+
+
+def read_scale_data():
+    try:
+        values = modbus_pool.transaction(
+            SCALE_IP,
+            SCALE_PORT,
+            UNIT_ID,
+            lambda client, unit_id: read_register_map(client, unit_id, REGISTER_MAP),
+            timeout=3,
+        )
+
+        weight = values["weight"]
+        error_code = values["error_code"]
+        error_message = ERROR_MESSAGES.get(error_code, "Unknown Error")
+
+        timestamp = datetime.now().isoformat()
+
+        return {
+            "timestamp": timestamp,
+            "weight": weight,
+            "error_code": error_code,
+            "error_message": error_message,
+        }
+
+    except Exception as e:
+        return {"error": str(e)}
@@ -258,18 +258,28 @@ socket.current.on('barcode_scanned', async (data) => {
 // ✅ Step 4: Poll until successful dosing
   let overweightInterval = null;
 
-const pollUntilDosed = setInterval(async () => {
+let checking = false;
+let done = false;
+let queued = null;
+const checkDosing = async (pushed) => {
+  if (done) return;
+  if (checking) {
+    if (pushed) queued = pushed;
+    return;
+  }
+  checking = true;
   try {
-    const response = await axios.post('http://127.0.0.1:5000/api/recipe_materials/weigh-and-update');
-    const result = response.data;
+    // ✅ Dose results are pushed by the server; the POST is only a fallback check
+    const result = pushed ?? (await axios.post('http://127.0.0.1:5000/api/recipe_materials/weigh-and-update')).data;
       if (result.success) {
+        done = true;
         const updated = result.data;
         const setPoint = updated.set_point;
         const actual = updated.actual;
         const isFinalMaterial = result.reset_done === true; // ✅ Add this check
 
         // ✅ Clear all intervals
-        clearInterval(pollUntilDosed);
+        stopWatching();
         if (overweightInterval) {
           clearInterval(overweightInterval);
           overweightInterval = null;
@@ -375,15 +385,33 @@ const pollUntilDosed = setInterval(async () => {
     }
 
   } catch (pollErr) {
-    clearInterval(pollUntilDosed);
+    stopWatching();
     if (overweightInterval) {
       clearInterval(overweightInterval);
       overweightInterval = null;
     }
     console.error("❌ Error during polling:", pollErr);
     alert("Error while checking weight: " + pollErr.message);
+  } finally {
+    checking = false;
+    if (queued) {
+      const next = queued;
+      queued = null;
+      checkDosing(next);
+    }
   }
-}, 1000);
+};
+
+// ✅ The server completes the dose and pushes `dose_completed`;
+// the slow interval is only a fallback
+const pollUntilDosed = setInterval(() => checkDosing(), 5000);
+const onDoseCompleted = (result) => checkDosing(result);
+socket.current.on('dose_completed', onDoseCompleted);
+const stopWatching = () => {
+  clearInterval(pollUntilDosed);
+  socket.current.off('dose_completed', onDoseCompleted);
+};
+checkDosing();
 
 
 
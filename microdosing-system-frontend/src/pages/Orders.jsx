@@ -142,37 +142,16 @@ const Orders = () => {
     try {
       const res = await axios.get('http://127.0.0.1:5000/api/production_orders', getAuthConfig());
       const ordersData = Array.isArray(res.data) ? res.data : [];
-      const ordersWithStatus = await Promise.all(
-        ordersData.map(async (order) => {
-          try {
-            const recipeRes = await axios.get(
-              `http://127.0.0.1:5000/api/recipe_materials/${order.recipe_id}`,
-              getAuthConfig()
-            );
-            const materials = Array.isArray(recipeRes.data)
-              ? recipeRes.data
-              : recipeRes.data.materials;
-            let finalStatus = "Dosed"; // Default if all are dosed
-            if (materials && materials.length > 0) {
-              for (let item of materials) {
-                if (item.status === "pending" || item.status === "Rejected") {
-                  finalStatus = "Pending";
-                  break;
-                }
-                if (item.status !== "dosed") {
-                  finalStatus = "In Progress"; // Optional fallback
-                }
-              }
-            } else {
-              finalStatus = "No Materials";
-            }
-            return { ...order, recipe_status: finalStatus };
-          } catch (err) {
-            console.error(`Failed to fetch recipe_material for recipe_id ${order.recipe_id}`, err);
-            return { ...order, status: 'Error' };
-          }
-        })
-      );
+      // ✅ Progress counts come with the listing (no request per order)
+      const ordersWithStatus = ordersData.map((order) => {
+        let finalStatus = "Dosed";
+        if (!order.materials_total) {
+          finalStatus = "No Materials";
+        } else if (order.materials_pending > 0 || order.materials_rejected > 0) {
+          finalStatus = "Pending";
+        }
+        return { ...order, recipe_status: finalStatus };
+      });
       setOrders(ordersWithStatus);
     } catch (err) {
       alert(`Error fetching orders: ${err}`);
@@ -13,11 +13,16 @@ const ViewOrder = () => {
     batch_size: '',
     scheduled_date: '',
     status: '',
-    created_by: ''
+    created_by: '',
+    batches: []
   });
 
   useEffect(() => {
-    axios.get(`http://127.0.0.1:5000/api/production_orders/${order_id}`)
+    // ✅ Order, batches and dispensing in one request
+    const token = localStorage.getItem('access_token');
+    axios.get(`http://127.0.0.1:5000/api/production_orders/${order_id}/full`, {
+      headers: { Authorization: `Bearer ${token}` },
+    })
       .then((response) => {
         setOrder(response.data);
       })
@@ -65,7 +70,15 @@ const ViewOrder = () => {
     <strong>Status:</strong> {order.status}
   </div>
   <div>
-    <strong>Created By:</strong> {order.created_by}
+    <strong>Created By:</strong> {order.created_by_username || order.created_by}
+  </div>
+  <div>
+    <strong>Batches:</strong>{' '}
+    {order.batches?.length
+      ? order.batches
+          .map((b) => `${b.batch_number} (${b.status}, ${b.dispensing.length} dispensed)`)
+          .join(', ')
+      : 'None'}
   </div>
 </div>
 